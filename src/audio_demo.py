@@ -8,10 +8,15 @@ import cv2
 import numpy as np
 import time
 from audio_module import AudioAnalyzer
+from overlay import polyline_points
 
 class AudioDemoApp:
-    def __init__(self):
-        self.audio_analyzer = AudioAnalyzer()
+    def __init__(self, source=None):
+        # Wide waveform window when showing real audio
+        if source is not None:
+            self.audio_analyzer = AudioAnalyzer(buffer_size=2000, samples_per_update=64, source=source)
+        else:
+            self.audio_analyzer = AudioAnalyzer()
         self.width = 800
         self.height = 400
         self.is_running = True
@@ -61,18 +66,11 @@ class AudioDemoApp:
                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (200, 200, 200), 2)
 
             # Waveform
-            waveform = self.audio_analyzer.get_waveform()
-            if waveform:
-                center_y = self.height // 2
-                points = []
-                for i, val in enumerate(waveform):
-                    px = int(50 + (i / len(waveform)) * (self.width - 100))
-                    # Amplify height for better visual
-                    py = int(center_y + val * 100) 
-                    points.append((px, py))
-                
-                if len(points) > 1:
-                    cv2.polylines(frame, [np.array(points)], False, (0, 255, 255), 2)
+            waveform = self.audio_analyzer.get_waveform_view()
+            if len(waveform) > 1:
+                # Amplify height for better visual
+                points = polyline_points(waveform, 50, self.width - 100, self.height // 2, 100)
+                cv2.polylines(frame, [points], False, (0, 255, 255), 2)
 
             # Get state
             audio_state = self.audio_analyzer.get_current_state()
@@ -119,5 +117,19 @@ class AudioDemoApp:
         cv2.destroyAllWindows()
 
 if __name__ == "__main__":
-    app = AudioDemoApp()
+    import argparse
+    from core.audio_sources import MicrophoneSource, WavFileSource
+
+    parser = argparse.ArgumentParser(description='MindCare Audio Demo')
+    parser.add_argument('--wav', default=None, help='Analyze a WAV file (looped)')
+    parser.add_argument('--mic', action='store_true', help='Analyze the microphone')
+    args = parser.parse_args()
+
+    source = None
+    if args.wav:
+        source = WavFileSource(args.wav, loop=True, realtime=True)
+    elif args.mic:
+        source = MicrophoneSource()
+
+    app = AudioDemoApp(source)
     app.run()
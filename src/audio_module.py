@@ -1,6 +1,7 @@
 """
 Audio Analysis Module for MindCare Demo.
-Simulates audio processing since PyAudio dependencies are missing.
+Simulates audio processing by default; given a PCM source (WAV file or
+microphone) it analyzes the real signal with the streaming feature extractor.
 Provides waveform generation and audio emotion estimation.
 """
 
@@ -8,49 +9,123 @@ import numpy as np
 import random
 import time
 from collections import deque
+import config
+from core.audio_features import FeatureExtractor
+from core.ring_buffer import RingBuffer
+from core.vad import VoiceActivityDetector
 
 class AudioAnalyzer:
     """Simulates real-time audio analysis."""
     
-    def __init__(self):
-        self.buffer_size = 100
-        self.waveform = deque([0.0] * self.buffer_size, maxlen=self.buffer_size)
+    def __init__(self, buffer_size=100, samples_per_update=5, source=None):
+        """
+        Args:
+            buffer_size: Waveform samples kept for display
+            samples_per_update: Waveform samples added per update (real
+                                audio blocks are decimated to this many)
+            source: Optional non-blocking PCM source with read() -> float32
+                    block (empty when nothing is due) or None
+                    (core.audio_sources); None simulates audio
+        """
+        self.buffer_size = buffer_size
+        self.samples_per_update = samples_per_update
+        self.waveform = RingBuffer(self.buffer_size)
         self.energy_history = deque([0.0] * 50, maxlen=50)
         self.is_speaking = False
         self.current_audio_emotion = "neutral"
         self.last_update = time.time()
         
+        self.source = source
+        self.extractor = None
+        self.vad = None
+        self.features = {}  # Latest frame features (real audio only)
+        if source is not None:
+            self.extractor = FeatureExtractor(
+                sample_rate=source.sample_rate,
+                max_block_size=max(config.AUDIO_BLOCK_SIZE, getattr(source, 'block_size', 0))
+            )
+            self.vad = VoiceActivityDetector()
+        
+        # Emotion estimation only runs while someone is speaking
+        self.estimations_run = 0
+        self.estimations_skipped = 0
+        self._speech_energy_sum = 0.0
+        self._speech_frames = 0
+        
     def update(self, is_speaking_simulated=False):
         """
         Update audio state.
         is_speaking_simulated: True if user is pressing a voice command key
+                               (ignored when reading a real source)
         """
+        if self.source is not None:
+            self._update_from_source()
+            return
+        
         # Generate waveform data
         if is_speaking_simulated:
             # High energy random noise (like speech)
-            new_samples = [random.uniform(-0.8, 0.8) for _ in range(5)]
+            new_samples = np.random.uniform(-0.8, 0.8, self.samples_per_update)
             energy = random.uniform(0.6, 1.0)
             self.is_speaking = True
         else:
             # Low energy background noise
-            new_samples = [random.uniform(-0.05, 0.05) for _ in range(5)]
+            new_samples = np.random.uniform(-0.05, 0.05, self.samples_per_update)
             energy = random.uniform(0.0, 0.1)
             self.is_speaking = False
             
         self.waveform.extend(new_samples)
         self.energy_history.append(energy)
         
-        # Periodic estimation update
-        if time.time() - self.last_update > 0.5:
-            self._estimate_emotion(energy)
-            self.last_update = time.time()
+        self._estimate_if_speaking(energy)
             
-    def _estimate_emotion(self, current_energy):
-        """Estimate emotion based on simulated audio features."""
-        if not self.is_speaking:
+    def _update_from_source(self):
+        """Read one block from the source and update features and energy."""
+        block = self.source.read()
+        if block is None or len(block) == 0:
+            return
+        
+        features = self.extractor.process(block)
+        step = max(1, len(block) // self.samples_per_update)
+        self.waveform.extend(block[::step])
+        
+        if len(features['rms']):
+            speech = self.vad.process(features)
+            self.features = {name: values[-1] for name, values in features.items()}
+            energies = np.minimum(1.0, features['rms'] / config.AUDIO_ENERGY_REFERENCE)
+            self.is_speaking = self.vad.is_speech
+            self.energy_history.append(float(energies[-1]))
+            # Energy of the speech frames since the last estimate
+            self._speech_energy_sum += float(energies[speech].sum())
+            self._speech_frames += int(np.count_nonzero(speech))
+        
+        if self._speech_frames:
+            self._estimate_if_speaking(self._speech_energy_sum / self._speech_frames)
+        else:
+            self._estimate_if_speaking(self.energy_history[-1])
+    
+    def _estimate_if_speaking(self, energy):
+        """
+        Periodic (0.5 s) emotion estimate, skipped while there is no speech.
+        A real source counts as speaking if any frame since the last estimate
+        was speech, not just the last one.
+        """
+        if time.time() - self.last_update <= 0.5:
+            return
+        self.last_update = time.time()
+        speaking = self._speech_frames > 0 if self.source is not None else self.is_speaking
+        self._speech_energy_sum = 0.0
+        self._speech_frames = 0
+        
+        if not speaking:
             self.current_audio_emotion = "silence"
+            self.estimations_skipped += 1
             return
-
+        self._estimate_emotion(energy)
+        self.estimations_run += 1
+    
+    def _estimate_emotion(self, current_energy):
+        """Estimate emotion based on simulated audio features."""
         # Simple heuristic mapping
         if current_energy > 0.8:
             self.current_audio_emotion = random.choice(["angry", "happy", "surprised"])
@@ -61,12 +136,17 @@ class AudioAnalyzer:
             
     def get_waveform(self):
         """Return current waveform buffer as list."""
-        return list(self.waveform)
+        return self.waveform.view().tolist()
+    
+    def get_waveform_view(self):
+        """Return the waveform as a read-only NumPy view, oldest sample first (no copy)."""
+        return self.waveform.view()
     
     def get_current_state(self):
         """Return dict of current audio state."""
         return {
             "emotion": self.current_audio_emotion,
             "energy": self.energy_history[-1],
-            "is_speaking": self.is_speaking
+            "is_speaking": self.is_speaking,
+            "features": self.features
         }
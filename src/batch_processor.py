@@ -0,0 +1,183 @@
+"""
+Batch Reprocessing of Recorded Sessions.
+Distributes many session videos over a process pool. Every worker loads the
+face cascade and the emotion model on its first chunk and then pulls chunks
+(a few minutes of one video) from the shared task queue as it becomes free,
+so long and short files balance out across cores. Finished chunks go to a
+checkpoint, so an interrupted run resumes where it stopped; when all chunks
+are done their readings are merged into one CSV (and optionally the store,
+skipping readings an earlier run already stored).
+
+Usage:
+    python batch_processor.py sessions/ [more.mp4 ...] --output readings.csv
+        [--workers N] [--chunk-seconds 120] [--checkpoint FILE] [--store sqlite]
+"""
+import multiprocessing
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+import cv2
+
+import config
+from core.batch import CheckpointLog, merged_readings, plan_chunks, unstored_readings, write_csv
+from core.readings import warmup_seconds
+from core.storage import create_store
+from emotion_classifier import EmotionClassifier
+from video_processor import VideoProcessor, recording_start, video_fps
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.webm')
+
+# Per-worker processor, created on the worker's first chunk
+_processor = None
+
+
+def find_videos(inputs: List[str]) -> List[str]:
+    """Video files given directly or found (recursively) in given directories."""
+    videos = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            videos.extend(str(p) for p in sorted(path.rglob('*'))
+                          if p.suffix.lower() in VIDEO_EXTENSIONS)
+        else:
+            videos.append(str(path))
+    return videos
+
+
+def plan(videos: List[str], chunk_seconds: float) -> List[Dict]:
+    """Chunk tasks for all videos; each chunk re-reads warmup_seconds() before it."""
+    tasks = []
+    for path in videos:
+        cap = cv2.VideoCapture(path)
+        if not cap.isOpened():
+            print(f"Skipping unreadable video: {path}")
+            continue
+        fps = video_fps(cap)
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+        warmup = round(fps * warmup_seconds())
+        start_time = recording_start(path, frame_count / fps)
+        tasks.extend(plan_chunks(path, fps, frame_count, start_time, chunk_seconds, warmup))
+    return tasks
+
+
+def _worker_processor() -> VideoProcessor:
+    """
+    Load the models once per worker; one thread each so workers don't contend.
+    Loaded by the first chunk rather than a pool initializer: a failing
+    initializer makes the pool restart workers forever, while a failing
+    chunk is just reported. Never falls back to the untrained demo model:
+    each worker would build its own random one.
+    """
+    global _processor
+    if _processor is None:
+        cv2.setNumThreads(1)
+        import tensorflow as tf
+        tf.config.threading.set_intra_op_parallelism_threads(1)
+        tf.config.threading.set_inter_op_parallelism_threads(1)
+        _processor = VideoProcessor(classifier=EmotionClassifier(allow_demo=False))
+    return _processor
+
+
+def _process_chunk(task: Dict) -> Dict:
+    result = {'id': task['id'], 'path': task['path'], 'first_frame': task['first_frame']}
+    try:
+        processor = _worker_processor()
+        readings = processor.process(task['path'], task['start_time'], task['max_frames'],
+                                     task['first_frame'], task['warmup_frames'])
+        result['readings'] = [dict(r, timestamp=r['timestamp'].timestamp()) for r in readings]
+        result['stats'] = processor.last_stats
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def run(tasks: List[Dict], checkpoint: CheckpointLog, workers: int) -> int:
+    """Process the tasks not yet in the checkpoint; returns the number that failed."""
+    done = checkpoint.done_ids()
+    pending = [t for t in tasks if t['id'] not in done]
+    print(f"{len(tasks)} chunks, {len(tasks) - len(pending)} already done, "
+          f"{len(pending)} to process on {workers} workers")
+    if not pending:
+        return 0
+
+    failed = 0
+    frames = 0
+    started = time.perf_counter()
+    # spawn: TensorFlow does not survive fork
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(workers) as pool:
+        # chunksize=1: an idle worker takes the next chunk from the shared queue
+        for n, result in enumerate(pool.imap_unordered(_process_chunk, pending, chunksize=1), 1):
+            name = os.path.basename(result['path'])
+            if 'error' in result:
+                failed += 1
+                print(f"[{n}/{len(pending)}] {name} frame {result['first_frame']}: FAILED {result['error']}")
+                continue
+            checkpoint.append(result)
+            frames += result['stats']['frames']
+            elapsed = time.perf_counter() - started
+            eta = elapsed / n * (len(pending) - n)
+            print(f"[{n}/{len(pending)}] {name} frame {result['first_frame']}: "
+                  f"{len(result['readings'])} readings | {frames / elapsed:.0f} frames/s, "
+                  f"ETA {eta:.0f}s")
+    return failed
+
+
+def main():
+    """Entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='MindCare batch video reprocessing')
+    parser.add_argument('inputs', nargs='+', help='Video files or directories')
+    parser.add_argument('--output', required=True, help='Merged readings CSV')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker processes')
+    parser.add_argument('--chunk-seconds', type=float, default=120,
+                       help='Video seconds per work item')
+    parser.add_argument('--checkpoint', default=None,
+                       help='Checkpoint file (default: <output>.checkpoint.jsonl)')
+    parser.add_argument('--store', choices=['sqlite', 'segmented'], default=None,
+                       help='Also write the merged readings to this store')
+    args = parser.parse_args()
+
+    # Checked before planning or spawning anything: without a trained model
+    # every worker would classify with a different random demo model
+    if not config.MODEL_PATH.exists():
+        parser.error(f"no trained emotion model at {config.MODEL_PATH}")
+
+    videos = find_videos(args.inputs)
+    if not videos:
+        parser.error("no videos found")
+    tasks = plan(videos, args.chunk_seconds)
+    checkpoint = CheckpointLog(args.checkpoint or f"{args.output}.checkpoint.jsonl")
+
+    failed = run(tasks, checkpoint, max(1, args.workers))
+    if failed:
+        print(f"{failed} chunks failed; rerun to retry them")
+        raise SystemExit(1)
+
+    finished = checkpoint.load()
+    readings = merged_readings(finished[t['id']] for t in tasks)
+    write_csv(args.output, readings)
+    print(f"{len(readings)} readings from {len(videos)} videos written to {args.output}")
+
+    if args.store and readings:
+        store = create_store(args.store)
+        try:
+            # A rerun (or a run after a crashed import) only adds what is missing
+            timestamps = [r['timestamp'] for r in readings]
+            stored = store.get_readings(min(timestamps), max(timestamps) + 1)
+            new = unstored_readings(readings, stored)
+            for reading in new:
+                store.add_reading(dict(reading, timestamp=datetime.fromtimestamp(reading['timestamp'])))
+        finally:
+            store.close()
+        print(f"{len(new)} readings stored ({args.store}), "
+              f"{len(readings) - len(new)} were already there")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Benchmark suite: per-stage and end-to-end frame pipeline timings.
+
+Benchmarks (each timed per call, every call recorded):
+    detect_face       FaceDetector.detect_face on BGR frames
+    classify_emotion  EmotionClassifier.classify_emotion on face crops (needs TensorFlow)
+    time_window       emotion_classifier.TimeWindowProcessor add + aggregate (needs TensorFlow)
+    time_window_demo  demo TimeWindowProcessor add + aggregate
+    hud               demo HUD renderers (bars, buffer, stress meter, audio panel, help)
+    pipeline          gray -> detect -> preprocess -> classify -> aggregate -> draw
+    video_decode      VideoCapture.read (only with --video)
+
+Inputs are simulated frames (demo_no_camera.create_simulated_frame, shifted
+and noised, 80% with a face) or the first --frames frames of a recording.
+Results are written as JSON, including every per-call timing.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--video clip.mp4] [--frames 100]
+        [--repeat 5] [--only detect_face pipeline] [--output results.json]
+"""
+import argparse
+import os
+import random
+import sys
+
+import cv2
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from harness import format_table, run_suite, write_results
+
+SIMULATED_POOL = 32  # Distinct simulated frames, cycled to --frames
+
+
+def simulated_frames(count: int, width: int = config.CAMERA_WIDTH,
+                     height: int = config.CAMERA_HEIGHT, face_ratio: float = 0.8):
+    from demo_no_camera import create_simulated_frame
+
+    rng = np.random.default_rng(0)
+    pool = []
+    for _ in range(min(count, SIMULATED_POOL)):
+        base = create_simulated_frame(width, height, face_present=rng.random() < face_ratio)
+        dy, dx = rng.integers(-40, 41, 2)
+        frame = np.roll(base, (int(dy), int(dx)), axis=(0, 1)).astype(np.int16)
+        frame += rng.integers(-8, 9, frame.shape, dtype=np.int16)
+        pool.append(np.clip(frame, 0, 255).astype(np.uint8))
+    return [pool[i % len(pool)] for i in range(count)]
+
+
+def video_frames(path: str, count: int):
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise SystemExit(f"Cannot open video: {path}")
+    frames = []
+    while len(frames) < count:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    if not frames:
+        raise SystemExit(f"No frames decoded from {path}")
+    return frames
+
+
+def center_crops(frames):
+    """Face-sized center crops (the simulated face is centered)."""
+    crops = []
+    for frame in frames:
+        h, w = frame.shape[:2]
+        size = min(h, w) // 2
+        y, x = (h - size) // 2, (w - size) // 2
+        crops.append(frame[y:y + size, x:x + size])
+    return crops
+
+
+def random_probabilities(count: int):
+    rng = np.random.default_rng(1)
+    return [dict(zip(config.EMOTION_LABELS, rng.dirichlet(np.ones(len(config.EMOTION_LABELS))).tolist()))
+            for _ in range(count)]
+
+
+class HudRenderer:
+    """Draws one frame of the demo HUD with the demo's own renderers."""
+
+    def __init__(self, width: int, height: int):
+        from demo_no_camera import HUD_HEIGHT, MindCareDemoNoCamera
+
+        self.demo = MindCareDemoNoCamera()
+        self.height = height
+        self.display = np.zeros((height + HUD_HEIGHT, width, 3), dtype=np.uint8)
+
+    def draw(self, frame, probs, fill, valence):
+        h = self.height
+        self.display[:h] = frame
+        self.display[h:] = 0
+        self.demo.audio_analyzer.update()
+        self.demo.draw_emotion_bars(self.display, probs, 10, h + 10)
+        self.demo.draw_time_window_buffer(self.display, fill, 220, h + 10)
+        self.demo.draw_stress_meter(self.display, valence, 430, h + 10)
+        self.demo.draw_audio_panel(self.display, 220, h + 95, 410, 100)
+        self.demo.draw_help_overlay(self.display)
+        return self.display
+
+
+def build_benchmarks(frames):
+    height, width = frames[0].shape[:2]
+    probs = random_probabilities(len(frames))
+
+    def detect_face():
+        from face_detector import FaceDetector
+        return FaceDetector('haar').detect_face, frames
+
+    def classify_emotion():
+        from emotion_classifier import EmotionClassifier
+        return EmotionClassifier().classify_emotion, center_crops(frames)
+
+    def time_window():
+        from emotion_classifier import TimeWindowProcessor
+        processor = TimeWindowProcessor()
+
+        def step(item):
+            index, p = item
+            processor.add_prediction(p, index / config.CAMERA_FPS)
+            processor.get_aggregated_emotion()
+        return step, list(enumerate(probs))
+
+    def time_window_demo():
+        from demo_mode import TimeWindowProcessor
+        processor = TimeWindowProcessor(window_size=60)
+
+        def step(p):
+            processor.add_prediction(p)
+            processor.get_aggregated_emotion()
+        return step, probs
+
+    def hud():
+        renderer = HudRenderer(width, height)
+        items = [(frame, p, (i % 60) / 60, random.Random(i).uniform(-1, 1))
+                 for i, (frame, p) in enumerate(zip(frames, probs))]
+        return (lambda item: renderer.draw(*item)), items
+
+    def pipeline():
+        from face_detector import FaceDetector
+        detector = FaceDetector('haar')
+        try:
+            from emotion_classifier import EmotionClassifier, TimeWindowProcessor
+            classifier = EmotionClassifier()
+            classify = lambda face: classifier.predict(classifier.preprocess_face(face))
+            processor = TimeWindowProcessor()
+            add = processor.add_prediction
+            variant = 'keras'
+        except ImportError:
+            from demo_mode import DemoEmotionGenerator, TimeWindowProcessor
+            generator = DemoEmotionGenerator()
+            classify = lambda face: generator.get_emotion_probabilities()
+            processor = TimeWindowProcessor(window_size=60)
+            add = lambda p, t: processor.add_prediction(p)
+            variant = 'simulated'
+        renderer = HudRenderer(width, height)
+
+        state = {'index': 0, 'probs': probs[0]}
+
+        def step(frame):
+            state['index'] += 1
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            bbox = detector.detect_face(gray)
+            if bbox is not None:
+                face = detector.extract_face_region(gray, bbox, config.MODEL_INPUT_SIZE)
+                state['probs'] = classify(face)
+                add(state['probs'], state['index'] / config.CAMERA_FPS)
+                processor.get_aggregated_emotion()
+            display = renderer.draw(frame, state['probs'], 0.5, 0.0)
+            if bbox is not None:
+                detector.draw_face_box(display, bbox, "face")
+        return step, frames, {'classifier': variant}
+
+    return {
+        'detect_face': detect_face,
+        'classify_emotion': classify_emotion,
+        'time_window': time_window,
+        'time_window_demo': time_window_demo,
+        'hud': hud,
+        'pipeline': pipeline,
+    }
+
+
+def video_decode(path: str, count: int):
+    def setup():
+        cap = cv2.VideoCapture(path)
+
+        def read(_):
+            ret, _frame = cap.read()
+            if not ret:
+                # Loop the file; the seek is counted in this call
+                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                cap.read()
+        return read, list(range(count))
+    return setup
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Frame pipeline benchmark suite')
+    parser.add_argument('--video', default=None, help='Recorded video (default: simulated frames)')
+    parser.add_argument('--frames', type=int, default=100, help='Input frames per repeat')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed passes over the input')
+    parser.add_argument('--warmup', type=int, default=10, help='Untimed calls before timing')
+    parser.add_argument('--only', nargs='*', default=None, help='Benchmarks to run')
+    parser.add_argument('--output', default='benchmark_results.json', help='JSON results path')
+    args = parser.parse_args()
+
+    if args.video:
+        frames = video_frames(args.video, args.frames)
+        source = {'type': 'video', 'path': os.path.basename(args.video)}
+    else:
+        frames = simulated_frames(args.frames)
+        source = {'type': 'simulated'}
+    source.update(frames=len(frames), width=frames[0].shape[1], height=frames[0].shape[0])
+
+    benchmarks = build_benchmarks(frames)
+    if args.video:
+        benchmarks['video_decode'] = video_decode(args.video, len(frames))
+    if args.only:
+        unknown = set(args.only) - set(benchmarks)
+        if unknown:
+            parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+        benchmarks = {name: benchmarks[name] for name in args.only}
+
+    results = run_suite(benchmarks, args.repeat, args.warmup, meta={'input': source})
+    write_results(args.output, results)
+    print(format_table(results))
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark: cached TextRenderer vs direct cv2.putText on the demo HUD.
+
+The workload is the per-frame strings of the demo loop: probabilities from
+DemoEmotionGenerator (fresh continuous values every frame), stress from the
+time window and a once-per-second FPS/status line. Both the labels the HUD
+draws (percent_label, 5-point steps) and exact two-decimal labels are
+measured, since the cache only pays off when strings repeat.
+
+Usage:
+    python benchmarks/bench_text_render.py [--frames 2000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import cv2
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from demo_mode import VALENCE, DemoEmotionGenerator, TimeWindowProcessor
+from text_cache import TextRenderer, percent_label
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+WHITE = (255, 255, 255)
+FPS = 30
+
+
+def demo_frames(frames: int, seed: int = 0):
+    """Per-frame (probabilities, buffer fill, stress, fps, readings) as the demo loop sees them."""
+    random.seed(seed)
+    generator = DemoEmotionGenerator()
+    window = TimeWindowProcessor(window_size=60)
+    fps, readings, valence = 0.0, 0, 0.0
+    for i in range(frames):
+        probs = generator.get_emotion_probabilities()
+        window.add_prediction(probs)
+        if i % FPS == 0:
+            # Once a second: measured FPS and a new reading with its valence
+            fps = FPS - random.uniform(0.0, 1.5)
+            aggregated = window.get_aggregated_emotion()
+            valence = sum(aggregated[e] * VALENCE[e] for e in aggregated)
+            readings += 1
+        yield probs, window.get_fill_percentage(), 1.0 - (valence + 1.0) / 2.0, fps, readings
+
+
+def hud_strings(frame, label):
+    """Strings drawn for one demo frame: (text, org, scale, color, thickness)."""
+    probs, fill, stress, fps, readings = frame
+    strings = []
+    ranked = sorted(probs.items(), key=lambda x: x[1], reverse=True)
+    for i, (emotion, prob) in enumerate(ranked):
+        strings.append((f"{emotion.capitalize()} {label(prob)}", (15, 498 + i * 30), 0.5, WHITE, 1))
+    strings.append((f"Buffer: {fill:.0%}", (225, 510), 0.5, WHITE, 1))
+    strings.append((f"Stress: {label(stress)}", (435, 510), 0.5, WHITE, 1))
+    strings.append((f"FPS: {fps:.1f} | State: MONITORING | Emotions: {readings}",
+                    (10, 540), 0.5, WHITE, 1))
+    strings.append((ranked[0][0].upper(), (200, 100), 0.7, (68, 255, 68), 2))
+    strings.append(("AUDIO ANALYSIS", (20, 600), 0.5, (200, 200, 200), 1))
+    strings.append(("Detected: CALM", (420, 600), 0.5, (68, 255, 68), 1))
+    strings.append(("Energy", (470, 625), 0.4, (150, 150, 150), 1))
+    return strings
+
+
+def run(draw, workload) -> float:
+    """Mean microseconds per frame for a draw(frame, text, org, font, scale, color, thickness)."""
+    canvas = np.zeros((730, 640, 3), dtype=np.uint8)
+    start = time.perf_counter()
+    for strings in workload:
+        for text, org, scale, color, thickness in strings:
+            draw(canvas, text, org, FONT, scale, color, thickness)
+    return (time.perf_counter() - start) / len(workload) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Text rendering benchmark')
+    parser.add_argument('--frames', type=int, default=2000)
+    args = parser.parse_args()
+
+    frames = list(demo_frames(args.frames))
+    labels = (
+        ('HUD labels (5% steps)', percent_label),
+        ('exact labels (.2f)', lambda value: f"{value:.2f}"),
+    )
+    for name, label in labels:
+        workload = [hud_strings(frame, label) for frame in frames]
+        renderer = TextRenderer()
+        direct_us = run(cv2.putText, workload)
+        cached_us = run(renderer.put_text, workload)
+        print(f"{name}:")
+        print(f"  cv2.putText:  {direct_us:8.1f} us/frame")
+        print(f"  TextRenderer: {cached_us:8.1f} us/frame "
+              f"(hit rate {renderer.hits / max(renderer.hits + renderer.misses, 1):.1%})")
+        print(f"  Speedup:      {direct_us / cached_us:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
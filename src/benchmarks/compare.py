@@ -0,0 +1,156 @@
+"""
+Compare two benchmark result files and gate on hot-path regressions.
+
+For every benchmark present in both files the median of each repeat is
+taken, and these repeat medians are bootstrapped to a confidence interval
+for the ratio of medians (candidate / baseline). Calls within one repeat
+share machine state (caches, clock speed, background load), so the repeat,
+not the call, is the independent unit; pooling calls would make the
+interval far too narrow. A gated benchmark regresses when the whole
+interval lies above 1 + threshold, i.e. it is slower beyond the threshold
+and the slowdown is not explained by run-to-run noise. A gated benchmark
+the candidate did not measure (missing or skipped) also fails the gate.
+
+Usage:
+    python benchmarks/bench_pipeline.py --output base.json      # on the old commit
+    python benchmarks/bench_pipeline.py --output new.json       # on the new commit
+    python benchmarks/compare.py base.json new.json [--threshold 0.1]
+        [--gate detect_face classify_emotion pipeline]
+
+Exit status: 0 no gated regression, 1 regression, 2 usage error.
+"""
+import argparse
+import sys
+from typing import Dict, Tuple
+
+import numpy as np
+
+from harness import load_results
+
+HOT_PATHS = ('detect_face', 'classify_emotion', 'pipeline')
+GATE_FAILURES = ('REGRESSION', 'MISSING', 'SKIPPED')
+RESAMPLE_CHUNK = 256  # Resamples drawn at once (bounds memory for long runs)
+
+# meta fields that make timings incomparable when they differ
+ENVIRONMENT_KEYS = ('processor', 'python', 'numpy', 'opencv', 'input')
+
+
+def bootstrap_median_ratio(baseline: np.ndarray, candidate: np.ndarray, resamples: int = 2000,
+                           confidence: float = 0.95, seed: int = 0) -> Tuple[float, float, float]:
+    """
+    Median ratio candidate/baseline and its percentile bootstrap interval.
+
+    Args:
+        baseline: Independent measurements (repeat medians) of the baseline
+        candidate: Same for the candidate
+    """
+    rng = np.random.default_rng(seed)
+    ratios = []
+    for start in range(0, resamples, RESAMPLE_CHUNK):
+        n = min(RESAMPLE_CHUNK, resamples - start)
+        base = np.median(rng.choice(baseline, (n, len(baseline))), axis=1)
+        cand = np.median(rng.choice(candidate, (n, len(candidate))), axis=1)
+        ratios.append(cand / base)
+    ratios = np.concatenate(ratios)
+    alpha = (1.0 - confidence) / 2
+    low, high = np.quantile(ratios, [alpha, 1.0 - alpha])
+    return float(np.median(candidate) / np.median(baseline)), float(low), float(high)
+
+
+def repeat_medians(entry: Dict) -> np.ndarray:
+    """Median per-call time of each repeat of a benchmark."""
+    return np.array([np.median(np.asarray(s, dtype=np.float64)) for s in entry['samples']])
+
+
+def compare(baseline: Dict, candidate: Dict, threshold: float, gate, resamples: int,
+            confidence: float):
+    """Yields (name, verdict, row text) for every benchmark of either file."""
+    names = list(baseline['benchmarks'])
+    names += [n for n in candidate['benchmarks'] if n not in names]
+    names += sorted(n for n in gate if n not in names)
+    for name in names:
+        base = baseline['benchmarks'].get(name)
+        cand = candidate['benchmarks'].get(name)
+        gated = name in gate
+        # A gated benchmark the candidate did not measure cannot pass the gate
+        if cand is None:
+            verdict = 'MISSING' if gated else 'missing'
+            where = 'baseline' if base is not None else 'neither file'
+            yield name, verdict, f"{name:22s} only in {where}{' *' if gated else ''}"
+            continue
+        if 'skipped' in cand:
+            verdict = 'SKIPPED' if gated else 'skipped'
+            yield name, verdict, f"{name:22s} skipped: {cand['skipped']}{' *' if gated else ''}"
+            continue
+        if base is None:
+            yield name, 'missing', f"{name:22s} only in candidate"
+            continue
+        if 'skipped' in base:
+            yield name, 'skipped', f"{name:22s} skipped in baseline: {base['skipped']}"
+            continue
+
+        base_times, cand_times = repeat_medians(base), repeat_medians(cand)
+        ratio, low, high = bootstrap_median_ratio(base_times, cand_times, resamples, confidence)
+        if low > 1.0 + threshold:
+            verdict = 'REGRESSION' if gated else 'slower'
+        elif high < 1.0 - threshold:
+            verdict = 'faster'
+        else:
+            verdict = 'same'
+        note = ''
+        if base.get('info') != cand.get('info'):
+            note = f"  (setup differs: {base.get('info')} -> {cand.get('info')})"
+        yield name, verdict, (
+            f"{name:22s} {np.median(base_times) * 1000:10.3f} {np.median(cand_times) * 1000:10.3f} "
+            f"{(ratio - 1) * 100:+7.1f}% [{(low - 1) * 100:+6.1f}%, {(high - 1) * 100:+6.1f}%] "
+            f"{verdict}{' *' if gated else ''}{note}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare benchmark results')
+    parser.add_argument('baseline', help='Results of the reference commit')
+    parser.add_argument('candidate', help='Results to check')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Allowed relative slowdown of a gated benchmark (default 0.10)')
+    parser.add_argument('--gate', nargs='*', default=list(HOT_PATHS),
+                        help=f"Benchmarks that fail the run on regression (default: {' '.join(HOT_PATHS)})")
+    parser.add_argument('--confidence', type=float, default=0.95)
+    parser.add_argument('--resamples', type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    try:
+        baseline = load_results(args.baseline)
+        candidate = load_results(args.candidate)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    for key in ENVIRONMENT_KEYS:
+        if baseline['meta'].get(key) != candidate['meta'].get(key):
+            print(f"warning: {key} differs: {baseline['meta'].get(key)} -> {candidate['meta'].get(key)}")
+    print(f"baseline {baseline['meta'].get('commit')} vs candidate {candidate['meta'].get('commit')}, "
+          f"median ratio of repeat medians with {args.confidence:.0%} bootstrap CI "
+          f"(* = gated, threshold {args.threshold:.0%})")
+    print(f"{'benchmark':22s} {'base ms':>10s} {'cand ms':>10s} {'change':>8s} {'interval':>17s}")
+
+    regressions, unmeasured = [], []
+    for name, verdict, row in compare(baseline, candidate, args.threshold, set(args.gate),
+                                      args.resamples, args.confidence):
+        print(row)
+        if verdict == 'REGRESSION':
+            regressions.append(name)
+        elif verdict in GATE_FAILURES:
+            unmeasured.append(name)
+
+    if regressions or unmeasured:
+        print()
+        if regressions:
+            print(f"FAIL: {', '.join(regressions)} regressed by more than {args.threshold:.0%}")
+        if unmeasured:
+            print(f"FAIL: {', '.join(unmeasured)} not measured by the candidate")
+        sys.exit(1)
+    print("\nOK: no gated regressions")
+
+
+if __name__ == "__main__":
+    main()
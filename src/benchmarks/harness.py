@@ -0,0 +1,128 @@
+"""
+Benchmark timing harness.
+
+A benchmark is a setup function returning (fn, items) or (fn, items, info);
+the harness calls fn(item) for every item, repeat times, timing each call
+separately, and stores every per-call duration so runs from different
+commits can be compared statistically. Setup failures (a missing model,
+an OpenCV build without cascades) are recorded as skipped benchmarks
+instead of aborting the suite.
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+RESULTS_VERSION = 1
+
+Setup = Callable[[], tuple]
+
+
+def time_calls(fn: Callable, items: Iterable) -> List[float]:
+    """Seconds taken by fn(item) for each item."""
+    timings = []
+    clock = time.perf_counter
+    for item in items:
+        start = clock()
+        fn(item)
+        timings.append(clock() - start)
+    return timings
+
+
+def summarize(samples: List[List[float]]) -> Dict[str, float]:
+    """Statistics over all per-call timings of all repeats."""
+    values = np.concatenate([np.asarray(s, dtype=np.float64) for s in samples])
+    return {
+        'calls': int(len(values)),
+        'mean': float(values.mean()),
+        'median': float(np.median(values)),
+        'p95': float(np.percentile(values, 95)),
+        'min': float(values.min()),
+        'throughput_per_s': float(len(values) / values.sum()) if values.sum() > 0 else None,
+    }
+
+
+def run_benchmark(setup: Setup, repeat: int = 5, warmup: int = 10) -> Dict:
+    """Run one benchmark; returns its result entry (or a skip record)."""
+    try:
+        fn, items, *info = setup()
+    except Exception as e:
+        return {'skipped': f"{type(e).__name__}: {e}"}
+    if not items:
+        return {'skipped': "no input items"}
+
+    time_calls(fn, items[:warmup])
+    samples = [time_calls(fn, items) for _ in range(repeat)]
+    entry = {'unit': 'seconds', 'samples': samples, 'summary': summarize(samples)}
+    if info:
+        entry['info'] = info[0]
+    return entry
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, timeout=5, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment() -> Dict:
+    """Machine and library versions, stored with every result file."""
+    import cv2
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'numpy': np.__version__,
+        'opencv': cv2.__version__,
+    }
+
+
+def run_suite(benchmarks: Dict[str, Setup], repeat: int, warmup: int, meta: Dict = None) -> Dict:
+    """Run benchmarks in order, printing progress; returns the results document."""
+    results = {'version': RESULTS_VERSION, 'meta': dict(environment(), repeat=repeat, **(meta or {})),
+               'benchmarks': {}}
+    for name, setup in benchmarks.items():
+        print(f"{name} ...", end=' ', flush=True, file=sys.stderr)
+        entry = run_benchmark(setup, repeat, warmup)
+        results['benchmarks'][name] = entry
+        if 'skipped' in entry:
+            print(f"skipped ({entry['skipped']})", file=sys.stderr)
+        else:
+            print(f"{entry['summary']['median'] * 1000:.3f} ms median", file=sys.stderr)
+    return results
+
+
+def format_table(results: Dict) -> str:
+    rows = [f"{'benchmark':22s} {'calls':>7s} {'median ms':>10s} {'p95 ms':>9s} {'per s':>9s}"]
+    for name, entry in results['benchmarks'].items():
+        if 'skipped' in entry:
+            rows.append(f"{name:22s} skipped: {entry['skipped']}")
+            continue
+        s = entry['summary']
+        rows.append(f"{name:22s} {s['calls']:7d} {s['median'] * 1000:10.3f} "
+                    f"{s['p95'] * 1000:9.3f} {s['throughput_per_s'] or 0:9.1f}")
+    return "\n".join(rows)
+
+
+def write_results(path: str, results: Dict):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=1)
+
+
+def load_results(path: str) -> Dict:
+    with open(path, encoding='utf-8') as f:
+        results = json.load(f)
+    if results.get('version') != RESULTS_VERSION:
+        raise ValueError(f"{path}: unsupported results version {results.get('version')}")
+    return results
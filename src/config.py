@@ -17,6 +17,9 @@ DATA_DIR = BASE_DIR / "data"
 MODEL_DIR = DATA_DIR / "models"
 LOG_DIR = DATA_DIR / "logs"
 DB_PATH = DATA_DIR / "emotions.db"
+KEY_PATH = DATA_DIR / "secret.key"  # Master encryption key, kept next to the data it unlocks
+SEGMENT_DIR = DATA_DIR / "segments"
+ARCHIVE_DIR = DATA_DIR / "archive"
 
 # Create directories if they don't exist
 for directory in [DATA_DIR, MODEL_DIR, LOG_DIR]:
@@ -28,6 +31,21 @@ CAMERA_WIDTH = 640
 CAMERA_HEIGHT = 480
 CAMERA_FPS = 30
 
+# Audio Settings
+AUDIO_SAMPLE_RATE = 16000  # Hz, mono
+AUDIO_BLOCK_SIZE = 1024  # Samples read from the source per update
+AUDIO_FRAME_SIZE = 512  # FFT window (32 ms at 16 kHz)
+AUDIO_HOP_SIZE = 256  # Samples between analysis frames
+AUDIO_MEL_BANDS = 26
+AUDIO_ENERGY_REFERENCE = 0.3  # RMS shown as full energy in the UI
+
+# Voice Activity Detection (frames are AUDIO_HOP_SIZE apart, 16 ms by default)
+VAD_ENERGY_RATIO = 3.0  # Speech RMS relative to the adaptive noise floor
+VAD_MIN_RMS = 0.005  # Frames quieter than this are never speech
+VAD_FLUX_THRESHOLD = 0.5  # Mean positive log-mel change that marks a speech onset
+VAD_HANGOVER_FRAMES = 12  # Keep speech state ~200 ms after energy drops
+VAD_NOISE_ADAPT = 0.05
+
 # Face Detection Settings
 FACE_CASCADE_PATH = "haarcascade_frontalface_default.xml"
 MIN_FACE_SIZE = (48, 48)
@@ -45,6 +63,13 @@ FRAME_BUFFER_SIZE = CAMERA_FPS * WINDOW_SIZE_SECONDS  # Number of frames in wind
 PATTERN_CHECK_INTERVAL = 30  # Check for stress patterns every 30 seconds
 PATTERN_HISTORY_MINUTES = 15  # Analyze last 15 minutes for patterns
 
+# Audio-Visual Fusion
+FUSION_RATE_HZ = 10  # Fused estimates per second
+FUSION_WEIGHTS = {'face': 0.7, 'audio': 0.3}
+FUSION_MAX_HOLD_SECONDS = 1.5  # Drop a modality whose newest sample is older than this
+FUSION_DELAY_SECONDS = 0.0  # Fuse this far behind real time (> 0 interpolates instead of holding)
+FUSION_BUFFER_SIZE = 64  # Samples kept per modality
+
 # Stress Detection Thresholds
 NEGATIVE_EMOTIONS = ['angry', 'disgusted', 'fearful', 'sad']
 STRESS_THRESHOLD = 0.6  # 60% negative emotions
@@ -59,7 +84,31 @@ NOTIFICATION_DURATION_SECONDS = 30  # Auto-dismiss notifications after 30s
 # Privacy Settings
 STORE_FRAMES = False  # Never store raw video frames
 ENCRYPT_DATABASE = True
+STORAGE_MODE = "sqlite"  # "sqlite" (single emotions.db) or "segmented" (daily segment files)
 DATA_RETENTION_DAYS = 30  # Auto-delete data older than 30 days
+RETENTION_CHECK_INTERVAL_SECONDS = 3600  # Run the purge job hourly
+RETENTION_BATCH_SIZE = 500  # Rows deleted per transaction (keeps write locks short)
+RETENTION_ROLLUP = True  # Keep daily aggregates of purged readings (encrypted like the readings)
+ARCHIVE_SESSIONS = False  # Also write plaintext columnar archives for offline analysis
+
+# Offline Processing (recorded videos)
+OFFLINE_WORKERS = 0  # Face detection threads per file, 0 = one per CPU core
+OFFLINE_BATCH_SIZE = 32  # Frames whose faces share one classifier call
+
+# Multi-Camera Monitoring
+MULTI_CAMERA_INDICES = [0]  # Camera device indices monitored together
+INFERENCE_MAX_BATCH = 16  # Faces per shared classifier call
+INFERENCE_MAX_WAIT_SECONDS = 0.005  # How long a face waits for others to batch with
+
+# Instrumentation
+INSTRUMENTATION_ENABLED = False  # Per-stage latency histograms, reported at session end
+METRICS_ENABLED = False  # Serve Prometheus metrics (implies stage timing)
+METRICS_HOST = "127.0.0.1"  # Localhost only; use "0.0.0.0" to let a fleet scraper in
+METRICS_PORT = 9464
+
+# Sampling Profiler (--profile)
+PROFILE_DURATION_SECONDS = 30  # Default when --profile is given without a duration
+PROFILE_INTERVAL_SECONDS = 0.005  # 200 samples per second
 
 # Logging
 LOG_LEVEL = "INFO"
@@ -0,0 +1,193 @@
+"""
+Columnar Session Archive.
+Stores a session's emotion readings as memory-mappable NumPy arrays
+(timestamps, label indices, probability matrix) for offline analysis.
+Archives are plaintext by design so they can be memory-mapped; only
+export sessions that are meant to leave the encrypted store.
+"""
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+import config
+
+COLUMNS = {
+    'timestamps': (np.float64, ()),
+    'labels': (np.uint8, ()),
+    'probabilities': (np.float32, (len(config.EMOTION_LABELS),)),
+}
+META_NAME = "meta.json"
+
+
+class SessionArchiveWriter:
+    """Streams readings of one session into columnar .npy files."""
+
+    def __init__(self, session_id: str, archive_dir=None, chunk_size: int = 65536):
+        """
+        Args:
+            session_id: Name of the session directory
+            archive_dir: Root archive directory (defaults to config.ARCHIVE_DIR)
+            chunk_size: Rows buffered in memory before being flushed to disk
+        """
+        self.session_dir = Path(archive_dir or config.ARCHIVE_DIR) / session_id
+        self.session_dir.mkdir(parents=True, exist_ok=True)
+        self.chunk_size = chunk_size
+        self.count = 0
+        self._filled = 0
+        self._chunks = {
+            name: np.empty((chunk_size, *shape), dtype=dtype)
+            for name, (dtype, shape) in COLUMNS.items()
+        }
+        self._parts = {
+            name: open(self.session_dir / f"{name}.part", "wb") for name in COLUMNS
+        }
+        self._label_index = {label: i for i, label in enumerate(config.EMOTION_LABELS)}
+
+    def append(self, reading: Dict):
+        """Append one reading dict (timestamp, emotion, probabilities)."""
+        i = self._filled
+        self._chunks['timestamps'][i] = reading['timestamp'].timestamp()
+        self._chunks['labels'][i] = self._label_index[reading['emotion']]
+        probs = reading.get('probabilities') or {}
+        self._chunks['probabilities'][i] = [
+            probs.get(label, 0.0) for label in config.EMOTION_LABELS
+        ]
+        self._filled += 1
+        if self._filled == self.chunk_size:
+            self._flush()
+
+    def extend(self, timestamps: np.ndarray, labels: np.ndarray,
+               probabilities: np.ndarray):
+        """Append already-columnar data in bulk."""
+        self._flush()
+        arrays = {'timestamps': timestamps, 'labels': labels,
+                  'probabilities': probabilities}
+        for name, (dtype, _) in COLUMNS.items():
+            np.ascontiguousarray(arrays[name], dtype=dtype).tofile(self._parts[name])
+        self.count += len(timestamps)
+
+    def _flush(self):
+        if not self._filled:
+            return
+        for name in COLUMNS:
+            self._chunks[name][:self._filled].tofile(self._parts[name])
+        self.count += self._filled
+        self._filled = 0
+
+    def close(self) -> Path:
+        """
+        Finalize the .npy files and metadata.
+
+        Returns:
+            Path of the session directory
+        """
+        self._flush()
+        for name, (dtype, shape) in COLUMNS.items():
+            self._parts[name].close()
+            part_path = self.session_dir / f"{name}.part"
+            header = {
+                'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)),
+                'fortran_order': False,
+                'shape': (self.count, *shape),
+            }
+            with open(self.session_dir / f"{name}.npy", "wb") as out, \
+                    open(part_path, "rb") as part:
+                np.lib.format.write_array_header_1_0(out, header)
+                shutil.copyfileobj(part, out)
+            os.remove(part_path)
+
+        with open(self.session_dir / META_NAME, "w") as f:
+            json.dump({'labels': config.EMOTION_LABELS, 'count': self.count}, f)
+        return self.session_dir
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class SessionArchive:
+    """Read-only, zero-copy view of an archived session."""
+
+    def __init__(self, session_dir):
+        """
+        Args:
+            session_dir: Directory written by SessionArchiveWriter
+        """
+        self.session_dir = Path(session_dir)
+        with open(self.session_dir / META_NAME, "r") as f:
+            self.meta = json.load(f)
+        self.label_names: List[str] = self.meta['labels']
+        # mmap_mode='r' maps the files; nothing is read until accessed
+        self.timestamps = self._load('timestamps')
+        self.labels = self._load('labels')
+        self.probabilities = self._load('probabilities')
+
+    def _load(self, name: str) -> np.ndarray:
+        path = self.session_dir / f"{name}.npy"
+        if self.meta['count'] == 0:
+            return np.load(path)
+        return np.load(path, mmap_mode='r')
+
+    def __len__(self) -> int:
+        return self.meta['count']
+
+    def time_slice(self, start: Optional[float] = None,
+                   end: Optional[float] = None) -> slice:
+        """Row slice covering timestamps in [start, end) (timestamps are sorted)."""
+        lo = 0 if start is None else int(np.searchsorted(self.timestamps, start, 'left'))
+        hi = len(self) if end is None else int(np.searchsorted(self.timestamps, end, 'left'))
+        return slice(lo, hi)
+
+    def select(self, start: Optional[float] = None, end: Optional[float] = None) -> tuple:
+        """
+        Zero-copy views of the rows in [start, end).
+
+        Returns:
+            Tuple (timestamps, labels, probabilities)
+        """
+        rows = self.time_slice(start, end)
+        return self.timestamps[rows], self.labels[rows], self.probabilities[rows]
+
+    def to_dataframe(self, start: Optional[float] = None, end: Optional[float] = None):
+        """
+        Build a pandas DataFrame (copies the selected rows).
+
+        Returns:
+            DataFrame indexed by timestamp with an emotion column and
+            one probability column per label
+        """
+        import pandas as pd
+
+        rows = self.time_slice(start, end)
+        frame = pd.DataFrame(self.probabilities[rows], columns=self.label_names)
+        frame.insert(0, 'emotion', pd.Categorical.from_codes(
+            self.labels[rows], categories=self.label_names))
+        frame.index = pd.to_datetime(self.timestamps[rows], unit='s')
+        return frame
+
+
+def export_readings(readings: Iterable[Dict], session_id: str, archive_dir=None) -> Path:
+    """
+    Write readings (e.g. from EmotionStore.get_readings) to a new archive.
+
+    Returns:
+        Path of the session directory
+    """
+    with SessionArchiveWriter(session_id, archive_dir) as writer:
+        for reading in readings:
+            writer.append(reading)
+    return writer.session_dir
+
+
+def list_sessions(archive_dir=None) -> List[str]:
+    """Names of archived sessions."""
+    root = Path(archive_dir or config.ARCHIVE_DIR)
+    if not root.exists():
+        return []
+    return sorted(p.name for p in root.iterdir() if (p / META_NAME).exists())
@@ -0,0 +1,146 @@
+"""
+Streaming Audio Feature Extraction.
+PCM blocks are appended to a preallocated ring buffer; every hop_size new
+samples one analysis frame (the latest frame_size samples) becomes due, and
+all frames due in a block are windowed and transformed in a single batched
+FFT. Per-block cost depends only on the block size, never on stream length.
+"""
+from typing import Dict
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+import config
+from core.ring_buffer import RingBuffer
+
+FEATURE_NAMES = ('rms', 'zcr', 'centroid', 'log_mel')
+
+
+def hz_to_mel(hz):
+    return 2595.0 * np.log10(1.0 + np.asarray(hz, dtype=np.float64) / 700.0)
+
+
+def mel_to_hz(mel):
+    return 700.0 * (10.0 ** (np.asarray(mel, dtype=np.float64) / 2595.0) - 1.0)
+
+
+def mel_filterbank(sample_rate: int, n_fft: int, n_mels: int,
+                   fmin: float = 0.0, fmax: float = None) -> np.ndarray:
+    """
+    Triangular mel filters.
+
+    Returns:
+        float32 array (n_mels, n_fft // 2 + 1) applied to a power spectrum
+    """
+    fmax = fmax or sample_rate / 2.0
+    bin_freqs = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+    edges = mel_to_hz(np.linspace(hz_to_mel(fmin), hz_to_mel(fmax), n_mels + 2))
+
+    lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (bin_freqs - lower) / (center - lower)
+    falling = (upper - bin_freqs) / (upper - center)
+    return np.maximum(0.0, np.minimum(rising, falling)).astype(np.float32)
+
+
+def empty_features(n_mels: int) -> Dict[str, np.ndarray]:
+    return {
+        'rms': np.empty(0, dtype=np.float32),
+        'zcr': np.empty(0, dtype=np.float32),
+        'centroid': np.empty(0, dtype=np.float32),
+        'log_mel': np.empty((0, n_mels), dtype=np.float32),
+    }
+
+
+class FeatureExtractor:
+    """Frame-level features of a mono PCM stream."""
+
+    def __init__(self, sample_rate: int = config.AUDIO_SAMPLE_RATE,
+                 frame_size: int = config.AUDIO_FRAME_SIZE,
+                 hop_size: int = config.AUDIO_HOP_SIZE,
+                 n_mels: int = config.AUDIO_MEL_BANDS,
+                 max_block_size: int = config.AUDIO_BLOCK_SIZE):
+        """
+        Args:
+            sample_rate: Stream sample rate (Hz)
+            frame_size: Samples per analysis frame (FFT size)
+            hop_size: Samples between consecutive frames
+            n_mels: Number of log-mel bands
+            max_block_size: Largest block processed in one pass; bigger
+                            blocks are split so buffers never grow
+        """
+        self.sample_rate = sample_rate
+        self.frame_size = frame_size
+        self.hop_size = hop_size
+        self.n_mels = n_mels
+        self.max_block_size = max_block_size
+
+        # Holds the current frame plus one block of new samples
+        self._ring = RingBuffer(frame_size + max_block_size)
+        self._next_frame_end = frame_size  # Stream position at which the next frame is due
+
+        self._window = np.hanning(frame_size).astype(np.float32)
+        self._freqs = np.fft.rfftfreq(frame_size, 1.0 / sample_rate).astype(np.float32)
+        self._mel = mel_filterbank(sample_rate, frame_size, n_mels)
+        self.frames_processed = 0
+
+    @property
+    def samples_seen(self) -> int:
+        return self._ring.total_written
+
+    def frame_times(self, count: int) -> np.ndarray:
+        """End times (seconds) of the last `count` frames processed."""
+        ends = self._next_frame_end - self.hop_size * np.arange(count, 0, -1)
+        return ends / self.sample_rate
+
+    def process(self, block: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Consume a block of samples in [-1, 1].
+
+        Returns:
+            Dict with one row per frame completed by this block:
+            'rms', 'zcr', 'centroid' (Hz) of shape (n,) and 'log_mel' (n, n_mels)
+        """
+        block = np.asarray(block, dtype=np.float32).ravel()
+        if len(block) > self.max_block_size:
+            parts = [self.process(block[i:i + self.max_block_size])
+                     for i in range(0, len(block), self.max_block_size)]
+            return {name: np.concatenate([p[name] for p in parts]) for name in FEATURE_NAMES}
+
+        self._ring.extend(block)
+        total = self._ring.total_written
+        if total < self._next_frame_end:
+            return empty_features(self.n_mels)
+
+        count = (total - self._next_frame_end) // self.hop_size + 1
+        # Frames as zero-copy windows over the ring buffer, oldest first;
+        # the last frame ends `lag` samples before the newest sample
+        last_end = self._next_frame_end + (count - 1) * self.hop_size
+        lag = total - last_end
+        samples = self._ring.view()
+        stop = len(samples) - lag
+        start = stop - self.frame_size - (count - 1) * self.hop_size
+        frames = sliding_window_view(samples[start:stop], self.frame_size)[::self.hop_size]
+
+        self._next_frame_end = last_end + self.hop_size
+        self.frames_processed += count
+        return self._features(frames)
+
+    def _features(self, frames: np.ndarray) -> Dict[str, np.ndarray]:
+        rms = np.sqrt(np.mean(np.square(frames), axis=1))
+
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (self.frame_size - 1)
+
+        power = np.square(np.abs(np.fft.rfft(frames * self._window, axis=1)))
+        magnitude = np.sqrt(power)
+        total = magnitude.sum(axis=1)
+        centroid = np.divide(magnitude @ self._freqs, total,
+                             out=np.zeros_like(total), where=total > 0)
+
+        log_mel = np.log(power @ self._mel.T + 1e-10)
+        return {
+            'rms': rms.astype(np.float32),
+            'zcr': zcr.astype(np.float32),
+            'centroid': centroid.astype(np.float32),
+            'log_mel': log_mel.astype(np.float32),
+        }
@@ -0,0 +1,165 @@
+"""
+PCM Audio Sources.
+Block readers yielding mono float32 samples in [-1, 1]: a WAV file reader
+(stdlib `wave`) for offline runs and tests, and a microphone adapter that
+needs PyAudio only when it is actually used. Both can be polled from a UI
+loop: a realtime WAV source hands out only the samples its sample rate has
+made due, and the microphone is captured on PortAudio's callback thread.
+"""
+import time
+import wave
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+import config
+
+_SAMPLE_DTYPES = {2: np.int16, 4: np.int32}  # Signed little-endian widths
+
+
+def pcm_to_float(data: bytes, sample_width: int, channels: int) -> np.ndarray:
+    """Decode interleaved PCM bytes to mono float32 in [-1, 1]."""
+    if sample_width == 3:
+        # 24-bit: widen to int32 by padding the low byte
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+        padded = np.zeros((len(raw), 4), dtype=np.uint8)
+        padded[:, 1:] = raw
+        samples = padded.view('<i4').ravel().astype(np.float32) / 2 ** 31
+    elif sample_width == 1:
+        samples = (np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    else:
+        dtype = np.dtype(_SAMPLE_DTYPES[sample_width]).newbyteorder('<')
+        samples = np.frombuffer(data, dtype=dtype).astype(np.float32)
+        samples /= float(2 ** (8 * sample_width - 1))
+
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples
+
+
+class WavFileSource:
+    """Reads a PCM WAV file block by block."""
+
+    def __init__(self, path, block_size: int = config.AUDIO_BLOCK_SIZE, loop: bool = False,
+                 realtime: bool = False):
+        """
+        Args:
+            path: WAV file path
+            block_size: Frames (samples per channel) per block
+            loop: Restart from the beginning at end of file
+            realtime: Play back at the file's sample rate: each read returns
+                      the frames that became due since the previous one
+                      (possibly none) instead of a fixed block
+        """
+        self.path = path
+        self.block_size = block_size
+        self.loop = loop
+        self.realtime = realtime
+        self._wav = wave.open(str(path), 'rb')
+        self.sample_rate = self._wav.getframerate()
+        self.channels = self._wav.getnchannels()
+        self.sample_width = self._wav.getsampwidth()
+        self._started = None  # Monotonic time of the first realtime read
+        self._frames_read = 0
+
+    def _frames_due(self) -> int:
+        now = time.monotonic()
+        if self._started is None:
+            self._started = now
+        return int((now - self._started) * self.sample_rate) - self._frames_read
+
+    def read(self) -> Optional[np.ndarray]:
+        """
+        Next block (the last one may be shorter), or None at end of file.
+        In realtime mode the block may be empty when no frame is due yet.
+        """
+        frames = self._frames_due() if self.realtime else self.block_size
+        if frames <= 0:
+            return np.empty(0, dtype=np.float32)
+        data = self._wav.readframes(frames)
+        if not data and self.loop:
+            self._wav.rewind()
+            data = self._wav.readframes(frames)
+        if not data:
+            return None
+        self._frames_read += len(data) // (self.sample_width * self.channels)
+        return pcm_to_float(data, self.sample_width, self.channels)
+
+    def __iter__(self):
+        while True:
+            block = self.read()
+            if block is None:
+                return
+            yield block
+
+    def close(self):
+        self._wav.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class MicrophoneSource:
+    """Non-blocking reads from the default (or given) input device via PyAudio."""
+
+    def __init__(self, sample_rate: int = config.AUDIO_SAMPLE_RATE,
+                 block_size: int = config.AUDIO_BLOCK_SIZE,
+                 device_index: Optional[int] = None,
+                 max_buffered_seconds: float = 2.0):
+        """
+        Args:
+            sample_rate: Capture rate (Hz)
+            block_size: Frames per PortAudio callback
+            device_index: Input device, None for the default
+            max_buffered_seconds: Captured audio kept while nobody reads;
+                                  older blocks are dropped
+        """
+        try:
+            import pyaudio
+        except ImportError as e:
+            raise RuntimeError("MicrophoneSource requires PyAudio (pip install pyaudio)") from e
+
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.channels = 1
+        self._continue = pyaudio.paContinue
+        self._blocks = deque(maxlen=max(1, int(max_buffered_seconds * sample_rate / block_size)))
+        self._pa = pyaudio.PyAudio()
+        self._stream = self._pa.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=sample_rate,
+            input=True,
+            input_device_index=device_index,
+            frames_per_buffer=block_size,
+            stream_callback=self._on_block
+        )
+
+    def _on_block(self, data, frame_count, time_info, status):
+        # PortAudio thread: just hand the block over
+        self._blocks.append(data)
+        return None, self._continue
+
+    def read(self) -> Optional[np.ndarray]:
+        """Everything captured since the previous read (empty if nothing yet)."""
+        chunks = []
+        while self._blocks:
+            chunks.append(self._blocks.popleft())
+        if not chunks:
+            return np.empty(0, dtype=np.float32)
+        return pcm_to_float(b"".join(chunks), 2, 1)
+
+    def close(self):
+        self._stream.stop_stream()
+        self._stream.close()
+        self._pa.terminate()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,125 @@
+"""
+Batch Reprocessing Plan and Checkpoints.
+Recordings are cut into chunks of whole seconds that can be processed in
+any order by any worker: each chunk re-reads one aggregation window before
+its first frame, so its readings match a sequential pass. Finished chunks
+are appended to a JSON-lines checkpoint; a rerun skips them, and the merged
+output is built from the checkpoint once every chunk is done. Importing the
+merged readings into a store skips those already stored, so it can be
+rerun after a crash.
+"""
+import csv
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple
+
+import config
+
+
+def chunk_id(path: str, first_frame: int) -> str:
+    return f"{os.path.abspath(path)}#{first_frame}"
+
+
+def plan_chunks(path: str, fps: float, frame_count: int, start_time: float,
+                chunk_seconds: float, warmup_frames: int) -> List[Dict]:
+    """
+    Split one recording into chunks.
+
+    Args:
+        path: Video file
+        fps: Its frame rate
+        frame_count: Its length in frames (0 if unknown: one chunk)
+        start_time: Epoch time of its first frame
+        chunk_seconds: Chunk length, rounded to whole seconds
+        warmup_frames: Frames re-read before each chunk to fill the window
+
+    Returns:
+        Task dicts, in file order
+    """
+    seconds = max(1, int(round(chunk_seconds)))
+    step = max(1, int(round(seconds * fps)))
+    if frame_count <= 0:
+        starts, step = [0], None
+    else:
+        starts = list(range(0, frame_count, step))
+    return [{
+        'id': chunk_id(path, first),
+        'path': str(path),
+        'first_frame': first,
+        'max_frames': step if step and first + step < frame_count else None,
+        'warmup_frames': warmup_frames,
+        'start_time': start_time,
+    } for first in starts]
+
+
+class CheckpointLog:
+    """Append-only JSON-lines record of finished chunks."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def load(self) -> Dict[str, Dict]:
+        """Finished chunk results by chunk id (a torn last line is ignored)."""
+        done = {}
+        if not self.path.exists():
+            return done
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                done[entry['id']] = entry
+        return done
+
+    def done_ids(self) -> Set[str]:
+        return set(self.load())
+
+    def append(self, result: Dict):
+        """Record a finished chunk; flushed so a crash loses at most this line."""
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(result) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def merged_readings(results: Iterable[Dict]) -> List[Dict]:
+    """All readings of all chunks, ordered by video then time."""
+    readings = []
+    for result in results:
+        for reading in result['readings']:
+            readings.append(dict(reading, video=result['path']))
+    readings.sort(key=lambda r: (r['video'], r['timestamp']))
+    return readings
+
+
+def _reading_key(timestamp: float, reading: Dict) -> Tuple:
+    # Millisecond precision survives the datetime round trip of both stores
+    return round(timestamp, 3), reading['emotion'], reading['confidence']
+
+
+def unstored_readings(readings: List[Dict], stored: Iterable[Dict]) -> List[Dict]:
+    """
+    Merged readings (epoch timestamps) that are not in the store yet.
+
+    Args:
+        readings: Readings to import
+        stored: Readings the store already holds over their time range
+                (datetime timestamps, as returned by get_readings)
+    """
+    present = {_reading_key(r['timestamp'].timestamp(), r) for r in stored}
+    return [r for r in readings if _reading_key(r['timestamp'], r) not in present]
+
+
+def write_csv(path, readings: List[Dict]):
+    """One row per reading: video, time, dominant emotion, scores, probabilities."""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['video', 'timestamp', 'emotion', 'confidence', 'valence', 'arousal']
+                        + config.EMOTION_LABELS)
+        for r in readings:
+            probs = r['probabilities']
+            writer.writerow([r['video'], f"{r['timestamp']:.3f}", r['emotion'],
+                             f"{r['confidence']:.4f}", f"{r['valence']:.4f}", f"{r['arousal']:.4f}"]
+                            + [f"{probs.get(e, 0.0):.4f}" for e in config.EMOTION_LABELS])
@@ -0,0 +1,45 @@
+"""
+Level-of-Detail Decimation for Time Series Plots.
+Reduces a series to one (min, max) pair per pixel column so drawing cost
+depends on plot width, not on how many samples the series holds.
+"""
+from typing import Tuple
+
+import numpy as np
+
+
+def minmax_decimate(timestamps: np.ndarray, values: np.ndarray, start: float,
+                    end: float, columns: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Min/max of values per pixel column over [start, end).
+
+    Args:
+        timestamps: Sorted sample times
+        values: Sample values (same length as timestamps)
+        start: Time at the left edge of the plot
+        end: Time at the right edge of the plot
+        columns: Number of pixel columns
+
+    Returns:
+        Tuple (mins, maxs) of length columns; columns without samples are NaN
+    """
+    mins = np.full(columns, np.nan)
+    maxs = np.full(columns, np.nan)
+    if columns <= 0 or end <= start or len(timestamps) == 0:
+        return mins, maxs
+
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    lo, hi = np.searchsorted(timestamps, [start, end])
+    if lo >= hi:
+        return mins, maxs
+    timestamps, values = timestamps[lo:hi], values[lo:hi]
+
+    # Column of each sample; samples are sorted so columns are non-decreasing
+    cols = ((timestamps - start) * (columns / (end - start))).astype(np.intp)
+    np.clip(cols, 0, columns - 1, out=cols)
+    starts = np.flatnonzero(np.diff(cols, prepend=-1))
+    used = cols[starts]
+    mins[used] = np.minimum.reduceat(values, starts)
+    maxs[used] = np.maximum.reduceat(values, starts)
+    return mins, maxs
@@ -0,0 +1,42 @@
+"""
+Latest-Frame Mailbox.
+Single-slot hand-off between a producer thread and the GUI: posting a new
+frame replaces any frame that has not been displayed yet, so at most one
+frame is ever pending and display latency can't build up.
+"""
+import threading
+
+
+class FrameMailbox:
+    """Holds only the most recent undisplayed frame."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._frame = None
+        self.frames_posted = 0
+        self.frames_coalesced = 0  # Frames replaced before being displayed
+
+    def post(self, frame) -> bool:
+        """
+        Store a frame, dropping any frame still waiting.
+
+        Returns:
+            True if the mailbox was empty, i.e. the consumer needs to be notified
+        """
+        with self._lock:
+            was_empty = self._frame is None
+            if not was_empty:
+                self.frames_coalesced += 1
+            self._frame = frame
+            self.frames_posted += 1
+        return was_empty
+
+    def take(self):
+        """Remove and return the pending frame, or None if there is none."""
+        with self._lock:
+            frame, self._frame = self._frame, None
+        return frame
+
+    @property
+    def has_pending(self) -> bool:
+        return self._frame is not None
@@ -0,0 +1,123 @@
+"""
+Frame-Parallel Processing.
+Overlaps the stages of offline processing on a single recording:
+ - a reader thread decodes frames ahead into a bounded queue,
+ - a thread pool finds faces in many frames at once (OpenCV releases the
+   GIL, and every pool thread gets its own detector),
+ - the consumer takes detections in frame order and classifies the faces of
+   `batch_size` frames in one model call while the pool keeps detecting.
+Results come out in frame order whichever detection finishes first.
+"""
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+import config
+
+_END = object()
+
+
+class _ReaderError:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class FramePipeline:
+    """Ordered, batched detect -> classify over a stream of frames."""
+
+    def __init__(self, finder_factory: Callable[[], Callable[[Any], Any]],
+                 classify_batch: Callable[[List[Any]], List[Any]],
+                 workers: int = config.OFFLINE_WORKERS,
+                 batch_size: int = config.OFFLINE_BATCH_SIZE):
+        """
+        Args:
+            finder_factory: Creates a per-thread face finder, frame -> face crop or None
+            classify_batch: Classifies a list of face crops in one call
+            workers: Detection threads (0 = one per CPU core)
+            batch_size: Frames whose faces are classified together
+        """
+        self.finder_factory = finder_factory
+        self.classify_batch = classify_batch
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = max(1, batch_size)
+        # Enough frames in flight to keep the pool busy during a classify call
+        self.max_in_flight = 2 * self.batch_size + self.workers
+        self._local = threading.local()
+        self.batches = 0
+
+    def _find(self, frame):
+        finder = getattr(self._local, 'finder', None)
+        if finder is None:
+            finder = self._local.finder = self.finder_factory()
+        return finder(frame)
+
+    @staticmethod
+    def _read_ahead(frames: Iterable, out: queue.Queue, stop: threading.Event):
+        try:
+            for frame in frames:
+                while not stop.is_set():
+                    try:
+                        out.put(frame, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+            item = _END
+        except BaseException as e:
+            item = _ReaderError(e)
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def run(self, frames: Iterable) -> Iterator[Optional[Any]]:
+        """
+        Yields:
+            Classification of each frame's face in frame order, None if no face
+        """
+        frame_queue = queue.Queue(maxsize=self.max_in_flight)
+        stop = threading.Event()
+        reader = threading.Thread(target=self._read_ahead, args=(frames, frame_queue, stop),
+                                  name="FrameReader", daemon=True)
+        reader.start()
+        executor = ThreadPoolExecutor(self.workers, thread_name_prefix="FaceFinder")
+        in_flight = deque()
+        exhausted = False
+
+        def refill():
+            nonlocal exhausted
+            while not exhausted and len(in_flight) < self.max_in_flight:
+                item = frame_queue.get()
+                if item is _END:
+                    exhausted = True
+                elif isinstance(item, _ReaderError):
+                    raise item.error
+                else:
+                    in_flight.append(executor.submit(self._find, item))
+
+        try:
+            refill()
+            while in_flight:
+                count = min(self.batch_size, len(in_flight))
+                faces = [in_flight.popleft().result() for _ in range(count)]
+                # Queue more detection before blocking on the classifier
+                refill()
+
+                found = [face for face in faces if face is not None]
+                results = iter(self.classify_batch(found) if found else ())
+                self.batches += bool(found)
+                for face in faces:
+                    yield None if face is None else next(results)
+        finally:
+            stop.set()
+            # shutdown(cancel_futures=True) needs Python 3.9
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=True)
+            reader.join()
@@ -0,0 +1,144 @@
+"""
+Audio-Visual Fusion Engine.
+Face and audio emotion estimates arrive at different rates (every frame vs
+every ~0.5 s). Each modality is kept in a fixed-size timestamped ring buffer;
+at every fusion tick both are sampled at the same clock time, interpolating
+between neighbouring samples or holding the newest one, and combined into a
+single probability vector by a weighted average.
+"""
+from typing import Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+import config
+from core.ring_buffer import RingBuffer
+
+
+def label_distribution(label: str, labels: Sequence[str], confidence: float = 0.6) -> np.ndarray:
+    """
+    Probability vector for a modality that only reports a label: `confidence`
+    on the label, the rest spread evenly. Unknown labels map to neutral.
+    """
+    if label not in labels:
+        label = 'neutral'
+    probs = np.full(len(labels), (1.0 - confidence) / (len(labels) - 1), dtype=np.float32)
+    probs[list(labels).index(label)] = confidence
+    return probs
+
+
+class ModalityStream:
+    """Timestamped probability vectors of one modality."""
+
+    def __init__(self, n_classes: int, capacity: int = config.FUSION_BUFFER_SIZE):
+        self._times = RingBuffer(capacity, dtype=np.float64, fill=-np.inf)
+        self._probs = RingBuffer(capacity, shape=(n_classes,))
+        self.count = 0
+
+    def push(self, timestamp: float, probs: np.ndarray):
+        """Add a sample; timestamps must not go backwards."""
+        self._times.append(timestamp)
+        self._probs.append(probs)
+        self.count += 1
+
+    @property
+    def last_time(self) -> Optional[float]:
+        return self._times[-1] if self.count else None
+
+    def value_at(self, t: float, max_age: float) -> Optional[np.ndarray]:
+        """
+        Estimate at time t: linear interpolation between the samples around t,
+        or the newest sample held if t is past it.
+
+        Returns:
+            Probability vector, or None if there is no sample within max_age of t
+        """
+        if not self.count:
+            return None
+        times = self._times.view()
+        probs = self._probs.view()
+        # Index of the first sample after t
+        i = int(np.searchsorted(times, t, side='right'))
+        if i == 0 or t - times[i - 1] > max_age:
+            return None
+        if i == len(times):
+            return probs[-1]
+        t0, t1 = times[i - 1], times[i]
+        w = (t - t0) / (t1 - t0)
+        return (1.0 - w) * probs[i - 1] + w * probs[i]
+
+
+class FusionEngine:
+    """Combines modality streams on a common clock at a fixed rate."""
+
+    def __init__(self, labels: Sequence[str] = config.EMOTION_LABELS,
+                 weights: Mapping[str, float] = config.FUSION_WEIGHTS,
+                 rate_hz: float = config.FUSION_RATE_HZ,
+                 max_hold: float = config.FUSION_MAX_HOLD_SECONDS,
+                 delay: float = config.FUSION_DELAY_SECONDS,
+                 capacity: int = config.FUSION_BUFFER_SIZE):
+        """
+        Args:
+            labels: Emotion labels, in probability vector order
+            weights: Modality name -> weight
+            rate_hz: Fused outputs per second
+            max_hold: Longest a modality's newest sample is held
+            delay: Fuse at now - delay; with a delay longer than a modality's
+                   sample interval its values are interpolated, not held
+            capacity: Samples buffered per modality
+        """
+        self.labels = list(labels)
+        self.weights = dict(weights)
+        self.interval = 1.0 / rate_hz
+        self.max_hold = max_hold
+        self.delay = delay
+        self.streams = {name: ModalityStream(len(self.labels), capacity) for name in self.weights}
+        self._next_tick = None
+        self.latest = None          # Last fused {label: prob}
+        self.latest_time = None
+        self.latest_modalities = ()
+
+    def add(self, modality: str, timestamp: float, probs):
+        """Add an estimate (dict label -> prob, or a vector in label order)."""
+        if isinstance(probs, Mapping):
+            probs = [probs.get(label, 0.0) for label in self.labels]
+        self.streams[modality].push(timestamp, probs)
+
+    def fuse_at(self, t: float) -> Optional[Dict[str, float]]:
+        """Fused distribution at clock time t, or None if no modality is available."""
+        total = np.zeros(len(self.labels), dtype=np.float64)
+        weight_sum = 0.0
+        used = []
+        for name, stream in self.streams.items():
+            value = stream.value_at(t, self.max_hold)
+            if value is None:
+                continue
+            total += self.weights[name] * value
+            weight_sum += self.weights[name]
+            used.append(name)
+        if not used:
+            return None
+
+        total /= weight_sum
+        total /= total.sum()
+        self.latest_modalities = tuple(used)
+        return dict(zip(self.labels, total.tolist()))
+
+    def step(self, now: float) -> Optional[Dict[str, float]]:
+        """
+        Call from the frame loop; fuses when a tick is due.
+
+        Returns:
+            The newest fused distribution (possibly from an earlier tick), or
+            None once no modality was available at the last tick
+        """
+        if self._next_tick is None:
+            self._next_tick = now
+        if now >= self._next_tick:
+            t = now - self.delay
+            self.latest = self.fuse_at(t)
+            self.latest_time = t if self.latest is not None else None
+            if self.latest is None:
+                self.latest_modalities = ()
+            # Skip missed ticks instead of bursting to catch up
+            self._next_tick += self.interval * max(1, int((now - self._next_tick) / self.interval) + 1)
+        return self.latest
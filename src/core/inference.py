@@ -0,0 +1,124 @@
+"""
+Shared Batched Inference.
+One worker thread owns the emotion model for any number of producers
+(camera threads). Faces submitted at about the same time are classified in
+a single model call: after the first request arrives the worker waits at
+most `max_wait` seconds for others, so N cameras cost roughly one batched
+call per frame period instead of N separate calls and N model instances.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional
+
+import config
+
+_STOP = object()
+
+
+class BatchInferenceWorker(threading.Thread):
+    """Collects classification requests and runs them as batches."""
+
+    def __init__(self, classify_batch: Callable[[List[Any]], List[Any]],
+                 max_batch: int = config.INFERENCE_MAX_BATCH,
+                 max_wait: float = config.INFERENCE_MAX_WAIT_SECONDS):
+        """
+        Args:
+            classify_batch: Classifies a list of faces in one call, results in order
+            max_batch: Largest batch per call
+            max_wait: Longest time the first request of a batch waits for company
+        """
+        super().__init__(name="BatchInference", daemon=True)
+        self.classify_batch = classify_batch
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait
+        self._requests = queue.Queue()
+        # Guards _stopped together with the put, so no request can be
+        # queued behind the stop marker
+        self._submit_lock = threading.Lock()
+        self._stopped = False
+        self.batches = 0
+        self.requests = 0
+
+    def submit(self, face) -> Future:
+        """Queue one face; the future resolves to its classification."""
+        future = Future()
+        with self._submit_lock:
+            if self._stopped:
+                raise RuntimeError("inference worker stopped")
+            self._requests.put((face, future))
+        return future
+
+    def classify(self, face):
+        """Submit and wait: the calling thread blocks until its batch has run."""
+        return self.submit(face).result()
+
+    def _collect(self) -> Optional[List]:
+        """Block for one request, then gather more until max_batch or max_wait."""
+        first = self._requests.get()
+        if first is _STOP:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            try:
+                item = self._requests.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if item is _STOP:
+                # Run this batch first, stop on the next round
+                self._requests.put(_STOP)
+                break
+            batch.append(item)
+        return batch
+
+    def run(self):
+        try:
+            self._serve()
+        finally:
+            self._fail_pending()
+
+    def _serve(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                break
+            batch = [(face, future) for face, future in batch
+                     if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                results = list(self.classify_batch([face for face, _ in batch]))
+                if len(results) != len(batch):
+                    raise RuntimeError(f"classify_batch returned {len(results)} results "
+                                       f"for {len(batch)} faces")
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            self.batches += 1
+            self.requests += len(batch)
+
+    def _fail_pending(self):
+        """Fail requests still queued once the worker no longer serves them."""
+        while True:
+            try:
+                item = self._requests.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP and item[1].set_running_or_notify_cancel():
+                item[1].set_exception(RuntimeError("inference worker stopped"))
+
+    def stop(self, timeout: float = 5.0):
+        """Finish the requests already queued, then exit."""
+        with self._submit_lock:
+            self._stopped = True
+            self._requests.put(_STOP)
+        if self.is_alive():
+            self.join(timeout)
+        if not self.is_alive():
+            # Never started, or exited: nothing will serve what is left
+            self._fail_pending()
@@ -0,0 +1,169 @@
+"""
+Pipeline Latency Instrumentation.
+Named spans time the stages of a frame loop into fixed-bucket histograms.
+Bucket bounds are log-spaced, so recording is one bisect plus a counter
+increment and memory never grows; percentiles are estimated from the
+buckets only when a report is asked for.
+"""
+import bisect
+import time
+from typing import Dict, Optional, Sequence
+
+import config
+
+# Stages of the monitoring loops, in pipeline order
+STAGES = ('capture', 'gray', 'detect', 'smile', 'preprocess',
+          'inference', 'aggregate', 'draw', 'display')
+
+
+def latency_bounds(low: float = 1e-5, high: float = 10.0, per_octave: int = 4) -> list:
+    """Log-spaced bucket upper bounds in seconds (~19% apart by default)."""
+    ratio = 2.0 ** (1.0 / per_octave)
+    bounds = [low]
+    while bounds[-1] < high:
+        bounds.append(bounds[-1] * ratio)
+    return bounds
+
+
+DEFAULT_BOUNDS = latency_bounds()
+
+
+class LatencyHistogram:
+    """Counts of durations per fixed bucket (bucket i holds values <= bounds[i])."""
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BOUNDS):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # Last bucket is the overflow
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the q-quantile, interpolating linearly within its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, n in enumerate(self.counts):
+            if n and cumulative + n >= rank:
+                upper = min(self.bounds[i] if i < len(self.bounds) else self.max, self.max)
+                lower = min(self.bounds[i - 1] if i > 0 else 0.0, upper)
+                return lower + (upper - lower) * (rank - cumulative) / n
+            cumulative += n
+        return self.max
+
+    def reset(self):
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+
+class _Span:
+    """Reusable timing context for one stage."""
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram: LatencyHistogram):
+        self.histogram = histogram
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.histogram.record(time.perf_counter() - self.start)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class StageTimer:
+    """
+    Per-stage latency histograms of one frame loop.
+
+    Usage:
+        with timer.span('detect'):
+            bbox = detector.detect_face(gray)
+
+    Spans are not re-entrant per stage and a timer belongs to the thread
+    running its loop; readers (reports, exporters) only read the counters.
+    """
+
+    def __init__(self, enabled: bool = config.INSTRUMENTATION_ENABLED,
+                 stages: Sequence[str] = STAGES,
+                 bounds: Sequence[float] = DEFAULT_BOUNDS):
+        self.enabled = enabled
+        self.bounds = list(bounds)
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self._spans: Dict[str, _Span] = {}
+        for stage in stages:
+            self._add_stage(stage)
+
+    def _add_stage(self, stage: str) -> _Span:
+        histogram = LatencyHistogram(self.bounds)
+        self.histograms[stage] = histogram
+        span = self._spans[stage] = _Span(histogram)
+        return span
+
+    def span(self, stage: str):
+        """Context manager timing one stage (a no-op when disabled)."""
+        if not self.enabled:
+            return _NULL_SPAN
+        span = self._spans.get(stage)
+        if span is None:
+            span = self._add_stage(stage)
+        return span
+
+    def record(self, stage: str, seconds: float):
+        """Record a duration measured elsewhere."""
+        if self.enabled:
+            self.span(stage).histogram.record(seconds)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """count, mean, p50, p95, p99 and max (seconds) of every stage that ran."""
+        return {
+            stage: {
+                'count': h.count,
+                'mean': h.mean(),
+                'p50': h.quantile(0.50),
+                'p95': h.quantile(0.95),
+                'p99': h.quantile(0.99),
+                'max': h.max,
+            }
+            for stage, h in self.histograms.items() if h.count
+        }
+
+    def report(self) -> str:
+        """Table of the summary in milliseconds."""
+        rows = [f"{'stage':12s} {'count':>7s} {'mean':>8s} {'p50':>8s} "
+                f"{'p95':>8s} {'p99':>8s} {'max':>8s}"]
+        for stage, s in self.summary().items():
+            rows.append(f"{stage:12s} {s['count']:7d} " + " ".join(
+                f"{s[key] * 1000:8.2f}" for key in ('mean', 'p50', 'p95', 'p99', 'max')))
+        return "\n".join(rows)
+
+    def reset(self):
+        for histogram in self.histograms.values():
+            histogram.reset()
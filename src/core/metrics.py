@@ -0,0 +1,243 @@
+"""
+Metrics Export.
+Counters, gauges and the stage latency histograms of the frame loops,
+served in Prometheus text format by an optional stdlib HTTP server.
+
+The loops only do plain attribute updates on objects they alone write
+(one writer per metric, no locks); the server thread reads them when
+scraped, so a scrape may see a frame half-counted but never blocks a loop.
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+import config
+from core.instrumentation import StageTimer
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Exported latency buckets: every 4th histogram bound (one per octave)
+EXPORT_BUCKET_STEP = 4
+
+_INF_BUCKET = 'le="+Inf"'
+
+# Smoothing of the face presence ratio (~10 s at 30 fps)
+PRESENCE_SMOOTHING = 1.0 / 300
+
+
+def _format_labels(labels: Dict[str, str], extra: str = '') -> str:
+    parts = [f'{k}="{v}"' for k, v in sorted(labels.items())]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic count, written by a single thread."""
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: int = 1):
+        self.value += amount
+
+
+class Gauge:
+    """Current value, written by a single thread."""
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+
+class MetricsRegistry:
+    """Named metric families, rendered on demand."""
+
+    def __init__(self):
+        # name -> (type, help, [(labels, source)])
+        self._families: Dict[str, Tuple[str, str, List[tuple]]] = {}
+
+    def _register(self, kind: str, name: str, help_text: str, labels: Dict[str, str], source):
+        family = self._families.setdefault(name, (kind, help_text, []))
+        if family[0] != kind:
+            raise ValueError(f"Metric {name} already registered as a {family[0]}")
+        family[2].append((labels, source))
+        return source
+
+    def counter(self, name: str, help_text: str, **labels) -> Counter:
+        return self._register('counter', name, help_text, labels, Counter())
+
+    def gauge(self, name: str, help_text: str, **labels) -> Gauge:
+        return self._register('gauge', name, help_text, labels, Gauge())
+
+    def counter_function(self, name: str, help_text: str, fn: Callable[[], int], **labels):
+        """Counter kept elsewhere, read at scrape time."""
+        self._register('counter', name, help_text, labels, fn)
+
+    def gauge_function(self, name: str, help_text: str, fn: Callable[[], float], **labels):
+        """Gauge evaluated at scrape time (e.g. a queue length)."""
+        self._register('gauge', name, help_text, labels, fn)
+
+    def stage_histograms(self, name: str, help_text: str, timer: StageTimer, **labels):
+        """Export every stage of a StageTimer as a histogram labelled stage=<name>."""
+        self._register('histogram', name, help_text, labels, timer)
+
+    def render(self) -> str:
+        lines = []
+        for name, (kind, help_text, members) in self._families.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, source in members:
+                if kind == 'histogram':
+                    self._render_histograms(lines, name, labels, source)
+                    continue
+                if callable(source):
+                    try:
+                        value = source()
+                    except Exception:
+                        continue
+                else:
+                    value = source.value
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _render_histograms(lines: list, name: str, labels: Dict[str, str], timer: StageTimer):
+        for stage, histogram in list(timer.histograms.items()):
+            counts = list(histogram.counts)  # Snapshot; the loop keeps writing
+            total = sum(counts)
+            if not total:
+                continue
+            stage_labels = dict(labels, stage=stage)
+            cumulative = 0
+            for i, bound in enumerate(histogram.bounds):
+                cumulative += counts[i]
+                if i % EXPORT_BUCKET_STEP == 0 or i == len(histogram.bounds) - 1:
+                    le = f'le="{bound:.6g}"'
+                    lines.append(f"{name}_bucket{_format_labels(stage_labels, le)} {cumulative}")
+            lines.append(f"{name}_bucket{_format_labels(stage_labels, _INF_BUCKET)} {total}")
+            lines.append(f"{name}_sum{_format_labels(stage_labels)} {histogram.sum!r}")
+            lines.append(f"{name}_count{_format_labels(stage_labels)} {total}")
+
+
+# Process-wide registry fed by the application loops
+REGISTRY = MetricsRegistry()
+
+
+class PipelineMetrics:
+    """Standard metrics of one frame loop, labelled source=<name>."""
+
+    def __init__(self, source: str, timer: StageTimer, registry: MetricsRegistry = REGISTRY):
+        self.frames = registry.counter(
+            'mindcare_frames_total', 'Frames captured', source=source)
+        self.dropped = registry.counter(
+            'mindcare_frames_dropped_total', 'Frames lost to read failures', source=source)
+        self.face_frames = registry.counter(
+            'mindcare_face_frames_total', 'Frames with a detected face', source=source)
+        self.fps = registry.gauge(
+            'mindcare_fps', 'Frames per second over the last second', source=source)
+        self.face_presence = registry.gauge(
+            'mindcare_face_presence_ratio', 'Smoothed fraction of frames with a face', source=source)
+        registry.stage_histograms(
+            'mindcare_stage_latency_seconds', 'Per-stage frame processing latency',
+            timer, source=source)
+        self.registry = registry
+        self.source = source
+        self._window_start = None
+        self._window_frames = 0
+
+    def queue_depth(self, queue: str, fn: Callable[[], float]):
+        """Export the length of a queue/buffer, read at scrape time."""
+        self.registry.gauge_function(
+            'mindcare_queue_depth', 'Items waiting in pipeline queues', fn,
+            source=self.source, queue=queue)
+
+    def frame(self, now: float, face_present: bool):
+        """Count one processed frame."""
+        self.frames.inc()
+        if face_present:
+            self.face_frames.inc()
+        presence = self.face_presence.value
+        self.face_presence.set(presence + PRESENCE_SMOOTHING * (face_present - presence))
+
+        if self._window_start is None:
+            self._window_start = now
+            return
+        self._window_frames += 1
+        elapsed = now - self._window_start
+        if elapsed >= 1.0:
+            self.fps.set(self._window_frames / elapsed)
+            self._window_start = now
+            self._window_frames = 0
+
+
+class MetricsServer:
+    """Serves a registry at /metrics from a daemon thread."""
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY,
+                 host: str = config.METRICS_HOST, port: int = config.METRICS_PORT):
+        """
+        Args:
+            registry: Metrics to serve
+            host: Bind address (localhost by default; set explicitly to expose)
+            port: TCP port, 0 for any free port
+        """
+        registry_ref = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = registry_ref.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes every few seconds would flood the console
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="MetricsServer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+
+def start_metrics_server(registry: MetricsRegistry = REGISTRY) -> Optional[MetricsServer]:
+    """Start the server if config.METRICS_ENABLED, returning it (or None)."""
+    if not config.METRICS_ENABLED:
+        return None
+    try:
+        server = MetricsServer(registry)
+    except OSError as e:
+        print(f"Metrics server disabled: {e}")
+        return None
+    server.start()
+    print(f"Metrics at http://{config.METRICS_HOST}:{server.port}/metrics")
+    return server
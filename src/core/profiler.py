@@ -0,0 +1,141 @@
+"""
+Sampling Profiler.
+A daemon thread snapshots the Python stacks of every other thread at a
+fixed interval (sys._current_frames) for a set duration, then writes
+ - <name>-<time>.collapsed: one "thread;outer;...;inner count" line per
+   distinct stack, the input format of flamegraph.pl and speedscope
+ - <name>-<time>.txt: per-function self/total sample summary
+Nothing is hooked into the profiled code, so overhead is one stack walk
+per thread per sample and stays at the sampling thread.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import config
+
+
+def _frame_label(code) -> str:
+    name = getattr(code, 'co_qualname', code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler(threading.Thread):
+    """Samples all thread stacks for `duration` seconds, then writes the results."""
+
+    def __init__(self, duration: float = config.PROFILE_DURATION_SECONDS,
+                 interval: float = config.PROFILE_INTERVAL_SECONDS,
+                 name: str = "profile", output_dir: Path = config.LOG_DIR):
+        """
+        Args:
+            duration: Seconds to sample for (stop() ends it earlier)
+            interval: Seconds between samples
+            name: Output file prefix (usually the entry point)
+            output_dir: Directory for the output files
+        """
+        super().__init__(name="SamplingProfiler", daemon=True)
+        self.duration = duration
+        self.interval = interval
+        self.prefix = name
+        self.output_dir = Path(output_dir)
+        self.stacks: Counter = Counter()  # (thread name, code, ...) -> samples
+        self.samples = 0
+        self.paths: Optional[Tuple[Path, Path]] = None
+        self._thread_names: Dict[int, str] = {}
+        self._stop_event = threading.Event()
+
+    def _thread_name(self, ident: int) -> str:
+        name = self._thread_names.get(ident)
+        if name is None:
+            self._thread_names = {t.ident: t.name for t in threading.enumerate()}
+            name = self._thread_names.get(ident, f"thread-{ident}")
+        return name
+
+    def sample(self):
+        """Record the current stack of every thread except this one."""
+        own = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            codes = []
+            while frame is not None:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            codes.append(self._thread_name(ident))
+            self.stacks[tuple(reversed(codes))] += 1
+        self.samples += 1
+
+    def run(self):
+        deadline = time.monotonic() + self.duration
+        next_sample = time.monotonic()
+        while not self._stop_event.is_set():
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            self.sample()
+            next_sample = max(next_sample + self.interval, now)
+            self._stop_event.wait(next_sample - time.monotonic())
+        self.paths = self.write()
+        print(f"Profile: {self.samples} samples written to {self.paths[0]} and {self.paths[1]}")
+
+    def stop(self):
+        """End sampling early and wait for the output to be written."""
+        self._stop_event.set()
+        if self.is_alive():
+            self.join()
+
+    def collapsed(self) -> str:
+        """Stacks in collapsed (folded) format, root first."""
+        lines = []
+        for stack, count in self.stacks.most_common():
+            thread_name, codes = stack[0], stack[1:]
+            frames = [thread_name.replace(';', ':')] + [_frame_label(c) for c in codes]
+            lines.append(f"{';'.join(frames)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def function_summary(self, limit: int = 50) -> str:
+        """Functions ranked by self samples, with total (inclusive) samples."""
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for stack, count in self.stacks.items():
+            codes = stack[1:]
+            if not codes:
+                continue
+            self_counts[codes[-1]] += count
+            for code in set(codes):
+                total_counts[code] += count
+
+        grand_total = sum(self.stacks.values()) or 1
+        rows = [f"{self.samples} samples every {self.interval * 1000:.1f} ms "
+                f"({len(self.stacks)} distinct stacks)",
+                "",
+                f"{'self %':>7s} {'total %':>8s} {'self':>7s} {'total':>7s}  function"]
+        for code, n in self_counts.most_common(limit):
+            rows.append(f"{100.0 * n / grand_total:6.1f}% {100.0 * total_counts[code] / grand_total:7.1f}% "
+                        f"{n:7d} {total_counts[code]:7d}  {_frame_label(code)}")
+        return "\n".join(rows) + "\n"
+
+    def write(self) -> Tuple[Path, Path]:
+        """Write the collapsed stacks and the summary, returning their paths."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"{self.prefix}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        collapsed_path = self.output_dir / f"{stem}.collapsed"
+        summary_path = self.output_dir / f"{stem}.txt"
+        collapsed_path.write_text(self.collapsed(), encoding='utf-8')
+        summary_path.write_text(self.function_summary(), encoding='utf-8')
+        return collapsed_path, summary_path
+
+
+def start_profiler(seconds: Optional[float], name: str) -> Optional[SamplingProfiler]:
+    """Start a profiler for `seconds` if given (the value of a --profile flag)."""
+    if not seconds:
+        return None
+    profiler = SamplingProfiler(duration=seconds, name=name)
+    profiler.start()
+    print(f"Profiling for {seconds:g}s (output in {profiler.output_dir})")
+    return profiler
@@ -0,0 +1,143 @@
+"""
+Emotion Readings.
+Builds the reading records stored by the persistence layer from aggregated
+emotion probabilities, and paces them on a stream clock (wall time for a
+live camera, video time for a recording). Recordings are aggregated over a
+window of stream time, so a chunk that starts by re-reading one window of
+frames produces exactly the readings of a pass from the first frame.
+"""
+from collections import deque
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Optional
+
+import config
+
+
+def make_reading(aggregated: Dict[str, float], timestamp: float) -> Dict:
+    """
+    Reading for aggregated probabilities at an epoch timestamp.
+
+    Returns:
+        Dict with timestamp (datetime), emotion, confidence, valence,
+        arousal and probabilities, as expected by add_reading()
+    """
+    emotion, confidence = max(aggregated.items(), key=lambda x: x[1])
+    return {
+        'timestamp': datetime.fromtimestamp(timestamp),
+        'emotion': emotion,
+        'confidence': confidence,
+        'valence': sum(p * config.EMOTION_VALENCE.get(e, 0) for e, p in aggregated.items()),
+        'arousal': sum(p * config.EMOTION_AROUSAL.get(e, 0) for e, p in aggregated.items()),
+        'probabilities': dict(aggregated),
+    }
+
+
+class ReadingClock:
+    """Signals once per whole `interval` of stream time."""
+
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+        self._next = interval
+
+    def due(self, t: float) -> bool:
+        """True if t has reached the next interval boundary."""
+        if t < self._next:
+            return False
+        self._next = (t // self.interval + 1) * self.interval
+        return True
+
+
+class TimeWindow:
+    """Mean emotion probabilities over the last `seconds` of stream time."""
+
+    def __init__(self, seconds: float = config.WINDOW_SIZE_SECONDS):
+        self.seconds = seconds
+        self._predictions = deque()  # (stream time, probabilities)
+
+    def add(self, t: float, probs: Dict[str, float]):
+        self._predictions.append((t, probs))
+
+    def aggregate(self, t: float) -> Optional[Dict[str, float]]:
+        """Mean of the predictions in [t - seconds, t], or None if there are none."""
+        cutoff = t - self.seconds
+        while self._predictions and self._predictions[0][0] < cutoff:
+            self._predictions.popleft()
+        if not self._predictions:
+            return None
+        aggregated = {emotion: 0.0 for emotion in config.EMOTION_LABELS}
+        for _, probs in self._predictions:
+            for emotion, prob in probs.items():
+                aggregated[emotion] += prob
+        return {emotion: total / len(self._predictions) for emotion, total in aggregated.items()}
+
+
+def warmup_seconds() -> float:
+    """
+    Stream time a recording chunk re-reads before its first frame: the
+    aggregation window, and at least the second a reading looks back for a face.
+    """
+    return max(config.WINDOW_SIZE_SECONDS, 1.0)
+
+
+def recording_readings(frame_results: Iterable[Optional[Dict[str, float]]], fps: float,
+                       start_time: float, first_frame: int = 0, seek_frame: int = 0,
+                       frame_limit: Optional[int] = None,
+                       stats: Optional[Dict] = None) -> Iterator[Dict]:
+    """
+    Per-second readings of a recording, or of a chunk of it, on the video's clock.
+
+    Args:
+        frame_results: Emotion probabilities of each decoded frame from
+                       seek_frame on, None for frames without a face
+        fps: Video frame rate
+        start_time: Epoch time of frame 0
+        first_frame: First frame to produce readings for; earlier frames
+                     (at least warmup_seconds() of them) only fill the window
+        seek_frame: Index of the first frame in frame_results
+        frame_limit: Number of frames frame_results was cut to, None if it
+                     runs to the end of the file
+        stats: Optional dict whose frames/face_frames/readings counts
+               (of reported frames) are updated
+
+    Yields:
+        One reading per second of video in which a face was seen
+    """
+    stats = {} if stats is None else stats
+    for key in ('frames', 'face_frames', 'readings'):
+        stats.setdefault(key, 0)
+    window = TimeWindow()
+    clock = ReadingClock()
+    if seek_frame:
+        # Leave the clock where a pass from frame 0 would have left it
+        clock.due((seek_frame - 1) / fps)
+    last_face_time = None
+    last_reading_time = None
+    t = 0.0
+    decoded = 0
+
+    for decoded, probs in enumerate(frame_results, 1):
+        index = seek_frame + decoded - 1
+        t = index / fps
+        reporting = index >= first_frame
+        if probs is not None:
+            window.add(t, probs)
+            last_face_time = t
+            stats['face_frames'] += reporting
+        stats['frames'] += reporting
+
+        # A reading per second, only while a face is (recently) visible
+        if clock.due(t) and last_face_time is not None and t - last_face_time <= 1.0:
+            last_reading_time = t
+            aggregated = window.aggregate(t) if reporting else None
+            if aggregated:
+                stats['readings'] += 1
+                yield make_reading(aggregated, start_time + t)
+
+    # The trailing partial second, once the file has ended
+    at_end = frame_limit is None or decoded < frame_limit
+    if at_end and last_face_time is not None and t >= first_frame / fps and (
+            last_reading_time is None or last_face_time > last_reading_time):
+        aggregated = window.aggregate(t)
+        if aggregated:
+            stats['readings'] += 1
+            yield make_reading(aggregated, start_time + t)
@@ -0,0 +1,64 @@
+"""
+Background Data Retention Job.
+Periodically enforces config.DATA_RETENTION_DAYS on a store.
+"""
+import threading
+
+import config
+
+
+class RetentionJob(threading.Thread):
+    """Daemon thread that purges expired readings at a fixed interval."""
+
+    def __init__(self, store, retention_days: int = config.DATA_RETENTION_DAYS,
+                 interval: float = config.RETENTION_CHECK_INTERVAL_SECONDS,
+                 batch_size: int = config.RETENTION_BATCH_SIZE,
+                 rollup: bool = config.RETENTION_ROLLUP,
+                 batch_pause: float = 0.05):
+        """
+        Args:
+            store: Any store exposing purge_expired()
+            retention_days: Keep data newer than this many days
+            interval: Seconds between purge runs
+            batch_size: Rows deleted per transaction
+            rollup: Keep daily aggregates of purged readings
+            batch_pause: Sleep between batches to yield to writers
+        """
+        super().__init__(name="RetentionJob", daemon=True)
+        self.store = store
+        self.retention_days = retention_days
+        self.interval = interval
+        self.batch_size = batch_size
+        self.rollup = rollup
+        self.batch_pause = batch_pause
+        self.total_deleted = 0
+        self._stop_event = threading.Event()
+
+    def run_once(self) -> int:
+        """Run a single purge pass and return the number of deleted readings."""
+        deleted = self.store.purge_expired(
+            retention_days=self.retention_days,
+            batch_size=self.batch_size,
+            rollup=self.rollup,
+            pause=self.batch_pause,
+            stop_event=self._stop_event
+        )
+        self.total_deleted += deleted
+        if deleted:
+            print(f"Retention: purged {deleted} readings older than "
+                  f"{self.retention_days} days")
+        return deleted
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Retention error: {e}")
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        """Stop the job and wait for the current batch to finish."""
+        self._stop_event.set()
+        if self.is_alive():
+            self.join()
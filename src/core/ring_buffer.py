@@ -0,0 +1,73 @@
+"""
+Fixed-Capacity Sample Ring Buffer.
+Every sample is written twice, at its slot and one capacity further on, so
+the last `capacity` samples are always one contiguous slice of the storage
+and can be handed out as a zero-copy NumPy view in chronological order.
+"""
+import numpy as np
+
+
+class RingBuffer:
+    """Keeps the most recent `capacity` samples."""
+
+    def __init__(self, capacity: int, dtype=np.float32, fill: float = 0.0, shape=()):
+        """
+        Args:
+            capacity: Number of samples kept
+            dtype: Sample dtype
+            fill: Initial value of every slot
+            shape: Shape of one sample, e.g. (n_classes,) for vectors
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.shape = tuple(shape)
+        self._data = np.full((2 * capacity, *self.shape), fill, dtype=dtype)
+        self._pos = 0           # Slot of the oldest sample
+        self.total_written = 0  # Samples written since creation
+
+    def __len__(self) -> int:
+        return self.capacity
+
+    def extend(self, samples):
+        """Append samples, dropping the oldest ones."""
+        samples = np.asarray(samples, dtype=self._data.dtype).reshape(-1, *self.shape)
+        n = len(samples)
+        if n == 0:
+            return
+        if n >= self.capacity:
+            samples = samples[-self.capacity:]
+            self._data[:self.capacity] = samples
+            self._data[self.capacity:] = samples
+            self._pos = 0
+            self.total_written += n
+            return
+
+        cap = self.capacity
+        start = self._pos
+        first = min(n, cap - start)
+        # Primary copy, wrapping to the start of the lower half
+        self._data[start:start + first] = samples[:first]
+        self._data[:n - first] = samples[first:]
+        # Mirror copy in the upper half
+        self._data[cap + start:cap + start + first] = samples[:first]
+        self._data[cap:cap + n - first] = samples[first:]
+        self._pos = (start + n) % cap
+        self.total_written += n
+
+    def append(self, sample):
+        self.extend(np.asarray(sample)[None])
+
+    def view(self) -> np.ndarray:
+        """Read-only view of the samples, oldest first (valid until the next write)."""
+        window = self._data[self._pos:self._pos + self.capacity]
+        window.flags.writeable = False
+        return window
+
+    def latest(self, n: int) -> np.ndarray:
+        """Read-only view of the newest n samples."""
+        n = min(n, self.capacity)
+        return self.view()[self.capacity - n:]
+
+    def __getitem__(self, index):
+        return self.view()[index]
@@ -0,0 +1,264 @@
+"""
+Pre-Aggregated Emotion Rollups.
+Maintains per-minute, per-hour and per-day aggregates (reading counts per
+emotion, valence and arousal sums) in SQLite, updated incrementally on
+every write, so history queries don't have to rescan raw readings.
+At one reading per second a minute bucket says nearly as much as the
+readings themselves, so bucket values are encrypted like the readings;
+only the bucket start time is kept in clear for range queries.
+Partial minutes at the edges of a range are aggregated from raw readings,
+as are series finer than a minute.
+"""
+import json
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import config
+from core.security import SecurityManager
+
+# Rollup levels from coarsest to finest: (name, nominal bucket seconds)
+ROLLUP_LEVELS = (('day', 86400), ('hour', 3600), ('minute', 60))
+
+EMOTION_COLUMNS = [f"{emotion}_count" for emotion in config.EMOTION_LABELS]
+VALUE_COLUMNS = ['count', 'valence_sum', 'arousal_sum'] + EMOTION_COLUMNS
+
+
+def bucket_floor(timestamp: float, level: str) -> float:
+    """Start of the rollup bucket containing timestamp."""
+    if level == 'day':
+        dt = datetime.fromtimestamp(timestamp)
+        return dt.replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+    size = dict(ROLLUP_LEVELS)[level]
+    return timestamp - timestamp % size
+
+
+def bucket_ceil(timestamp: float, level: str) -> float:
+    """First bucket boundary at or after timestamp."""
+    start = bucket_floor(timestamp, level)
+    if start == timestamp:
+        return start
+    if level == 'day':
+        return (datetime.fromtimestamp(start) + timedelta(days=1)).timestamp()
+    return start + dict(ROLLUP_LEVELS)[level]
+
+
+def empty_summary() -> Dict:
+    """Aggregate with all counters at zero."""
+    return {column: 0 for column in VALUE_COLUMNS}
+
+
+def reading_values(reading: Dict) -> List:
+    """VALUE_COLUMNS contribution of a single reading."""
+    emotion = reading['emotion']
+    values = [1, reading['valence'], reading.get('arousal', 0.0)]
+    values += [1 if e == emotion else 0 for e in config.EMOTION_LABELS]
+    return values
+
+
+def summarize_readings(readings) -> Dict:
+    """Aggregate raw reading dicts the way the rollup buckets do."""
+    summary = empty_summary()
+    for reading in readings:
+        for column, value in zip(VALUE_COLUMNS, reading_values(reading)):
+            summary[column] += value
+    return summary
+
+
+class RollupTables:
+    """Rollup tables living on an existing SQLite connection."""
+
+    def __init__(self, conn: sqlite3.Connection,
+                 security: Optional[SecurityManager] = None,
+                 read_raw: Optional[Callable[[float, float], List[Dict]]] = None):
+        """
+        Args:
+            conn: Connection to create the rollup tables on. Callers are
+                  responsible for locking and transactions.
+            security: Encrypts bucket values (None stores them in clear)
+            read_raw: Returns the raw readings in [start, end) without
+                      taking the store lock. Used for partial minutes and
+                      sub-minute series; None rounds edges out to whole minutes.
+        """
+        self.conn = conn
+        self.security = security
+        self.read_raw = read_raw
+        self._reencrypt_cursor = (0, float('-inf'))  # (level index, last bucket_start)
+        for level, _ in ROLLUP_LEVELS:
+            self.conn.execute(
+                f"CREATE TABLE IF NOT EXISTS rollup_{level} ("
+                "bucket_start REAL PRIMARY KEY, "
+                "payload BLOB NOT NULL)"
+            )
+
+    def encode(self, values: Dict) -> bytes:
+        """Serialize (and encrypt) the VALUE_COLUMNS of an aggregate."""
+        text = json.dumps([values[c] for c in VALUE_COLUMNS])
+        if self.security is not None:
+            return self.security.encrypt(text)
+        return text.encode()
+
+    def decode(self, payload: bytes) -> Dict:
+        """Inverse of encode."""
+        if self.security is not None:
+            text = self.security.decrypt(payload)
+        else:
+            text = bytes(payload).decode()
+        return dict(zip(VALUE_COLUMNS, json.loads(text)))
+
+    def add(self, timestamp: float, reading: Dict):
+        """Add one reading to every rollup level."""
+        values = reading_values(reading)
+        for level, _ in ROLLUP_LEVELS:
+            start = bucket_floor(timestamp, level)
+            row = self.conn.execute(
+                f"SELECT payload FROM rollup_{level} WHERE bucket_start = ?", (start,)
+            ).fetchone()
+            bucket = self.decode(row[0]) if row else empty_summary()
+            for column, value in zip(VALUE_COLUMNS, values):
+                bucket[column] += value
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO rollup_{level} (bucket_start, payload) VALUES (?, ?)",
+                (start, self.encode(bucket))
+            )
+
+    def delete_before(self, cutoff: float):
+        """Delete rollup buckets that start before the bucket containing cutoff."""
+        for level, _ in ROLLUP_LEVELS:
+            self.conn.execute(
+                f"DELETE FROM rollup_{level} WHERE bucket_start < ?",
+                (bucket_floor(cutoff, level),)
+            )
+
+    def reencrypt_step(self, batch_size: int = 200) -> bool:
+        """
+        Re-encrypt the next batch of buckets under the current key.
+
+        Returns:
+            True once every level has been processed
+        """
+        if self.security is None:
+            return True
+        index, after = self._reencrypt_cursor
+        level = ROLLUP_LEVELS[index][0]
+        rows = self.conn.execute(
+            f"SELECT bucket_start, payload FROM rollup_{level} "
+            "WHERE bucket_start > ? ORDER BY bucket_start LIMIT ?",
+            (after, batch_size)
+        ).fetchall()
+        self.conn.executemany(
+            f"UPDATE rollup_{level} SET payload = ? WHERE bucket_start = ?",
+            [(self.security.reencrypt(payload), start) for start, payload in rows]
+        )
+        if len(rows) == batch_size:
+            self._reencrypt_cursor = (index, rows[-1][0])
+            return False
+        if index + 1 < len(ROLLUP_LEVELS):
+            self._reencrypt_cursor = (index + 1, float('-inf'))
+            return False
+        self._reencrypt_cursor = (0, float('-inf'))
+        return True
+
+    def buckets(self, level: str, start: float, end: float) -> List[Dict]:
+        """Buckets of a level whose start lies in [start, end)."""
+        rows = self.conn.execute(
+            f"SELECT bucket_start, payload FROM rollup_{level} "
+            "WHERE bucket_start >= ? AND bucket_start < ? ORDER BY bucket_start",
+            (start, end)
+        ).fetchall()
+        return [dict(self.decode(payload), bucket_start=bucket_start)
+                for bucket_start, payload in rows]
+
+    def _minute_series(self, start: float, end: float) -> List[Dict]:
+        """
+        Minute buckets covering [start, end). Partial minutes at the edges
+        are aggregated from raw readings and start at the range edge.
+        """
+        if self.read_raw is None:
+            return self.buckets('minute', bucket_floor(start, 'minute'), end)
+        inner_start = bucket_ceil(start, 'minute')
+        inner_end = bucket_floor(end, 'minute')
+        if inner_start > inner_end:
+            edges, series = [(start, end)], []
+        else:
+            edges = [(start, inner_start), (inner_end, end)]
+            series = self.buckets('minute', inner_start, inner_end)
+        for lo, hi in edges:
+            if lo >= hi:
+                continue
+            partial = summarize_readings(self.read_raw(lo, hi))
+            if partial['count']:
+                series.append(dict(partial, bucket_start=lo))
+        series.sort(key=lambda b: b['bucket_start'])
+        return series
+
+    def query(self, start: float, end: float,
+              resolution: float) -> Tuple[str, List[Dict]]:
+        """
+        Time series for [start, end) from the coarsest level that satisfies
+        the requested resolution and whose buckets align with the range.
+
+        A resolution below one minute is served from raw readings (level
+        'raw', one bucket per reading). Otherwise ranges not aligned to a
+        coarser level get minute buckets, with partial edge minutes
+        aggregated from raw readings so nothing outside the range counts.
+
+        Args:
+            start: Range start (epoch seconds)
+            end: Range end (epoch seconds)
+            resolution: Largest acceptable bucket size in seconds
+
+        Returns:
+            Tuple (level_name, list of bucket dicts)
+        """
+        if resolution < ROLLUP_LEVELS[-1][1] and self.read_raw is not None:
+            return 'raw', [
+                dict(summarize_readings([reading]),
+                     bucket_start=reading['timestamp'].timestamp())
+                for reading in self.read_raw(start, end)
+            ]
+        for name, size in ROLLUP_LEVELS[:-1]:
+            aligned = (bucket_floor(start, name) == start
+                       and bucket_floor(end, name) == end)
+            if size <= resolution and aligned:
+                return name, self.buckets(name, start, end)
+        return ROLLUP_LEVELS[-1][0], self._minute_series(start, end)
+
+    def _sum(self, level: str, start: float, end: float) -> Dict:
+        summary = empty_summary()
+        for bucket in self.buckets(level, start, end):
+            for c in VALUE_COLUMNS:
+                summary[c] += bucket[c]
+        return summary
+
+    def summarize(self, start: float, end: float, level_index: int = 0) -> Dict:
+        """
+        Aggregate over [start, end) by tiling the range with the coarsest
+        whole buckets available and filling the edges with finer ones.
+        Partial minutes at the edges come from raw readings.
+        """
+        summary = empty_summary()
+        if start >= end:
+            return summary
+
+        level = ROLLUP_LEVELS[level_index][0]
+        if level_index == len(ROLLUP_LEVELS) - 1:
+            for bucket in self._minute_series(start, end):
+                for c in VALUE_COLUMNS:
+                    summary[c] += bucket[c]
+            return summary
+
+        inner_start = bucket_ceil(start, level)
+        inner_end = bucket_floor(end, level)
+        if inner_start >= inner_end:
+            return self.summarize(start, end, level_index + 1)
+
+        parts = [
+            self._sum(level, inner_start, inner_end),
+            self.summarize(start, inner_start, level_index + 1),
+            self.summarize(inner_end, end, level_index + 1),
+        ]
+        for part in parts:
+            for c in VALUE_COLUMNS:
+                summary[c] += part[c]
+        return summary
@@ -1,26 +1,184 @@
 """
 Security Manager for Data Encryption.
 Uses AES encryption (via Fernet) to secure local data.
+
+The master key is loaded once per process and cached; subsystems get
+per-purpose subkeys derived from it with HKDF, so one key file serves
+readings, exports and settings without sharing ciphertext keys. Rotating the
+master key keeps the previous key readable until the data of every purpose
+has been re-encrypted.
 """
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, MultiFernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+import base64
+import json
 import os
+import shutil
+import threading
+import time
+from typing import Dict, List
+
+import config
+
+PURPOSES = ('readings', 'exports', 'settings')
+
+_cache_lock = threading.Lock()
+_key_cache = {}       # abs key path -> _MasterKey
+_manager_cache = {}   # (abs key path, purpose) -> SecurityManager
+
+
+class _MasterKey:
+    """Master key material for one key file, newest key first."""
+
+    def __init__(self, path, keys, mtime):
+        self.path = path
+        self.keys = keys
+        self.mtime = mtime
+        self.version = 0
+
+
+def derive_key(master_key: bytes, purpose: str) -> bytes:
+    """Derive a Fernet key for a purpose from the master key (HKDF-SHA256)."""
+    hkdf = HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=None,
+        info=f"mindcare:{purpose}".encode()
+    )
+    return base64.urlsafe_b64encode(hkdf.derive(base64.urlsafe_b64decode(master_key)))
+
+
+def _write_key(path, key: bytes):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as key_file:
+        key_file.write(key)
+    os.replace(tmp_path, path)
+
+
+def _read_pending(path) -> set:
+    """Purposes not yet re-encrypted since the last rotation of a key file."""
+    if not os.path.exists(f"{path}.old"):
+        return set()
+    try:
+        with open(f"{path}.pending", "r") as f:
+            return set(json.load(f))
+    except FileNotFoundError:
+        # Rotated without a record of progress: assume nothing has migrated
+        return set(PURPOSES)
+
+
+def _write_pending(path, purposes):
+    tmp_path = f"{path}.pending.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(sorted(purposes), f)
+    os.replace(tmp_path, f"{path}.pending")
+
+
+def _adopt_legacy_key(path):
+    """
+    Copy a key file created by older versions, which defaulted to
+    "secret.key" in the working directory (src/ for the run scripts), to
+    the default location so data encrypted with it stays readable.
+    """
+    legacy = os.path.join(os.path.dirname(os.path.abspath(config.__file__)), "secret.key")
+    if path != os.path.abspath(config.KEY_PATH) or not os.path.exists(legacy):
+        return
+    for suffix in (".old", ".pending", ""):  # The key itself last: it marks completion
+        if os.path.exists(legacy + suffix):
+            shutil.copy2(legacy + suffix, f"{path}.tmp")
+            os.replace(f"{path}.tmp", path + suffix)
+
+
+def _load_master_key(key_path) -> _MasterKey:
+    """Return the cached master key, (re)loading it only if the file changed."""
+    path = os.path.abspath(key_path)
+    with _cache_lock:
+        entry = _key_cache.get(path)
+        mtime = os.stat(path).st_mtime_ns if os.path.exists(path) else None
+        if entry is not None and entry.mtime == mtime:
+            return entry
+
+        if mtime is None:
+            _adopt_legacy_key(path)
+            if not os.path.exists(path):
+                _write_key(path, Fernet.generate_key())
+            mtime = os.stat(path).st_mtime_ns
+        with open(path, "rb") as key_file:
+            keys = [key_file.read()]
+        # A previous key is kept alongside while a rotation is in progress
+        if os.path.exists(f"{path}.old"):
+            with open(f"{path}.old", "rb") as key_file:
+                keys.append(key_file.read())
+
+        if entry is None:
+            entry = _MasterKey(path, keys, mtime)
+            _key_cache[path] = entry
+        else:
+            entry.keys = keys
+            entry.mtime = mtime
+            entry.version += 1
+        return entry
+
+
+def clear_key_cache():
+    """Forget all cached keys and managers (mainly for tests)."""
+    with _cache_lock:
+        _key_cache.clear()
+        _manager_cache.clear()
+
 
 class SecurityManager:
-    def __init__(self, key_path="secret.key"):
-        self.key_path = key_path
-        self.key = self._load_or_generate_key()
-        self.cipher = Fernet(self.key)
+    def __init__(self, key_path=None, purpose=None):
+        """
+        Args:
+            key_path: Master key file (created if missing; defaults to
+                      config.KEY_PATH)
+            purpose: Derive a subkey for this purpose, or None to use
+                     the master key directly
+        """
+        self.key_path = key_path or config.KEY_PATH
+        self.purpose = purpose
+        self._master = self._load_or_generate_key()
+        self._version = None
+        self._cipher = None
+
+    @classmethod
+    def for_purpose(cls, purpose: str, key_path=None) -> "SecurityManager":
+        """Shared, process-wide manager for a purpose such as 'readings'."""
+        if purpose not in PURPOSES:
+            raise ValueError(f"Unknown key purpose: {purpose}")
+        key_path = key_path or config.KEY_PATH
+        cache_key = (os.path.abspath(key_path), purpose)
+        with _cache_lock:
+            manager = _manager_cache.get(cache_key)
+        if manager is None:
+            manager = cls(key_path, purpose)
+            with _cache_lock:
+                manager = _manager_cache.setdefault(cache_key, manager)
+        return manager
 
     def _load_or_generate_key(self):
-        """Load existing key or generate a new one."""
-        if os.path.exists(self.key_path):
-            with open(self.key_path, "rb") as key_file:
-                return key_file.read()
-        else:
-            key = Fernet.generate_key()
-            with open(self.key_path, "wb") as key_file:
-                key_file.write(key)
-            return key
+        """Load existing key or generate a new one (cached per process)."""
+        return _load_master_key(self.key_path)
+
+    def _derive(self, master_key: bytes) -> bytes:
+        if self.purpose is None:
+            return master_key
+        return derive_key(master_key, self.purpose)
+
+    @property
+    def key(self) -> bytes:
+        """Current encryption key for this manager."""
+        return self._derive(self._master.keys[0])
+
+    @property
+    def cipher(self) -> MultiFernet:
+        """Cipher encrypting with the current key and decrypting with any known key."""
+        if self._version != self._master.version or self._cipher is None:
+            self._cipher = MultiFernet([Fernet(self._derive(k)) for k in self._master.keys])
+            self._version = self._master.version
+        return self._cipher
 
     def encrypt(self, data: str) -> bytes:
         """Encrypt a string."""
@@ -29,3 +187,106 @@ class SecurityManager:
     def decrypt(self, token: bytes) -> str:
         """Decrypt a token back to string."""
         return self.cipher.decrypt(token).decode()
+
+    def reencrypt(self, token: bytes) -> bytes:
+        """Re-encrypt a token under the current key."""
+        return self.cipher.rotate(token)
+
+    @property
+    def rotation_pending(self) -> bool:
+        """True while data may still be encrypted with a previous key."""
+        return len(self._master.keys) > 1
+
+    def rotate_key(self):
+        """
+        Replace the master key. The previous key is kept in '<key>.old' so
+        existing data stays readable until every purpose has called
+        retire_previous_key(); '<key>.pending' lists the ones still due.
+        """
+        master = self._master
+        with _cache_lock:
+            if len(master.keys) > 1:
+                raise RuntimeError("Previous key rotation has not been retired yet")
+            new_key = Fernet.generate_key()
+            _write_key(f"{master.path}.old", master.keys[0])
+            _write_pending(master.path, PURPOSES)
+            _write_key(master.path, new_key)
+            master.keys = [new_key, master.keys[0]]
+            master.mtime = os.stat(master.path).st_mtime_ns
+            master.version += 1
+
+    @property
+    def pending_purposes(self) -> List[str]:
+        """Purposes whose data may still be encrypted with the previous key."""
+        return sorted(_read_pending(self._master.path))
+
+    def retire_previous_key(self) -> bool:
+        """
+        Record that all data of this manager's purpose has been re-encrypted.
+        The previous master key is dropped once no purpose is pending.
+
+        Returns:
+            True if the previous key was dropped
+        """
+        if self.purpose is None:
+            raise ValueError("Retirement is tracked per purpose; use for_purpose()")
+        master = self._master
+        with _cache_lock:
+            pending = _read_pending(master.path)
+            pending.discard(self.purpose)
+            if pending:
+                _write_pending(master.path, pending)
+                return False
+            for path in (f"{master.path}.old", f"{master.path}.pending"):
+                if os.path.exists(path):
+                    os.remove(path)
+            master.keys = master.keys[:1]
+            master.version += 1
+            return True
+
+
+class KeyRotationJob(threading.Thread):
+    """Background thread re-encrypting stores incrementally after a key rotation."""
+
+    def __init__(self, stores_by_purpose: Dict[str, list], key_path=None,
+                 batch_size: int = 200, batch_pause: float = 0.05):
+        """
+        Args:
+            stores_by_purpose: For each purpose, the stores holding its data
+                               (an empty list for a purpose with no data). Each
+                               store exposes reencrypt_step(batch_size) -> bool
+                               (True when done)
+            key_path: Master key file that was rotated (defaults to config.KEY_PATH)
+            batch_size: Items re-encrypted per step
+            batch_pause: Sleep between steps to yield to live writers
+        """
+        super().__init__(name="KeyRotationJob", daemon=True)
+        unknown = set(stores_by_purpose) - set(PURPOSES)
+        if unknown:
+            raise ValueError(f"Unknown key purposes: {sorted(unknown)}")
+        self.stores_by_purpose = {p: list(s) for p, s in stores_by_purpose.items()}
+        self.key_path = key_path or config.KEY_PATH
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self._stop_event = threading.Event()
+        self.finished = False
+        self.retired = False
+
+    def run(self):
+        for purpose, stores in self.stores_by_purpose.items():
+            for store in stores:
+                while not self._stop_event.is_set():
+                    if store.reencrypt_step(self.batch_size):
+                        break
+                    time.sleep(self.batch_pause)
+            if self._stop_event.is_set():
+                return
+            # Purposes not handled here keep the previous key alive
+            self.retired = SecurityManager.for_purpose(
+                purpose, self.key_path).retire_previous_key()
+        self.finished = True
+
+    def stop(self):
+        self._stop_event.set()
+        if self.is_alive():
+            self.join()
@@ -0,0 +1,441 @@
+"""
+Time-Partitioned Emotion Storage.
+Each local day is stored as a separate append-only segment file with one
+encrypted reading per line. A small JSON manifest indexes the segments so
+range queries only open the days they overlap, and expiring old data is
+just deleting files. Minute/hour/day rollups, encrypted like the readings,
+live in a small SQLite file next to the segments; the daily aggregate kept
+in the manifest for a purged day is encoded the same way.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import config
+from core.rollups import RollupTables, summarize_readings
+from core.security import SecurityManager
+from core.storage import day_start
+
+MANIFEST_NAME = "manifest.json"
+ROLLUP_DB_NAME = "rollups.db"
+
+
+def day_bounds(timestamp: float) -> tuple:
+    """Return (start, end) epoch times of the local day containing timestamp."""
+    start = datetime.fromtimestamp(day_start(timestamp))
+    end = start + timedelta(days=1)
+    return start.timestamp(), end.timestamp()
+
+
+class SegmentedStore:
+    """Append-only daily segment files with a manifest index."""
+
+    def __init__(self, segment_dir=None, encrypt: bool = config.ENCRYPT_DATABASE,
+                 security: Optional[SecurityManager] = None):
+        """
+        Open (or create) a segment directory.
+
+        Args:
+            segment_dir: Directory holding segments (defaults to config.SEGMENT_DIR)
+            encrypt: Encrypt each reading line
+            security: SecurityManager to use for encryption
+        """
+        self.segment_dir = Path(segment_dir or config.SEGMENT_DIR)
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.segment_dir / MANIFEST_NAME
+        self.encrypt = encrypt
+        self.security = security
+        if self.encrypt and self.security is None:
+            self.security = SecurityManager.for_purpose('readings')
+        self._reencrypt_pending = None
+        self._reencrypt_copy = None
+
+        self._lock = threading.Lock()
+        self._active_name = None
+        self._active_file = None
+        self.manifest = self._load_manifest()
+
+        self.conn = sqlite3.connect(str(self.segment_dir / ROLLUP_DB_NAME),
+                                    check_same_thread=False)
+        with self.conn:
+            self.rollups = RollupTables(self.conn, self.security if self.encrypt else None,
+                                        read_raw=self._readings_in)
+        # Manifests from before encryption kept purged-day aggregates in clear
+        plain = [e for e in self.manifest['segments'].values() if isinstance(e.get('rollup'), dict)]
+        for entry in plain:
+            entry['rollup'] = self._encode_rollup(entry['rollup'])
+        if plain:
+            self._save_manifest()
+
+    # --- Manifest ---
+
+    def _load_manifest(self) -> Dict:
+        """
+        Load the manifest and register segment files it doesn't know about.
+        Counts are only saved when a segment is closed, so a segment whose
+        file size differs from the manifest (e.g. after a crash) is recounted.
+        """
+        manifest = {'segments': {}}
+        if self.manifest_path.exists():
+            with open(self.manifest_path, "r") as f:
+                manifest = json.load(f)
+
+        segments = manifest['segments']
+        for path in self.segment_dir.glob("*.seg"):
+            if path.stem not in segments:
+                start = datetime.strptime(path.stem, "%Y-%m-%d").timestamp()
+                segments[path.stem] = self._new_entry(path.name, *day_bounds(start))
+            entry = segments[path.stem]
+            size = path.stat().st_size
+            if entry.get('size') != size:
+                entry['count'] = self._count_records(path)
+                entry['size'] = size
+        return manifest
+
+    @staticmethod
+    def _count_records(path: Path) -> int:
+        """Number of readings in a segment file (no decryption needed)."""
+        with open(path, "rb") as f:
+            return sum(1 for line in f if line.strip())
+
+    def _save_manifest(self):
+        """Atomically write the manifest."""
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+
+    @staticmethod
+    def _new_entry(file_name: str, start: float, end: float) -> Dict:
+        return {'file': file_name, 'start': start, 'end': end,
+                'count': 0, 'size': 0, 'rollup': None}
+
+    # --- Writing ---
+
+    def _encode(self, reading: Dict) -> bytes:
+        line = json.dumps({
+            'timestamp': reading['timestamp'].timestamp(),
+            'emotion': reading['emotion'],
+            'confidence': reading['confidence'],
+            'valence': reading['valence'],
+            'arousal': reading.get('arousal', 0.0),
+            'probabilities': reading.get('probabilities'),
+        })
+        if self.encrypt:
+            return self.security.encrypt(line)
+        return line.encode()
+
+    def _decode(self, line: bytes) -> Dict:
+        text = self.security.decrypt(line) if self.encrypt else line.decode()
+        reading = json.loads(text)
+        reading['timestamp'] = datetime.fromtimestamp(reading['timestamp'])
+        return reading
+
+    def _segment_for(self, timestamp: float) -> str:
+        """Return the segment name for a timestamp, creating its manifest entry."""
+        name = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d")
+        entry = self.manifest['segments'].get(name)
+        if entry is None or entry['file'] is None:
+            new_entry = self._new_entry(f"{name}.seg", *day_bounds(timestamp))
+            if entry is not None:
+                # A backfilled reading for a purged day keeps the day's aggregate
+                new_entry['rollup'] = entry['rollup']
+            self.manifest['segments'][name] = new_entry
+            self._save_manifest()
+        return name
+
+    def add_reading(self, reading: Dict):
+        """Append one reading to its day's segment."""
+        timestamp = reading['timestamp'].timestamp()
+        line = self._encode(reading)
+        with self._lock:
+            name = self._segment_for(timestamp)
+            if name != self._active_name:
+                self._close_active()
+                self._active_file = open(self.segment_dir / f"{name}.seg", "ab")
+                self._active_name = name
+            self._active_file.write(line + b"\n")
+            self._active_file.flush()
+            entry = self.manifest['segments'][name]
+            entry['count'] += 1
+            entry['size'] = entry.get('size', 0) + len(line) + 1
+            with self.conn:
+                self.rollups.add(timestamp, reading)
+
+    def _close_active(self):
+        if self._active_file is not None:
+            self._active_file.close()
+            self._active_file = None
+            self._active_name = None
+            self._save_manifest()
+
+    # --- Reading ---
+
+    def segments_in_range(self, start: Optional[float] = None,
+                          end: Optional[float] = None) -> List[str]:
+        """Names of stored segments overlapping [start, end)."""
+        start = float('-inf') if start is None else start
+        end = float('inf') if end is None else end
+        return sorted(
+            name for name, entry in self.manifest['segments'].items()
+            if entry['file'] is not None and entry['start'] < end and entry['end'] > start
+        )
+
+    def _read_segment(self, name: str) -> List[Dict]:
+        path = self.segment_dir / self.manifest['segments'][name]['file']
+        if not path.exists():
+            return []
+        with open(path, "rb") as f:
+            return [self._decode(line.rstrip(b"\n")) for line in f if line.strip()]
+
+    def get_readings(self, start: Optional[float] = None,
+                     end: Optional[float] = None) -> List[Dict]:
+        """
+        Get readings in [start, end), opening only the overlapping segments.
+
+        Args:
+            start: Range start (epoch seconds), or None for unbounded
+            end: Range end (epoch seconds), or None for unbounded
+
+        Returns:
+            List of reading dictionaries ordered by time
+        """
+        lo = float('-inf') if start is None else start
+        hi = float('inf') if end is None else end
+        with self._lock:
+            return self._readings_in(lo, hi)
+
+    def _readings_in(self, start: float, end: float) -> List[Dict]:
+        """get_readings for callers already holding the lock."""
+        if self._active_file is not None:
+            self._active_file.flush()
+        readings = []
+        for name in self.segments_in_range(start, end):
+            readings.extend(
+                r for r in self._read_segment(name)
+                if start <= r['timestamp'].timestamp() < end
+            )
+        readings.sort(key=lambda r: r['timestamp'])
+        return readings
+
+    def count(self) -> int:
+        """Number of readings in stored segments."""
+        with self._lock:
+            return sum(
+                entry['count'] for entry in self.manifest['segments'].values()
+                if entry['file'] is not None
+            )
+
+    # --- Key rotation ---
+
+    def reencrypt_step(self, batch_size: int = 200) -> bool:
+        """
+        Re-encrypt the next batch_size readings under the current key (used
+        after a key rotation), segment by segment, then the rollups.
+        A segment is copied into a temporary file without holding the store
+        lock; the lock is only taken to copy the lines appended meanwhile and
+        swap the file in, so live writes and queries are not held up.
+
+        Returns:
+            True once every segment and rollup has been processed
+        """
+        if not self.encrypt:
+            return True
+        if self._reencrypt_pending is None:
+            with self._lock:
+                self._reencrypt_pending = self.segments_in_range()
+                # Purged-day aggregates are few and small: all in one go
+                for entry in self.manifest['segments'].values():
+                    if entry.get('rollup') is not None:
+                        entry['rollup'] = self.security.reencrypt(
+                            entry['rollup'].encode('ascii')).decode('ascii')
+                self._save_manifest()
+
+        if self._reencrypt_copy is None:
+            if not self._reencrypt_pending:
+                with self._lock, self.conn:
+                    done = self.rollups.reencrypt_step(batch_size)
+                if done:
+                    self._reencrypt_pending = None
+                return done
+            self._reencrypt_copy = self._start_copy(self._reencrypt_pending.pop(0))
+            if self._reencrypt_copy is None:
+                return False
+
+        copy = self._reencrypt_copy
+        if copy.copy_lines(batch_size) < batch_size:
+            # Caught up with the writer
+            with self._lock:
+                self._finish_copy(copy)
+            self._reencrypt_copy = None
+        return False
+
+    def _start_copy(self, name: str) -> Optional["_SegmentCopy"]:
+        with self._lock:
+            entry = self.manifest['segments'].get(name)
+            if entry is None or entry['file'] is None:
+                return None
+            return _SegmentCopy(name, self.segment_dir / entry['file'], self.security.reencrypt)
+
+    def _finish_copy(self, copy: "_SegmentCopy"):
+        """Copy the rest of the segment and replace it (lock held)."""
+        entry = self.manifest['segments'].get(copy.name)
+        if entry is None or entry['file'] is None:
+            # Purged while it was being copied
+            copy.abort()
+            return
+        if copy.name == self._active_name:
+            self._close_active()
+        copy.copy_lines(None)
+        copy.finish()
+        entry['size'] = copy.path.stat().st_size
+        self._save_manifest()
+
+    # --- Retention ---
+
+    def _encode_rollup(self, rollup: Dict) -> str:
+        return self.rollups.encode(rollup).decode('ascii')
+
+    def _decode_rollup(self, token: str) -> Dict:
+        return self.rollups.decode(token.encode('ascii'))
+
+    def _summarize(self, name: str) -> Dict:
+        """Build a daily aggregate for a segment before it is deleted."""
+        return summarize_readings(self._read_segment(name))
+
+    def purge_expired(self, retention_days: int = config.DATA_RETENTION_DAYS,
+                      batch_size: int = config.RETENTION_BATCH_SIZE,
+                      rollup: bool = config.RETENTION_ROLLUP,
+                      pause: float = 0.0, now: Optional[float] = None,
+                      stop_event: Optional[threading.Event] = None) -> int:
+        """
+        Delete whole segments that ended before the retention cutoff.
+        Same signature as EmotionStore.purge_expired; batch_size is unused
+        because each segment is removed with a single file deletion.
+
+        Returns:
+            Number of deleted readings
+        """
+        cutoff = (now or time.time()) - retention_days * 86400
+        deleted = 0
+        purged_until = None
+
+        with self._lock:
+            names = self.segments_in_range(end=cutoff)
+        for name in names:
+            if stop_event and stop_event.is_set():
+                break
+            with self._lock:
+                entry = self.manifest['segments'][name]
+                if entry['end'] > cutoff:
+                    continue
+                if name == self._active_name:
+                    self._close_active()
+                if rollup:
+                    summary = self._summarize(name)
+                    if entry['rollup'] is not None:
+                        # Backfilled into a day that had been purged before
+                        kept = self._decode_rollup(entry['rollup'])
+                        summary = {key: summary[key] + kept[key] for key in summary}
+                    entry['rollup'] = self._encode_rollup(summary)
+                path = self.segment_dir / entry['file']
+                if path.exists():
+                    path.unlink()
+                deleted += entry['count']
+                purged_until = max(purged_until or entry['end'], entry['end'])
+                if rollup:
+                    entry['file'] = None
+                else:
+                    del self.manifest['segments'][name]
+                self._save_manifest()
+            if pause:
+                time.sleep(pause)
+
+        if purged_until is not None:
+            with self._lock, self.conn:
+                self.rollups.delete_before(purged_until)
+        return deleted
+
+    def get_daily_rollups(self, start: Optional[float] = None,
+                          end: Optional[float] = None) -> List[Dict]:
+        """Daily aggregates kept for purged segments."""
+        start = float('-inf') if start is None else start
+        end = float('inf') if end is None else end
+        with self._lock:
+            return [
+                dict(self._decode_rollup(entry['rollup']), bucket_start=entry['start'])
+                for _, entry in sorted(self.manifest['segments'].items())
+                if entry['rollup'] is not None and start <= entry['start'] < end
+            ]
+
+    def query_rollups(self, start: float, end: float,
+                      resolution: float) -> Tuple[str, List[Dict]]:
+        """See EmotionStore.query_rollups."""
+        with self._lock:
+            return self.rollups.query(start, end, resolution)
+
+    def summarize(self, start: float, end: float) -> Dict:
+        """See EmotionStore.summarize."""
+        with self._lock:
+            return self.rollups.summarize(start, end)
+
+    def close(self):
+        """Close the active segment and flush the manifest."""
+        with self._lock:
+            if self._reencrypt_copy is not None:
+                self._reencrypt_copy.abort()
+                self._reencrypt_copy = None
+            self._close_active()
+            self._save_manifest()
+            self.conn.close()
+
+
+class _SegmentCopy:
+    """Re-encrypting copy of one segment file into '<segment>.tmp'."""
+
+    def __init__(self, name: str, path: Path, reencrypt):
+        self.name = name
+        self.path = path
+        self.tmp_path = path.with_suffix(".tmp")
+        self.reencrypt = reencrypt
+        self.src = open(path, "rb")
+        self.dst = open(self.tmp_path, "wb")
+
+    def copy_lines(self, limit: Optional[int]) -> int:
+        """
+        Copy up to limit complete lines (all of them if None).
+
+        Returns:
+            Number of lines copied; fewer than limit at the end of the file
+        """
+        copied = 0
+        while limit is None or copied < limit:
+            position = self.src.tell()
+            line = self.src.readline()
+            if not line.endswith(b"\n"):
+                # End of file, or a line the writer has not finished yet
+                self.src.seek(position)
+                break
+            if line.strip():
+                self.dst.write(self.reencrypt(line.rstrip(b"\n")) + b"\n")
+            copied += 1
+        return copied
+
+    def finish(self):
+        """Swap the copy in (no more writes to the segment may happen)."""
+        # A torn last line (a crash mid-write) is kept as it was
+        self.dst.write(self.src.read())
+        self.src.close()
+        self.dst.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        self.src.close()
+        self.dst.close()
+        if self.tmp_path.exists():
+            self.tmp_path.unlink()
@@ -0,0 +1,341 @@
+"""
+Persistent Emotion Storage.
+Stores aggregated emotion readings in a local SQLite database.
+Reading details are encrypted with the SecurityManager; only the
+timestamp is kept in clear so range queries and retention can use an index.
+Minute/hour/day rollups (encrypted the same way) are maintained in the same
+transaction as each write, and the daily aggregates kept for purged
+readings are encrypted too.
+"""
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import config
+from core.rollups import VALUE_COLUMNS, RollupTables, empty_summary
+from core.security import SecurityManager
+
+
+def day_start(timestamp: float) -> float:
+    """Return the epoch time of local midnight for the given timestamp."""
+    dt = datetime.fromtimestamp(timestamp)
+    return dt.replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+
+
+class EmotionStore:
+    """SQLite-backed store for per-second emotion readings."""
+
+    def __init__(self, db_path=None, encrypt: bool = config.ENCRYPT_DATABASE,
+                 security: Optional[SecurityManager] = None):
+        """
+        Open (or create) the emotion database.
+
+        Args:
+            db_path: Database file path (defaults to config.DB_PATH)
+            encrypt: Encrypt reading payloads at rest
+            security: SecurityManager to use for encryption
+        """
+        self.db_path = str(db_path or config.DB_PATH)
+        self.encrypt = encrypt
+        self.security = security
+        if self.encrypt and self.security is None:
+            self.security = SecurityManager.for_purpose('readings')
+        self._reencrypt_phase = 'readings'  # then 'rollups', then 'daily'
+        self._reencrypt_cursor = 0
+
+        # One connection shared by the recorder and the retention job;
+        # the lock keeps every transaction short and serialized.
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        if self.db_path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        """Create tables and indexes if they don't exist."""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS readings ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "timestamp REAL NOT NULL, "
+                "payload BLOB NOT NULL)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_readings_timestamp "
+                "ON readings(timestamp)"
+            )
+            self.rollups = RollupTables(self.conn, self.security if self.encrypt else None,
+                                        read_raw=self._readings_in)
+            # Daily aggregates of purged readings, encoded like the rollups
+            columns = [row[1] for row in self.conn.execute("PRAGMA table_info(daily_rollup)")]
+            plain_rows = []
+            if columns and 'payload' not in columns:
+                # Tables from before encryption kept one clear column per value
+                cursor = self.conn.execute("SELECT * FROM daily_rollup")
+                names = [column[0] for column in cursor.description]
+                plain_rows = [dict(zip(names, row)) for row in cursor.fetchall()]
+                self.conn.execute("DROP TABLE daily_rollup")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS daily_rollup ("
+                "bucket_start REAL PRIMARY KEY, "
+                "payload BLOB NOT NULL)"
+            )
+            self.conn.executemany(
+                "INSERT INTO daily_rollup (bucket_start, payload) VALUES (?, ?)",
+                [(row['bucket_start'], self.rollups.encode(row)) for row in plain_rows]
+            )
+
+    def _encode(self, reading: Dict) -> bytes:
+        """Serialize (and encrypt) the non-indexed part of a reading."""
+        payload = json.dumps({
+            'emotion': reading['emotion'],
+            'confidence': reading['confidence'],
+            'valence': reading['valence'],
+            'arousal': reading.get('arousal', 0.0),
+            'probabilities': reading.get('probabilities'),
+        })
+        if self.encrypt:
+            return self.security.encrypt(payload)
+        return payload.encode()
+
+    def _decode(self, timestamp: float, payload: bytes) -> Dict:
+        """Inverse of _encode."""
+        if self.encrypt:
+            text = self.security.decrypt(payload)
+        else:
+            text = bytes(payload).decode()
+        reading = json.loads(text)
+        reading['timestamp'] = datetime.fromtimestamp(timestamp)
+        return reading
+
+    def add_reading(self, reading: Dict):
+        """
+        Persist one emotion reading.
+
+        Args:
+            reading: Dict with timestamp (datetime), emotion, confidence,
+                     valence, arousal and probabilities
+        """
+        timestamp = reading['timestamp'].timestamp()
+        payload = self._encode(reading)
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO readings (timestamp, payload) VALUES (?, ?)",
+                (timestamp, payload)
+            )
+            self.rollups.add(timestamp, reading)
+
+    def get_readings(self, start: Optional[float] = None,
+                     end: Optional[float] = None) -> List[Dict]:
+        """
+        Get readings in [start, end), ordered by time.
+
+        Args:
+            start: Range start (epoch seconds), or None for unbounded
+            end: Range end (epoch seconds), or None for unbounded
+
+        Returns:
+            List of reading dictionaries
+        """
+        start = float('-inf') if start is None else start
+        end = float('inf') if end is None else end
+        with self._lock:
+            return self._readings_in(start, end)
+
+    def _readings_in(self, start: float, end: float) -> List[Dict]:
+        """get_readings for callers already holding the lock."""
+        rows = self.conn.execute(
+            "SELECT timestamp, payload FROM readings "
+            "WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp",
+            (start, end)
+        ).fetchall()
+        return [self._decode(ts, payload) for ts, payload in rows]
+
+    def count(self) -> int:
+        """Number of stored readings."""
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM readings").fetchone()[0]
+
+    def reencrypt_step(self, batch_size: int = 200) -> bool:
+        """
+        Re-encrypt the next batch of payloads under the current key
+        (used after a key rotation): readings, then rollups, then the
+        daily aggregates of purged readings.
+
+        Returns:
+            True once every row has been processed
+        """
+        if not self.encrypt:
+            return True
+        if self._reencrypt_phase == 'rollups':
+            with self._lock, self.conn:
+                if self.rollups.reencrypt_step(batch_size):
+                    self._reencrypt_phase, self._reencrypt_cursor = 'daily', float('-inf')
+            return False
+
+        table, key = {'readings': ('readings', 'id'),
+                      'daily': ('daily_rollup', 'bucket_start')}[self._reencrypt_phase]
+        with self._lock, self.conn:
+            rows = self.conn.execute(
+                f"SELECT {key}, payload FROM {table} WHERE {key} > ? ORDER BY {key} LIMIT ?",
+                (self._reencrypt_cursor, batch_size)
+            ).fetchall()
+            self.conn.executemany(
+                f"UPDATE {table} SET payload = ? WHERE {key} = ?",
+                [(self.security.reencrypt(payload), row_key) for row_key, payload in rows]
+            )
+        if len(rows) == batch_size:
+            self._reencrypt_cursor = rows[-1][0]
+            return False
+        if self._reencrypt_phase == 'readings':
+            self._reencrypt_phase = 'rollups'
+            return False
+        self._reencrypt_phase, self._reencrypt_cursor = 'readings', 0
+        return True
+
+    def _rollup_batch(self, rows):
+        """Fold a batch of (timestamp, payload) rows into daily_rollup."""
+        buckets = {}
+        for timestamp, payload in rows:
+            reading = self._decode(timestamp, payload)
+            bucket = buckets.setdefault(day_start(timestamp), empty_summary())
+            bucket['count'] += 1
+            bucket['valence_sum'] += reading['valence']
+            bucket['arousal_sum'] += reading['arousal']
+            key = f"{reading['emotion']}_count"
+            if key in bucket:
+                bucket[key] += 1
+
+        for start, bucket in buckets.items():
+            row = self.conn.execute(
+                "SELECT payload FROM daily_rollup WHERE bucket_start = ?", (start,)
+            ).fetchone()
+            if row:
+                stored = self.rollups.decode(row[0])
+                bucket = {c: bucket[c] + stored[c] for c in VALUE_COLUMNS}
+            self.conn.execute(
+                "INSERT OR REPLACE INTO daily_rollup (bucket_start, payload) VALUES (?, ?)",
+                (start, self.rollups.encode(bucket))
+            )
+
+    def purge_expired(self, retention_days: int = config.DATA_RETENTION_DAYS,
+                      batch_size: int = config.RETENTION_BATCH_SIZE,
+                      rollup: bool = config.RETENTION_ROLLUP,
+                      pause: float = 0.0, now: Optional[float] = None,
+                      stop_event: Optional[threading.Event] = None) -> int:
+        """
+        Delete readings older than the retention period.
+        Works in small batches along the timestamp index so each write
+        transaction stays short and live recording is never blocked for long.
+
+        Args:
+            retention_days: Keep readings newer than this many days
+            batch_size: Maximum rows deleted per transaction
+            rollup: Fold expired readings into daily_rollup before deleting
+                    (the minute/hour/day rollups are purged with the readings)
+            pause: Seconds to sleep between batches
+            now: Reference time (defaults to time.time())
+            stop_event: Abort between batches when set
+
+        Returns:
+            Number of deleted readings
+        """
+        cutoff = (now or time.time()) - retention_days * 86400
+        deleted = 0
+
+        while not (stop_event and stop_event.is_set()):
+            with self._lock, self.conn:
+                rows = self.conn.execute(
+                    "SELECT id, timestamp, payload FROM readings "
+                    "WHERE timestamp < ? ORDER BY timestamp LIMIT ?",
+                    (cutoff, batch_size)
+                ).fetchall()
+                if not rows:
+                    break
+                if rollup:
+                    self._rollup_batch([(ts, payload) for _, ts, payload in rows])
+                self.conn.executemany(
+                    "DELETE FROM readings WHERE id = ?",
+                    [(row_id,) for row_id, _, _ in rows]
+                )
+            deleted += len(rows)
+            if len(rows) < batch_size:
+                break
+            if pause:
+                time.sleep(pause)
+
+        if not (stop_event and stop_event.is_set()):
+            with self._lock, self.conn:
+                self.rollups.delete_before(cutoff)
+        return deleted
+
+    def get_daily_rollups(self, start: Optional[float] = None,
+                          end: Optional[float] = None) -> List[Dict]:
+        """
+        Get daily aggregates of purged readings.
+
+        Returns:
+            List of dicts with bucket_start, count, valence_sum,
+            arousal_sum and per-emotion counts
+        """
+        start = float('-inf') if start is None else start
+        end = float('inf') if end is None else end
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT bucket_start, payload FROM daily_rollup "
+                "WHERE bucket_start >= ? AND bucket_start < ? ORDER BY bucket_start",
+                (start, end)
+            ).fetchall()
+        return [dict(self.rollups.decode(payload), bucket_start=bucket_start)
+                for bucket_start, payload in rows]
+
+    def query_rollups(self, start: float, end: float,
+                      resolution: float) -> Tuple[str, List[Dict]]:
+        """
+        Aggregated time series for [start, end) at the coarsest rollup level
+        that satisfies the requested resolution (seconds per bucket); below
+        a minute the series comes from raw readings (see RollupTables.query).
+
+        Returns:
+            Tuple (level_name, list of bucket dicts)
+        """
+        with self._lock:
+            return self.rollups.query(start, end, resolution)
+
+    def summarize(self, start: float, end: float) -> Dict:
+        """
+        Aggregate over [start, end) from rollups, with partial minutes at
+        the edges taken from raw readings.
+
+        Returns:
+            Dict with count, valence_sum, arousal_sum and per-emotion counts
+        """
+        with self._lock:
+            return self.rollups.summarize(start, end)
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self.conn.close()
+
+
+def create_store(mode: str = None):
+    """
+    Create the emotion store selected by config.STORAGE_MODE.
+
+    Args:
+        mode: "sqlite" or "segmented" (defaults to config.STORAGE_MODE)
+
+    Returns:
+        EmotionStore or SegmentedStore
+    """
+    mode = mode or config.STORAGE_MODE
+    if mode == "sqlite":
+        return EmotionStore()
+    if mode == "segmented":
+        from core.segments import SegmentedStore
+        return SegmentedStore()
+    raise ValueError(f"Unknown storage mode: {mode}")
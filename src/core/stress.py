@@ -0,0 +1,67 @@
+"""
+Stress Pattern Tracking.
+Keeps the recent readings of one monitored person in memory and flags a
+stress pattern when the share of negative emotions over the history window
+exceeds the threshold. Each camera of a multi-camera setup has its own
+tracker, so one stressed person is not diluted by the rest of the room.
+"""
+from collections import deque
+from datetime import datetime
+from typing import Dict
+
+import config
+
+
+class StressTracker:
+    """Negative-emotion ratio over a sliding window of readings."""
+
+    def __init__(self, history_seconds: float = config.PATTERN_HISTORY_MINUTES * 60,
+                 threshold: float = config.STRESS_THRESHOLD, min_readings: int = 5):
+        """
+        Args:
+            history_seconds: Window the ratio is computed over
+            threshold: Negative ratio above which the person counts as stressed
+            min_readings: Readings needed before any pattern is reported
+        """
+        self.history_seconds = history_seconds
+        self.threshold = threshold
+        self.min_readings = min_readings
+        self._readings = deque()  # (epoch seconds, negative?)
+        self._negative = 0
+        self.stressed = False
+
+    def add(self, reading: Dict) -> bool:
+        """
+        Record a reading.
+
+        Returns:
+            True if this reading started a stress pattern
+        """
+        timestamp = reading['timestamp']
+        if isinstance(timestamp, datetime):
+            timestamp = timestamp.timestamp()
+        negative = reading['emotion'] in config.NEGATIVE_EMOTIONS
+        self._readings.append((timestamp, negative))
+        self._negative += negative
+
+        cutoff = timestamp - self.history_seconds
+        while self._readings and self._readings[0][0] < cutoff:
+            self._negative -= self._readings.popleft()[1]
+
+        was_stressed = self.stressed
+        self.stressed = (len(self._readings) >= self.min_readings
+                         and self.negative_ratio > self.threshold)
+        return self.stressed and not was_stressed
+
+    @property
+    def negative_ratio(self) -> float:
+        return self._negative / len(self._readings) if self._readings else 0.0
+
+    @property
+    def count(self) -> int:
+        return len(self._readings)
+
+    def clear(self):
+        self._readings.clear()
+        self._negative = 0
+        self.stressed = False
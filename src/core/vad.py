@@ -0,0 +1,105 @@
+"""
+Voice Activity Detection.
+Frame-level speech/non-speech decisions from the streaming audio features:
+a speech onset needs energy well above the adaptive noise floor *and* a
+spectral-flux jump (so loud stationary noise such as a fan is rejected);
+once in speech, energy alone keeps it going, and a hangover bridges the
+short pauses between words.
+"""
+from typing import Dict
+
+import numpy as np
+
+import config
+
+# Noise floor adaptation during speech, relative to noise_adapt
+SPEECH_ADAPT_FACTOR = 0.05
+
+
+class VoiceActivityDetector:
+    """Energy / spectral-flux VAD with hangover smoothing."""
+
+    def __init__(self, energy_ratio: float = config.VAD_ENERGY_RATIO,
+                 min_rms: float = config.VAD_MIN_RMS,
+                 flux_threshold: float = config.VAD_FLUX_THRESHOLD,
+                 hangover_frames: int = config.VAD_HANGOVER_FRAMES,
+                 noise_adapt: float = config.VAD_NOISE_ADAPT):
+        """
+        Args:
+            energy_ratio: Speech RMS must exceed noise floor * energy_ratio
+            min_rms: Absolute RMS below which a frame is never speech
+            flux_threshold: Mean positive log-mel change needed for an onset
+            hangover_frames: Frames kept as speech after energy drops
+            noise_adapt: Noise floor smoothing factor for non-speech frames
+        """
+        self.energy_ratio = energy_ratio
+        self.min_rms = min_rms
+        self.flux_threshold = flux_threshold
+        self.hangover_frames = hangover_frames
+        self.noise_adapt = noise_adapt
+
+        self.noise_floor = None
+        self.is_speech = False
+        self._active = False      # Raw (pre-hangover) speech state
+        self._hangover = 0
+        self._prev_log_mel = None
+        self.frames_seen = 0
+        self.speech_frames = 0
+
+    def reset(self):
+        self.noise_floor = None
+        self.is_speech = False
+        self._active = False
+        self._hangover = 0
+        self._prev_log_mel = None
+
+    def process(self, features: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Classify the frames of one FeatureExtractor.process() result.
+
+        Returns:
+            Boolean array, True for speech frames (after hangover)
+        """
+        rms = features['rms']
+        log_mel = features['log_mel']
+        decisions = np.zeros(len(rms), dtype=bool)
+        if len(rms) == 0:
+            return decisions
+
+        # Spectral flux of every frame against its predecessor, in one pass
+        prev = log_mel[:1] if self._prev_log_mel is None else self._prev_log_mel[None, :]
+        diffs = np.diff(np.concatenate([prev, log_mel]), axis=0)
+        flux = np.maximum(diffs, 0.0).mean(axis=1)
+        self._prev_log_mel = log_mel[-1].copy()
+
+        if self.noise_floor is None:
+            self.noise_floor = max(float(rms[0]), 1e-6)
+
+        for i in range(len(rms)):
+            energy = float(rms[i])
+            loud = energy > max(self.min_rms, self.noise_floor * self.energy_ratio)
+            if self._active or self._hangover > 0:
+                # Within an utterance energy alone keeps (or resumes) speech
+                self._active = loud
+            else:
+                self._active = loud and flux[i] > self.flux_threshold
+
+            if self._active:
+                self._hangover = self.hangover_frames
+                decisions[i] = True
+                # Creep towards the level very slowly, so noise that switches
+                # on and stays (a fan, traffic) is eventually absorbed
+                self.noise_floor += self.noise_adapt * SPEECH_ADAPT_FACTOR * (energy - self.noise_floor)
+            elif self._hangover > 0:
+                self._hangover -= 1
+                decisions[i] = True
+            elif energy < self.noise_floor:
+                # Track the background level only outside speech
+                self.noise_floor = max(energy, 1e-6)
+            else:
+                self.noise_floor += self.noise_adapt * (energy - self.noise_floor)
+
+        self.is_speech = bool(decisions[-1])
+        self.frames_seen += len(rms)
+        self.speech_frames += int(np.count_nonzero(decisions))
+        return decisions
@@ -11,6 +11,14 @@ from datetime import datetime
 from collections import deque
 from typing import Dict, List, Tuple
 from audio_module import AudioAnalyzer
+from overlay import OverlayCompositor, polyline_points
+from text_cache import TextRenderer, percent_label
+import config
+from core.fusion import FusionEngine, label_distribution
+from core.profiler import start_profiler
+
+# Height of the HUD strip below the video
+HUD_HEIGHT = 250
 
 # Emotion labels
 EMOTIONS = ['angry', 'disgusted', 'fearful', 'happy', 'sad', 'surprised', 'neutral']
@@ -170,9 +178,14 @@ class MindCareDemoApp:
         self.time_processor = TimeWindowProcessor(window_size=60)
         self.voice_simulator = VoiceCommandSimulator()
         self.audio_analyzer = AudioAnalyzer()
+        self.overlays = OverlayCompositor()
+        self.text = TextRenderer()
+        self.fusion = FusionEngine(labels=EMOTIONS)
+        self._audio_estimates_seen = 0
         
         self.cap = None
         self.face_cascade = None
+        self.gray = None
         self.is_running = False
         self.is_paused = False
         
@@ -227,9 +240,40 @@ class MindCareDemoApp:
         print("❌ No working camera found")
         return False
     
+    def read_into_canvas(self, display: np.ndarray = None):
+        """
+        Read the next camera frame directly into the top of the display canvas.
+        
+        The canvas is allocated on the first frame (or if the camera
+        resolution changes) and reused afterwards; the HUD strip is cleared.
+        
+        Returns:
+            (display, frame) where frame is the video view of display,
+            or (display, None) if the read failed
+        """
+        if display is None:
+            ret, frame = self.cap.read()
+        else:
+            video = display[:display.shape[0] - HUD_HEIGHT]
+            ret, frame = self.cap.read(image=video)
+        if not ret or frame is None:
+            return display, None
+        
+        h, w = frame.shape[:2]
+        if display is None or display.shape[:2] != (h + HUD_HEIGHT, w):
+            display = np.zeros((h + HUD_HEIGHT, w, 3), dtype=np.uint8)
+        video = display[:h]
+        if not np.shares_memory(frame, video):
+            video[:] = frame
+        display[h:] = 0
+        return display, video
+    
     def detect_face(self, frame: np.ndarray) -> Tuple[int, int, int, int]:
         """Detect face in frame."""
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        # Reuse the grayscale buffer between frames
+        if self.gray is None or self.gray.shape != frame.shape[:2]:
+            self.gray = np.empty(frame.shape[:2], dtype=np.uint8)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self.gray)
         faces = self.face_cascade.detectMultiScale(
             gray, scaleFactor=1.1, minNeighbors=5, minSize=(48, 48)
         )
@@ -250,13 +294,13 @@ class MindCareDemoApp:
         # Sort by probability
         sorted_emotions = sorted(emotion_probs.items(), key=lambda x: x[1], reverse=True)
         
+        # Bar backgrounds come from one cached layer
+        tracks = self.overlays.bar_tracks(width, bar_height, spacing, len(sorted_emotions))
+        self.overlays.blend(frame, tracks, x, y)
+        
         for i, (emotion, prob) in enumerate(sorted_emotions):
             y_pos = y + i * (bar_height + spacing)
             
-            # Background
-            cv2.rectangle(frame, (x, y_pos), (x + width, y_pos + bar_height), 
-                         (40, 40, 40), -1)
-            
             # Probability bar
             bar_width = int(width * prob)
             color = COLORS[emotion]
@@ -264,9 +308,9 @@ class MindCareDemoApp:
                          color, -1)
             
             # Text
-            text = f"{emotion.capitalize()} {prob:.2f}"
-            cv2.putText(frame, text, (x + 5, y_pos + 18), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+            text = f"{emotion.capitalize()} {percent_label(prob)}"
+            self.text.put_text(frame, text, (x + 5, y_pos + 18), 
+                              cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
     
     def draw_time_window_buffer(self, frame: np.ndarray, fill_pct: float, 
                                 x: int, y: int, width: int = 200):
@@ -282,8 +326,8 @@ class MindCareDemoApp:
         
         # Text
         text = f"Buffer: {fill_pct:.0%}"
-        cv2.putText(frame, text, (x + 5, y + 20), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        self.text.put_text(frame, text, (x + 5, y + 20), 
+                          cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
     
     def draw_stress_meter(self, frame: np.ndarray, valence: float, 
                          x: int, y: int, width: int = 200):
@@ -308,25 +352,15 @@ class MindCareDemoApp:
         cv2.rectangle(frame, (x, y), (x + fill_width, y + height), color, -1)
         
         # Text
-        text = f"Stress: {stress:.0%}"
-        cv2.putText(frame, text, (x + 5, y + 20), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        text = f"Stress: {percent_label(stress)}"
+        self.text.put_text(frame, text, (x + 5, y + 20), 
+                          cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
     
     def draw_voice_command_overlay(self, frame: np.ndarray, command_text: str, 
                                    response: str, progress: float):
         """Draw voice command overlay."""
         h, w = frame.shape[:2]
         
-        # Semi-transparent overlay
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (50, h//2 - 100), (w - 50, h//2 + 100), 
-                     (30, 30, 30), -1)
-        cv2.addWeighted(overlay, 0.8, frame, 0.2, 0, frame)
-        
-        # Command text
-        cv2.putText(frame, command_text, (70, h//2 - 60), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (68, 255, 255), 2)
-        
         # Processing animation
         if progress < 0.3:
             status = "Processing... ⏳"
@@ -335,26 +369,26 @@ class MindCareDemoApp:
         else:
             status = "Response:"
         
-        cv2.putText(frame, status, (70, h//2 - 20), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 200, 200), 1)
+        # Panel and text are one cached sprite per (command, status, response) state
+        lines = [
+            (command_text, (20, 40), 0.7, (68, 255, 255), 2),
+            (status, (20, 80), 0.6, (200, 200, 200), 1),
+        ]
         
         # Response (show after processing)
         if progress > 0.5:
-            y_offset = h//2 + 20
+            y_offset = 120
             for line in response.split('\n'):
-                cv2.putText(frame, line, (70, y_offset), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+                lines.append((line, (20, y_offset), 0.6, (255, 255, 255), 1))
                 y_offset += 30
+        
+        panel = self.overlays.panel(w - 99, 201, (30, 30, 30), 0.8, lines)
+        self.overlays.blend(frame, panel, 50, h//2 - 100)
     
     def draw_help_overlay(self, frame: np.ndarray):
         """Draw help overlay."""
         h, w = frame.shape[:2]
         
-        # Semi-transparent background
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (w - 280, 10), (w - 10, 250), (30, 30, 30), -1)
-        cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
-        
         # Help text
         help_text = [
             "CONTROLS:",
@@ -369,11 +403,12 @@ class MindCareDemoApp:
             "4 - Statistics"
         ]
         
-        y_offset = 35
-        for line in help_text:
-            cv2.putText(frame, line, (w - 270, y_offset), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
-            y_offset += 22
+        lines = [(line, (10, 25 + i * 22), 0.45, (255, 255, 255), 1)
+                 for i, line in enumerate(help_text)]
+        
+        # Rendered once, then only the panel rectangle is blended each frame
+        panel = self.overlays.panel(271, 241, (30, 30, 30), 0.7, lines)
+        self.overlays.blend(frame, panel, w - 280, 10)
 
     def draw_audio_panel(self, frame: np.ndarray, x: int, y: int, width: int, height: int):
         """Draw audio waveform and emotion analysis."""
@@ -381,24 +416,18 @@ class MindCareDemoApp:
         cv2.rectangle(frame, (x, y), (x + width, y + height), (20, 20, 20), -1)
         
         # Audio Title
-        cv2.putText(frame, "AUDIO ANALYSIS", (x + 10, y + 20), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+        self.text.put_text(frame, "AUDIO ANALYSIS", (x + 10, y + 20), 
+                          cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
         
         # Get data
         audio_state = self.audio_analyzer.get_current_state()
-        waveform = self.audio_analyzer.get_waveform()
+        waveform = self.audio_analyzer.get_waveform_view()
         
-        # Draw waveform
-        if waveform:
+        # Draw waveform (all point coordinates computed at once)
+        if len(waveform) > 1:
             center_y = y + height // 2 + 10
-            points = []
-            for i, val in enumerate(waveform):
-                px = int(x + 10 + (i / len(waveform)) * (width - 20))
-                py = int(center_y + val * (height / 3))
-                points.append((px, py))
-            
-            if len(points) > 1:
-                cv2.polylines(frame, [np.array(points)], False, (0, 255, 255), 1)
+            points = polyline_points(waveform, x + 10, width - 20, center_y, height / 3)
+            cv2.polylines(frame, [points], False, (0, 255, 255), 1)
         
         # Draw Emotion Tag
         emotion = audio_state["emotion"]
@@ -406,8 +435,8 @@ class MindCareDemoApp:
         if emotion != "silence":
             color = COLORS.get(emotion, (255, 255, 255))
         
-        cv2.putText(frame, f"Detected: {emotion.upper()}", (x + width - 180, y + 20), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
+        self.text.put_text(frame, f"Detected: {emotion.upper()}", (x + width - 180, y + 20), 
+                          cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
         
         # Draw Energy Bar
         energy = audio_state["energy"]
@@ -417,8 +446,27 @@ class MindCareDemoApp:
         bar_y = y + 40
         cv2.rectangle(frame, (bar_x, bar_y), (bar_x + bar_w, bar_y + bar_h), (50, 50, 50), -1)
         cv2.rectangle(frame, (bar_x, bar_y), (bar_x + int(bar_w * energy), bar_y + bar_h), (0, 255, 0), -1)
-        cv2.putText(frame, "Energy", (bar_x - 50, bar_y + 5), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.4, (150, 150, 150), 1)
+        self.text.put_text(frame, "Energy", (bar_x - 50, bar_y + 5), 
+                          cv2.FONT_HERSHEY_SIMPLEX, 0.4, (150, 150, 150), 1)
+    
+    def add_audio_estimate(self, timestamp: float):
+        """Feed a new audio emotion estimate (if one was made) into fusion."""
+        runs = self.audio_analyzer.estimations_run
+        if runs == self._audio_estimates_seen:
+            return
+        self._audio_estimates_seen = runs
+        # Audio only reports a label ("calm" is mapped to neutral)
+        emotion = self.audio_analyzer.current_audio_emotion
+        self.fusion.add('audio', timestamp, label_distribution(emotion, EMOTIONS))
+    
+    def draw_fused_emotion(self, frame: np.ndarray, fused: Dict[str, float], x: int, y: int):
+        """Draw the fused audio-visual emotion and the modalities it used."""
+        if fused is None:
+            return
+        emotion, prob = max(fused.items(), key=lambda x: x[1])
+        sources = "+".join(self.fusion.latest_modalities)
+        self.text.put_text(frame, f"Fused: {emotion.upper()} {percent_label(prob)} ({sources})", (x, y), 
+                          cv2.FONT_HERSHEY_SIMPLEX, 0.5, COLORS[emotion], 1)
     
     def run(self):
         """Run the demo."""
@@ -436,9 +484,12 @@ class MindCareDemoApp:
         print("Press 'q' to quit")
         print()
         
+        # Display canvas (video on top, HUD strip below) is reused every frame
+        display = None
+        
         while self.is_running:
-            ret, frame = self.cap.read()
-            if not ret:
+            display, frame = self.read_into_canvas(display)
+            if frame is None:
                 print("Failed to read frame")
                 break
             
@@ -451,10 +502,13 @@ class MindCareDemoApp:
                 self.frame_count = 0
                 self.last_fps_time = current_time
             
-            # Create display frame (larger for UI elements)
             h, w = frame.shape[:2]
-            display = np.zeros((h + 250, w, 3), dtype=np.uint8)
-            display[:h, :w] = frame
+            now = time.monotonic()
+            
+            # Audio runs every frame; its estimates enter fusion as they appear
+            command_info = self.voice_simulator.get_active_command()
+            self.audio_analyzer.update(is_speaking_simulated=command_info is not None)
+            self.add_audio_estimate(now)
             
             if not self.is_paused:
                 # Detect face
@@ -466,6 +520,7 @@ class MindCareDemoApp:
                     # Generate emotion probabilities
                     emotion_probs = self.emotion_generator.get_emotion_probabilities()
                     self.time_processor.add_prediction(emotion_probs)
+                    self.fusion.add('face', now, emotion_probs)
                     
                     # Get aggregated emotion
                     if self.frame_count % 30 == 0:  # Every ~1 second
@@ -489,8 +544,8 @@ class MindCareDemoApp:
                     
                     # Label
                     label = f"{self.emotion_generator.current_emotion.upper()}"
-                    cv2.putText(display, label, (x, y - 10), 
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+                    self.text.put_text(display, label, (x, y - 10), 
+                                      cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
                     
                     # Draw emotion bars
                     self.draw_emotion_bars(display, emotion_probs, 10, h + 10)
@@ -506,17 +561,19 @@ class MindCareDemoApp:
                     
                 else:
                     # No face detected
-                    cv2.putText(display, "No face detected", (20, 50), 
-                               cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 255), 2)
+                    self.text.put_text(display, "No face detected", (20, 50), 
+                                      cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 255), 2)
+                
+                self.draw_audio_panel(display, 220, h + 95, 410, 100)
+                self.draw_fused_emotion(display, self.fusion.step(now), 220, h + 230)
             
             # Status bar
             status_y = h + 60
             status_text = f"FPS: {self.fps:.1f} | State: {'PAUSED' if self.is_paused else 'MONITORING'} | Emotions: {len(self.emotion_history)}"
-            cv2.putText(display, status_text, (10, status_y), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+            self.text.put_text(display, status_text, (10, status_y), 
+                              cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
             
             # Voice command overlay
-            command_info = self.voice_simulator.get_active_command()
             if command_info:
                 self.draw_voice_command_overlay(display, *command_info)
             
@@ -586,14 +643,22 @@ def main():
     parser = argparse.ArgumentParser(description='MindCare Demo')
     parser.add_argument('--camera', type=int, default=None,
                        help='Camera index to use (default: auto-detect)')
+    parser.add_argument('--profile', type=float, nargs='?', metavar='SECONDS',
+                       const=config.PROFILE_DURATION_SECONDS, default=None,
+                       help='Sample thread stacks for SECONDS (default %(const)s) into config.LOG_DIR')
     args = parser.parse_args()
     
+    profiler = start_profiler(args.profile, 'demo_mode')
     app = MindCareDemoApp(camera_index=args.camera)
     
     if args.camera is not None:
         print(f"Using camera index: {args.camera}")
     
-    app.run()
+    try:
+        app.run()
+    finally:
+        if profiler:
+            profiler.stop()
 
 
 if __name__ == "__main__":
@@ -11,6 +11,11 @@ from collections import deque
 from typing import Dict, List, Tuple
 import random
 from audio_module import AudioAnalyzer
+from overlay import OverlayCompositor, polyline_points
+from text_cache import TextRenderer, percent_label
+
+# Height of the HUD strip below the video
+HUD_HEIGHT = 250
 
 # Emotion labels
 EMOTIONS = ['angry', 'disgusted', 'fearful', 'happy', 'sad', 'surprised', 'neutral']
@@ -141,13 +146,33 @@ class VoiceCommandSimulator:
                 progress)
 
 
-def create_simulated_frame(width=640, height=480, face_present=True):
-    """Create a simulated video frame with a face."""
+# (width, height, face_present) -> rendered background, built once
+_simulated_frames = {}
+
+
+def create_simulated_frame(width=640, height=480, face_present=True, out=None):
+    """
+    Create a simulated video frame with a face.
+    
+    The scene is static, so it is rendered once per size and copied from
+    the cache afterwards; pass `out` to copy into an existing buffer.
+    """
+    key = (width, height, face_present)
+    frame = _simulated_frames.get(key)
+    if frame is None:
+        frame = _render_simulated_frame(width, height, face_present)
+        _simulated_frames[key] = frame
+    
+    if out is None:
+        return frame.copy()
+    np.copyto(out, frame)
+    return out
+
+
+def _render_simulated_frame(width, height, face_present):
     # Create gradient background
-    frame = np.zeros((height, width, 3), dtype=np.uint8)
-    for i in range(height):
-        intensity = int(30 + (i / height) * 50)
-        frame[i, :] = [intensity, intensity, intensity]
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    frame[:] = (30 + np.arange(height) / height * 50).astype(np.uint8)[:, None, None]
     
     if face_present:
         # Draw simulated face (ellipse)
@@ -188,6 +213,8 @@ class MindCareDemoNoCamera:
         self.time_processor = TimeWindowProcessor(window_size=60)
         self.voice_simulator = VoiceCommandSimulator()
         self.audio_analyzer = AudioAnalyzer()
+        self.overlays = OverlayCompositor()
+        self.text = TextRenderer()
         
         self.is_running = False
         self.is_paused = False
@@ -208,13 +235,13 @@ class MindCareDemoNoCamera:
         
         sorted_emotions = sorted(emotion_probs.items(), key=lambda x: x[1], reverse=True)
         
+        # Bar backgrounds come from one cached layer
+        tracks = self.overlays.bar_tracks(width, bar_height, spacing, len(sorted_emotions))
+        self.overlays.blend(frame, tracks, x, y)
+        
         for i, (emotion, prob) in enumerate(sorted_emotions):
             y_pos = y + i * (bar_height + spacing)
             
-            # Background
-            cv2.rectangle(frame, (x, y_pos), (x + width, y_pos + bar_height), 
-                         (40, 40, 40), -1)
-            
             # Probability bar
             bar_width = int(width * prob)
             color = COLORS[emotion]
@@ -222,9 +249,9 @@ class MindCareDemoNoCamera:
                          color, -1)
             
             # Text
-            text = f"{emotion.capitalize()} {prob:.2f}"
-            cv2.putText(frame, text, (x + 5, y_pos + 18), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+            text = f"{emotion.capitalize()} {percent_label(prob)}"
+            self.text.put_text(frame, text, (x + 5, y_pos + 18), 
+                              cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
     
     def draw_time_window_buffer(self, frame: np.ndarray, fill_pct: float, 
                                 x: int, y: int, width: int = 200):
@@ -237,8 +264,8 @@ class MindCareDemoNoCamera:
         cv2.rectangle(frame, (x, y), (x + fill_width, y + height), (68, 255, 68), -1)
         
         text = f"Buffer: {fill_pct:.0%}"
-        cv2.putText(frame, text, (x + 5, y + 20), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        self.text.put_text(frame, text, (x + 5, y + 20), 
+                          cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
     
     def draw_stress_meter(self, frame: np.ndarray, valence: float, 
                          x: int, y: int, width: int = 200):
@@ -259,23 +286,16 @@ class MindCareDemoNoCamera:
         
         cv2.rectangle(frame, (x, y), (x + fill_width, y + height), color, -1)
         
-        text = f"Stress: {stress:.0%}"
-        cv2.putText(frame, text, (x + 5, y + 20), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        text = f"Stress: {percent_label(stress)}"
+        self.text.put_text(frame, text, (x + 5, y + 20), 
+                          cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
     
     def draw_voice_command_overlay(self, frame: np.ndarray, command_text: str, 
                                    response: str, progress: float):
         """Draw voice command overlay."""
         h, w = frame.shape[:2]
         
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (50, h//2 - 100), (w - 50, h//2 + 100), 
-                     (30, 30, 30), -1)
-        cv2.addWeighted(overlay, 0.8, frame, 0.2, 0, frame)
-        
-        cv2.putText(frame, command_text, (70, h//2 - 60), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (68, 255, 255), 2)
-        
+        # Processing animation
         if progress < 0.3:
             status = "Processing... ⏳"
         elif progress < 0.6:
@@ -283,24 +303,27 @@ class MindCareDemoNoCamera:
         else:
             status = "Response:"
         
-        cv2.putText(frame, status, (70, h//2 - 20), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 200, 200), 1)
+        # Panel and text are one cached sprite per (command, status, response) state
+        lines = [
+            (command_text, (20, 40), 0.7, (68, 255, 255), 2),
+            (status, (20, 80), 0.6, (200, 200, 200), 1),
+        ]
         
+        # Response (show after processing)
         if progress > 0.5:
-            y_offset = h//2 + 20
+            y_offset = 120
             for line in response.split('\n'):
-                cv2.putText(frame, line, (70, y_offset), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+                lines.append((line, (20, y_offset), 0.6, (255, 255, 255), 1))
                 y_offset += 30
+        
+        panel = self.overlays.panel(w - 99, 201, (30, 30, 30), 0.8, lines)
+        self.overlays.blend(frame, panel, 50, h//2 - 100)
     
     def draw_help_overlay(self, frame: np.ndarray):
         """Draw help overlay."""
         h, w = frame.shape[:2]
         
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (w - 280, 10), (w - 10, 250), (30, 30, 30), -1)
-        cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
-        
+        # Help text
         help_text = [
             "CONTROLS:",
             "q - Quit",
@@ -315,11 +338,12 @@ class MindCareDemoNoCamera:
             "4 - Statistics"
         ]
         
-        y_offset = 35
-        for line in help_text:
-            cv2.putText(frame, line, (w - 270, y_offset), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
-            y_offset += 22
+        lines = [(line, (10, 25 + i * 22), 0.45, (255, 255, 255), 1)
+                 for i, line in enumerate(help_text)]
+        
+        # Rendered once, then only the panel rectangle is blended each frame
+        panel = self.overlays.panel(271, 241, (30, 30, 30), 0.7, lines)
+        self.overlays.blend(frame, panel, w - 280, 10)
 
     def draw_audio_panel(self, frame: np.ndarray, x: int, y: int, width: int, height: int):
         """Draw audio waveform and emotion analysis."""
@@ -327,24 +351,18 @@ class MindCareDemoNoCamera:
         cv2.rectangle(frame, (x, y), (x + width, y + height), (20, 20, 20), -1)
         
         # Audio Title
-        cv2.putText(frame, "AUDIO ANALYSIS", (x + 10, y + 20), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+        self.text.put_text(frame, "AUDIO ANALYSIS", (x + 10, y + 20), 
+                          cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
         
         # Get data
         audio_state = self.audio_analyzer.get_current_state()
-        waveform = self.audio_analyzer.get_waveform()
+        waveform = self.audio_analyzer.get_waveform_view()
         
-        # Draw waveform
-        if waveform:
+        # Draw waveform (all point coordinates computed at once)
+        if len(waveform) > 1:
             center_y = y + height // 2 + 10
-            points = []
-            for i, val in enumerate(waveform):
-                px = int(x + 10 + (i / len(waveform)) * (width - 20))
-                py = int(center_y + val * (height / 3))
-                points.append((px, py))
-            
-            if len(points) > 1:
-                cv2.polylines(frame, [np.array(points)], False, (0, 255, 255), 1)
+            points = polyline_points(waveform, x + 10, width - 20, center_y, height / 3)
+            cv2.polylines(frame, [points], False, (0, 255, 255), 1)
         
         # Draw Emotion Tag
         emotion = audio_state["emotion"]
@@ -352,8 +370,8 @@ class MindCareDemoNoCamera:
         if emotion != "silence":
             color = COLORS.get(emotion, (255, 255, 255))
         
-        cv2.putText(frame, f"Detected: {emotion.upper()}", (x + width - 180, y + 20), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
+        self.text.put_text(frame, f"Detected: {emotion.upper()}", (x + width - 180, y + 20), 
+                          cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
         
         # Draw Energy Bar
         energy = audio_state["energy"]
@@ -363,8 +381,8 @@ class MindCareDemoNoCamera:
         bar_y = y + 40
         cv2.rectangle(frame, (bar_x, bar_y), (bar_x + bar_w, bar_y + bar_h), (50, 50, 50), -1)
         cv2.rectangle(frame, (bar_x, bar_y), (bar_x + int(bar_w * energy), bar_y + bar_h), (0, 255, 0), -1)
-        cv2.putText(frame, "Energy", (bar_x - 50, bar_y + 5), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.4, (150, 150, 150), 1)
+        self.text.put_text(frame, "Energy", (bar_x - 50, bar_y + 5), 
+                          cv2.FONT_HERSHEY_SIMPLEX, 0.4, (150, 150, 150), 1)
     
     def run(self):
         """Run the demo."""
@@ -379,9 +397,16 @@ class MindCareDemoNoCamera:
         print("Press 'q' to quit")
         print()
         
+        # Display canvas (video on top, HUD strip below) is reused every frame
+        w, h = 640, 480
+        display = np.zeros((h + HUD_HEIGHT, w, 3), dtype=np.uint8)
+        video = display[:h]
+        hud = display[h:]
+        
         while self.is_running:
-            # Create simulated frame
-            frame = create_simulated_frame(face_present=self.face_present)
+            # Simulated frame goes straight into the canvas
+            create_simulated_frame(w, h, face_present=self.face_present, out=video)
+            hud[:] = 0
             
             self.frame_count += 1
             
@@ -392,11 +417,6 @@ class MindCareDemoNoCamera:
                 self.frame_count = 0
                 self.last_fps_time = current_time
             
-            # Create display frame
-            h, w = frame.shape[:2]
-            display = np.zeros((h + 250, w, 3), dtype=np.uint8)
-            display[:h, :w] = frame
-            
             if not self.is_paused and self.face_present:
                 # Generate emotion probabilities
                 emotion_probs = self.emotion_generator.get_emotion_probabilities()
@@ -429,8 +449,8 @@ class MindCareDemoNoCamera:
                 cv2.rectangle(display, (x1, y1), (x2, y2), color, 2)
                 
                 label = f"{self.emotion_generator.current_emotion.upper()}"
-                cv2.putText(display, label, (x1, y1 - 10), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+                self.text.put_text(display, label, (x1, y1 - 10), 
+                                  cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
                 
                 # Draw emotion bars
                 self.draw_emotion_bars(display, emotion_probs, 10, h + 10)
@@ -445,20 +465,20 @@ class MindCareDemoNoCamera:
                     self.draw_stress_meter(display, valence, 430, h + 10)
                 
             elif not self.face_present:
-                cv2.putText(display, "No face detected", (20, 50), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 255), 2)
-                cv2.putText(display, "Press 'f' to toggle face", (20, 90), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (200, 200, 200), 1)
+                self.text.put_text(display, "No face detected", (20, 50), 
+                                  cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 255), 2)
+                self.text.put_text(display, "Press 'f' to toggle face", (20, 90), 
+                                  cv2.FONT_HERSHEY_SIMPLEX, 0.7, (200, 200, 200), 1)
             
             # Status bar
             status_y = h + 60
             status_text = f"FPS: {self.fps:.1f} | State: {'PAUSED' if self.is_paused else 'MONITORING'} | Emotions: {len(self.emotion_history)}"
-            cv2.putText(display, status_text, (10, status_y), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+            self.text.put_text(display, status_text, (10, status_y), 
+                              cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
             
             # Demo mode indicator
-            cv2.putText(display, "DEMO MODE (Simulated)", (10, h + 90), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (100, 100, 255), 1)
+            self.text.put_text(display, "DEMO MODE (Simulated)", (10, h + 90), 
+                              cv2.FONT_HERSHEY_SIMPLEX, 0.5, (100, 100, 255), 1)
             
             # Voice command overlay
             command_info = self.voice_simulator.get_active_command()
@@ -3,9 +3,10 @@ Emotion classification module using CNN.
 Classifies facial expressions into emotion categories.
 """
 
+import os
 import numpy as np
 import cv2
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import tensorflow as tf
 from tensorflow import keras
 import config
@@ -14,25 +15,31 @@ import config
 class EmotionClassifier:
     """Classifies facial expressions using a pre-trained CNN model."""
     
-    def __init__(self, model_path: str = None):
+    def __init__(self, model_path: str = None, allow_demo: bool = True):
         """
         Initialize emotion classifier.
         
         Args:
             model_path: Path to pre-trained model file (.h5)
+            allow_demo: Fall back to an untrained demo model when the model
+                        file is missing or fails to load; if False, raise
         """
         self.model = None
         self.model_path = model_path or str(config.MODEL_PATH)
         
         # Try to load model if it exists
-        if config.MODEL_PATH.exists():
+        if os.path.exists(self.model_path):
             try:
                 self.model = keras.models.load_model(self.model_path)
                 print(f"Loaded emotion model from {self.model_path}")
             except Exception as e:
+                if not allow_demo:
+                    raise
                 print(f"Error loading model: {e}")
                 print("Will use simple demo model instead")
                 self.model = None
+        elif not allow_demo:
+            raise FileNotFoundError(f"Emotion model not found: {self.model_path}")
         
         # If no model available, create a simple demo model
         # In a real implementation, you would train or download a proper model
@@ -128,9 +135,18 @@ class EmotionClassifier:
         Returns:
             Dictionary with emotion labels as keys and probabilities as values
         """
-        # Preprocess image
-        preprocessed = self.preprocess_face(face_img)
+        return self.predict(self.preprocess_face(face_img))
+    
+    def predict(self, preprocessed: np.ndarray) -> Dict[str, float]:
+        """
+        Run the model on an already preprocessed face.
         
+        Args:
+            preprocessed: Output of preprocess_face
+            
+        Returns:
+            Dictionary with emotion labels as keys and probabilities as values
+        """
         # Get model predictions
         predictions = self.model.predict(preprocessed, verbose=0)[0]
         
@@ -142,6 +158,27 @@ class EmotionClassifier:
         
         return emotion_probs
     
+    def classify_batch(self, face_imgs: List[np.ndarray]) -> List[Dict[str, float]]:
+        """
+        Classify several face images with a single model call.
+        
+        Args:
+            face_imgs: Face images (BGR or grayscale, any size)
+            
+        Returns:
+            Emotion probability dictionaries, in input order
+        """
+        if not face_imgs:
+            return []
+        
+        batch = np.concatenate([self.preprocess_face(face) for face in face_imgs])
+        predictions = self.model.predict(batch, batch_size=len(face_imgs), verbose=0)
+        
+        return [
+            {emotion: float(prob) for emotion, prob in zip(config.EMOTION_LABELS, row)}
+            for row in predictions
+        ]
+    
     def get_dominant_emotion(self, emotion_probs: Dict[str, float]) -> tuple:
         """
         Get the emotion with highest probability.
@@ -52,13 +52,16 @@ class FaceDetector:
         Detect the largest face in the frame.
         
         Args:
-            frame: Input image (BGR format)
+            frame: Input image (BGR, or already grayscale)
             
         Returns:
             Tuple (x, y, w, h) of the largest face bounding box, or None if no face found
         """
         # Convert to grayscale for Haar Cascade
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if frame.ndim == 3:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        else:
+            gray = frame
         
         # Detect faces
         faces = self.face_cascade.detectMultiScale(
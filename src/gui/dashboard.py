@@ -3,12 +3,25 @@ Dashboard Panel for Statistics and Metrics.
 """
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QProgressBar, QFrame, QGridLayout)
-from PyQt5.QtCore import Qt, pyqtSlot
+from PyQt5.QtCore import Qt, pyqtSlot, QTimer
+
+import config
+
+# Stress color bands: (upper bound in percent, chunk color)
+STRESS_BANDS = [(30, "#28a745"), (70, "#ffc107"), (101, "#dc3545")] # Green, Yellow, Red
+STRESS_STYLES = [
+    f"QProgressBar::chunk {{ background-color: {color}; }}" for _, color in STRESS_BANDS
+]
 
 class DashboardPanel(QWidget):
-    def __init__(self):
+    def __init__(self, update_interval_ms: int = config.UI_UPDATE_INTERVAL_MS):
         super().__init__()
         
+        # Latest values waiting for the next refresh, and what is on screen
+        self._pending = {}
+        self._shown = {}
+        self._stress_band = None
+        
         layout = QVBoxLayout(self)
         layout.setSpacing(15)
         
@@ -68,6 +81,11 @@ class DashboardPanel(QWidget):
             
         layout.addWidget(emotion_frame)
         layout.addStretch()
+        
+        # Coalesce updates into one refresh per UI interval
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.timeout.connect(self._flush)
+        self._refresh_timer.start(update_interval_ms)
 
     def _get_color(self, emotion):
         colors = {
@@ -81,31 +99,56 @@ class DashboardPanel(QWidget):
         }
         return colors.get(emotion, '#ffffff')
 
+    def queue_update(self, emotions: dict = None, stress: float = None,
+                     buffer: float = None):
+        """Record new values; they are applied together on the next refresh."""
+        if emotions is not None:
+            self._pending['emotions'] = emotions
+        if stress is not None:
+            self._pending['stress'] = stress
+        if buffer is not None:
+            self._pending['buffer'] = buffer
+
+    def _flush(self):
+        """Apply all pending values in one pass."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        if 'emotions' in pending:
+            self.update_emotions(pending['emotions'])
+        if 'stress' in pending:
+            self.update_stress(pending['stress'])
+        if 'buffer' in pending:
+            self.update_buffer(pending['buffer'])
+
+    def _set_bar(self, key, bar, val: int):
+        """setValue only when the displayed value actually changes."""
+        if self._shown.get(key) != val:
+            self._shown[key] = val
+            bar.setValue(val)
+
     @pyqtSlot(dict)
     def update_emotions(self, probs: dict):
         """Update emotion bars from dictionary {emotion: probability}."""
         for emotion, prob in probs.items():
             if emotion in self.emotion_bars:
                 val = int(prob * 100)
-                self.emotion_bars[emotion].setValue(val)
+                self._set_bar(emotion, self.emotion_bars[emotion], val)
     
     @pyqtSlot(float)
     def update_stress(self, value: float):
         """Update stress bar (0.0 - 1.0)."""
         val = int(value * 100)
-        self.stress_bar.setValue(val)
+        self._set_bar('stress', self.stress_bar, val)
         
-        # Change color based on stress
-        if val < 30:
-            color = "#28a745" # Green
-        elif val < 70:
-            color = "#ffc107" # Yellow
-        else:
-            color = "#dc3545" # Red
-            
-        self.stress_bar.setStyleSheet(f"QProgressBar::chunk {{ background-color: {color}; }}")
+        # Change color based on stress; restyling forces a QSS re-parse,
+        # so only do it when the color band changes
+        band = next(i for i, (upper, _) in enumerate(STRESS_BANDS) if val < upper)
+        if band != self._stress_band:
+            self._stress_band = band
+            self.stress_bar.setStyleSheet(STRESS_STYLES[band])
 
     @pyqtSlot(float)
     def update_buffer(self, value: float):
         """Update buffer fill percentage (0.0 - 1.0)."""
-        self.buffer_bar.setValue(int(value * 100))
+        self._set_bar('buffer', self.buffer_bar, int(value * 100))
@@ -6,6 +6,7 @@ from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
 from PyQt5.QtCore import Qt, pyqtSlot
 from .video_widget import VideoWidget
 from .dashboard import DashboardPanel
+from .timeline_widget import TimelineWidget
 from .styles import DARK_THEME
 
 class MainWindow(QMainWindow):
@@ -43,6 +44,10 @@ class MainWindow(QMainWindow):
         
         right_layout.addWidget(QLabel("Analysis Dashboard", objectName="Header"))
         right_layout.addWidget(self.dashboard)
+        
+        self.timeline = TimelineWidget()
+        right_layout.addWidget(QLabel("Session Timeline"))
+        right_layout.addWidget(self.timeline)
 
         
         # --- ADD PANELS TO MAIN LAYOUT ---
@@ -0,0 +1,130 @@
+"""
+Session Timeline Widget.
+Plots valence, arousal and stress over the whole session from the store's
+rollups, decimated to one min/max pair per pixel column. The query and the
+decimation run on the store worker (session_columns); the widget only paints.
+"""
+import time
+
+import numpy as np
+from PyQt5.QtWidgets import QWidget, QSizePolicy
+from PyQt5.QtGui import QPainter, QPen, QColor, QPolygonF
+from PyQt5.QtCore import QPointF, QTimer, pyqtSignal, pyqtSlot
+
+from core.decimation import minmax_decimate
+from core.rollups import ROLLUP_LEVELS, bucket_ceil, bucket_floor
+
+# Series name -> line color
+SERIES_COLORS = {
+    'valence': '#44ff44',
+    'arousal': '#0d6efd',
+    'stress': '#dc3545',
+}
+
+
+def session_columns(store, session_start: float, now: float, columns: int) -> dict:
+    """
+    Query the rollups of a session and decimate them to the widget width.
+    Runs on the store worker thread; the widget only paints the result.
+
+    Returns:
+        Series name -> (mins, maxs) arrays, one entry per pixel column
+    """
+    resolution = max((now - session_start) / columns, 1.0)
+
+    # Coarsest rollup level at least as fine as one pixel column; align
+    # the range to it so the store can serve that level. Minute (and raw)
+    # series have their edges clipped by the store, so need no alignment.
+    start, end = session_start, now
+    for name, size in ROLLUP_LEVELS[:-1]:
+        if size <= resolution:
+            start = bucket_floor(session_start, name)
+            end = bucket_ceil(now, name)
+            break
+    _, buckets = store.query_rollups(start, end, resolution)
+
+    buckets = [b for b in buckets if b['count']]
+    if not buckets:
+        return {}
+
+    # The first bucket may start before the session; pin it to the left edge
+    times = np.maximum([b['bucket_start'] for b in buckets], session_start)
+    counts = np.array([b['count'] for b in buckets], dtype=np.float64)
+    valence = np.array([b['valence_sum'] for b in buckets]) / counts
+    arousal = np.array([b['arousal_sum'] for b in buckets]) / counts
+    series = {
+        'valence': valence,
+        'arousal': arousal,
+        'stress': 1.0 - (valence + 1.0) / 2.0,
+    }
+    return {
+        name: minmax_decimate(times, values, session_start, now, columns)
+        for name, values in series.items()
+    }
+
+
+class TimelineWidget(QWidget):
+    # (session_start, now, columns): asks the store worker for fresh columns
+    refresh_requested = pyqtSignal(float, float, int)
+
+    def __init__(self, refresh_interval_ms: int = 1000):
+        super().__init__()
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
+        self.setMinimumHeight(140)
+
+        self.session_start = None
+        # Per-series (mins, maxs) arrays, one entry per pixel column
+        self._columns = {}
+
+        self._pens = {
+            name: QPen(QColor(color), 1) for name, color in SERIES_COLORS.items()
+        }
+        self._axis_pen = QPen(QColor('#3d3d3d'), 1)
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.timeout.connect(self.refresh)
+        self._refresh_timer.start(refresh_interval_ms)
+
+    def start_session(self, start_time: float = None):
+        self.session_start = start_time or time.time()
+        self._columns = {}
+        self.update()
+
+    def refresh(self):
+        """Request columns for the session; they arrive in set_columns()."""
+        if self.session_start is None or self.width() <= 0:
+            return
+        self.refresh_requested.emit(self.session_start, time.time(), self.width())
+
+    @pyqtSlot(float, object)
+    def set_columns(self, session_start, columns):
+        """Show columns computed by session_columns() for a session."""
+        if session_start != self.session_start:
+            return  # Answer to a request from a previous session
+        self._columns = columns
+        self.update()
+
+    def _to_y(self, value: float) -> float:
+        """Map a value in [-1, 1] to a widget y coordinate."""
+        h = self.height() - 4
+        return 2 + (1.0 - value) / 2.0 * h
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing, False)
+
+        # Zero line
+        painter.setPen(self._axis_pen)
+        zero_y = self._to_y(0.0)
+        painter.drawLine(0, int(zero_y), self.width(), int(zero_y))
+
+        for name, (mins, maxs) in self._columns.items():
+            # One vertical min->max stroke per column, joined into a polyline
+            polygon = QPolygonF()
+            for x in np.flatnonzero(~np.isnan(mins)):
+                polygon.append(QPointF(x, self._to_y(mins[x])))
+                polygon.append(QPointF(x, self._to_y(maxs[x])))
+            painter.setPen(self._pens[name])
+            painter.drawPolyline(polygon)
+
+        painter.end()
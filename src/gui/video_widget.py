@@ -3,11 +3,39 @@ Video Widget for displaying OpenCV frames in PyQt5.
 """
 from PyQt5.QtWidgets import QLabel, QSizePolicy
 from PyQt5.QtGui import QImage, QPixmap
-from PyQt5.QtCore import Qt, pyqtSlot
+from PyQt5.QtCore import Qt, pyqtSignal, pyqtSlot
 import cv2
 import numpy as np
 
+
+def prepare_display_image(frame: np.ndarray, target_size) -> QImage:
+    """
+    Convert a BGR frame into an RGB QImage scaled to fit target_size.
+    Safe to call off the GUI thread; the returned image owns its pixels.
+
+    Args:
+        frame: OpenCV BGR image
+        target_size: (width, height) to fit while keeping aspect ratio,
+                     or None to keep the frame size
+    """
+    h, w = frame.shape[:2]
+    if target_size:
+        scale = min(target_size[0] / w, target_size[1] / h)
+        new_w, new_h = max(1, int(w * scale)), max(1, int(h * scale))
+        if (new_w, new_h) != (w, h):
+            interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+            frame = cv2.resize(frame, (new_w, new_h), interpolation=interpolation)
+            h, w = new_h, new_w
+
+    # Convert after scaling so the conversion touches fewer pixels
+    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    return QImage(rgb_frame.data, w, h, 3 * w, QImage.Format_RGB888).copy()
+
+
 class VideoWidget(QLabel):
+    # Emitted with the new (width, height) so producers can pre-scale frames
+    display_size_changed = pyqtSignal(int, int)
+
     def __init__(self):
         super().__init__()
         self.setAlignment(Qt.AlignCenter)
@@ -16,6 +44,15 @@ class VideoWidget(QLabel):
         self.setText("Waiting for Camera...")
         self.setStyleSheet("background-color: black; border-radius: 5px;")
         
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.display_size_changed.emit(self.width(), self.height())
+
+    @pyqtSlot(QImage)
+    def update_image(self, image: QImage):
+        """Show a frame already converted and scaled by the producer thread."""
+        self.setPixmap(QPixmap.fromImage(image))
+
     @pyqtSlot(np.ndarray)
     def update_frame(self, frame: np.ndarray):
         """Update the displayed frame from an OpenCV image."""
@@ -13,6 +13,12 @@ import numpy as np
 import config
 from face_detector import FaceDetector, CameraManager
 from emotion_classifier import EmotionClassifier, TimeWindowProcessor
+from core.storage import create_store
+from core.retention import RetentionJob
+from core.archive import SessionArchiveWriter
+from core.instrumentation import StageTimer
+from core.metrics import PipelineMetrics, start_metrics_server
+from core.profiler import start_profiler
 
 
 class AppState(Enum):
@@ -38,6 +44,14 @@ class MindCareApp:
         self.face_detector = None
         self.emotion_classifier = None
         self.time_processor = None
+        self.store = None
+        self.retention_job = None
+        self.archive_writer = None
+        self.stage_timer = StageTimer(
+            enabled=config.INSTRUMENTATION_ENABLED or config.METRICS_ENABLED
+        )
+        self.metrics = PipelineMetrics('monitor', self.stage_timer)
+        self.metrics_server = None
         
         # State tracking
         self.is_running = False
@@ -47,6 +61,7 @@ class MindCareApp:
         
         # Emotion history
         self.emotion_history = []
+        self.session_start = time.time()
         self.last_pattern_check = time.time()
         
         print(f"{config.APP_NAME} v{config.APP_VERSION}")
@@ -70,6 +85,13 @@ class MindCareApp:
             
             # Initialize time window processor
             self.time_processor = TimeWindowProcessor()
+            self.metrics.queue_depth('time_window', lambda: len(self.time_processor.emotion_buffer))
+            self.metrics_server = start_metrics_server()
+            
+            # Open emotion database and start enforcing data retention
+            self.store = create_store()
+            self.retention_job = RetentionJob(self.store)
+            self.retention_job.start()
             
             print("✓ Initialization complete")
             self.state = AppState.CHECKING_HARDWARE
@@ -114,18 +136,26 @@ class MindCareApp:
         self.state = AppState.MONITORING
         self.time_processor.clear()
         self.last_face_time = time.time()
+        self.session_start = time.time()
+        
+        if config.ARCHIVE_SESSIONS:
+            session_id = datetime.now().strftime("session-%Y%m%d-%H%M%S")
+            self.archive_writer = SessionArchiveWriter(session_id)
         
         self.monitor_loop()
     
     def monitor_loop(self):
         """Main monitoring loop."""
         frame_count = 0
+        timer = self.stage_timer
         
         while self.is_monitoring:
             # Read frame from camera
-            frame = self.camera.read_frame()
+            with timer.span('capture'):
+                frame = self.camera.read_frame()
             
             if frame is None:
+                self.metrics.dropped.inc()
                 print("Failed to read frame from camera")
                 self.state = AppState.ERROR_NO_CAM
                 break
@@ -134,7 +164,11 @@ class MindCareApp:
             current_time = time.time()
             
             # Detect face
-            bbox = self.face_detector.detect_face(frame)
+            with timer.span('gray'):
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            with timer.span('detect'):
+                bbox = self.face_detector.detect_face(gray)
+            self.metrics.frame(current_time, bbox is not None)
             
             if bbox is not None:
                 # Face detected
@@ -143,19 +177,24 @@ class MindCareApp:
                 self.state = AppState.DETECTING_FACE
                 
                 # Extract face region
-                face_img = self.face_detector.extract_face_region(
-                    frame, bbox, config.MODEL_INPUT_SIZE
-                )
+                with timer.span('preprocess'):
+                    face_img = self.face_detector.extract_face_region(
+                        gray, bbox, config.MODEL_INPUT_SIZE
+                    )
+                    preprocessed = self.emotion_classifier.preprocess_face(face_img)
                 
                 # Classify emotion
-                emotion_probs = self.emotion_classifier.classify_emotion(face_img)
+                with timer.span('inference'):
+                    emotion_probs = self.emotion_classifier.predict(preprocessed)
                 
                 # Add to time window
-                self.time_processor.add_prediction(emotion_probs, current_time)
+                with timer.span('aggregate'):
+                    self.time_processor.add_prediction(emotion_probs, current_time)
                 
                 # Get aggregated emotion (every 30 frames / ~1 second)
                 if frame_count % 30 == 0:
-                    aggregated = self.time_processor.get_aggregated_emotion()
+                    with timer.span('aggregate'):
+                        aggregated = self.time_processor.get_aggregated_emotion()
                     if aggregated:
                         dominant_emotion, confidence = self.emotion_classifier.get_dominant_emotion(aggregated)
                         valence, arousal = self.emotion_classifier.calculate_valence_arousal(aggregated)
@@ -170,16 +209,20 @@ class MindCareApp:
                             'probabilities': aggregated
                         }
                         self.emotion_history.append(emotion_data)
+                        self.store.add_reading(emotion_data)
+                        if self.archive_writer:
+                            self.archive_writer.append(emotion_data)
                         
                         # Print status
                         self.print_emotion_status(dominant_emotion, confidence, valence)
                 
                 # Draw visualization
-                color = self.get_emotion_color(
-                    max(emotion_probs.items(), key=lambda x: x[1])[0]
-                )
-                label = f"{max(emotion_probs.items(), key=lambda x: x[1])[0]}"
-                frame = self.face_detector.draw_face_box(frame, bbox, label, color)
+                with timer.span('draw'):
+                    color = self.get_emotion_color(
+                        max(emotion_probs.items(), key=lambda x: x[1])[0]
+                    )
+                    label = f"{max(emotion_probs.items(), key=lambda x: x[1])[0]}"
+                    frame = self.face_detector.draw_face_box(frame, bbox, label, color)
                 
             else:
                 # No face detected
@@ -204,10 +247,11 @@ class MindCareApp:
                 self.last_pattern_check = current_time
             
             # Display frame
-            cv2.imshow('MindCare - Emotion Monitor', frame)
-            
-            # Handle keyboard input
-            key = cv2.waitKey(1) & 0xFF
+            with timer.span('display'):
+                cv2.imshow('MindCare - Emotion Monitor', frame)
+                
+                # Handle keyboard input
+                key = cv2.waitKey(1) & 0xFF
             if key == ord('q'):
                 print("\nStopping monitoring...")
                 self.is_monitoring = False
@@ -226,9 +270,15 @@ class MindCareApp:
         # Cleanup
         cv2.destroyAllWindows()
         self.state = AppState.IDLE
+        if self.archive_writer:
+            print(f"Session archived to {self.archive_writer.close()}")
+            self.archive_writer = None
         
         # Summary
         self.print_session_summary()
+        if timer.enabled:
+            print("Stage latency (ms):")
+            print(timer.report())
     
     def print_emotion_status(self, emotion: str, confidence: float, valence: float):
         """Print current emotion status."""
@@ -242,29 +292,25 @@ class MindCareApp:
         if len(self.emotion_history) < 5:
             return
         
-        # Get last 15 minutes of data
-        cutoff_time = datetime.now().timestamp() - (config.PATTERN_HISTORY_MINUTES * 60)
-        recent_emotions = [
-            e for e in self.emotion_history 
-            if e['timestamp'].timestamp() > cutoff_time
-        ]
+        # Get last 15 minutes of data from the rollups
+        now = time.time()
+        summary = self.store.summarize(now - config.PATTERN_HISTORY_MINUTES * 60, now)
         
-        if not recent_emotions:
+        if not summary['count']:
             return
         
         # Calculate negative emotion ratio
         negative_count = sum(
-            1 for e in recent_emotions 
-            if e['emotion'] in config.NEGATIVE_EMOTIONS
+            summary[f"{emotion}_count"] for emotion in config.NEGATIVE_EMOTIONS
         )
-        negative_ratio = negative_count / len(recent_emotions)
+        negative_ratio = negative_count / summary['count']
         
         # Alert if threshold exceeded
         if negative_ratio > config.STRESS_THRESHOLD:
             print("\n" + "!"*50)
             print(f"⚠️  STRESS PATTERN DETECTED")
             print(f"   Negative emotions: {negative_ratio:.1%} over last "
-                  f"{len(recent_emotions)} readings")
+                  f"{summary['count']} readings")
             print(f"   Suggestion: Consider taking a short break")
             print("!"*50 + "\n")
     
@@ -274,27 +320,25 @@ class MindCareApp:
         print("SESSION SUMMARY")
         print("="*50)
         
-        if not self.emotion_history:
+        summary = self.store.summarize(self.session_start, time.time())
+        total = summary['count']
+        
+        if not total:
             print("No emotions recorded")
             return
         
-        # Count emotions
-        emotion_counts = {}
-        for entry in self.emotion_history:
-            emotion = entry['emotion']
-            emotion_counts[emotion] = emotion_counts.get(emotion, 0) + 1
-        
         # Display distribution
         print("\nEmotion Distribution:")
-        total = len(self.emotion_history)
-        for emotion in sorted(emotion_counts.keys()):
-            count = emotion_counts[emotion]
+        for emotion in sorted(config.EMOTION_LABELS):
+            count = summary[f"{emotion}_count"]
+            if not count:
+                continue
             percentage = (count / total) * 100
             bar = "█" * int(percentage / 2)
             print(f"  {emotion:10s}: {bar} {percentage:5.1f}% ({count})")
         
         # Average valence
-        avg_valence = sum(e['valence'] for e in self.emotion_history) / len(self.emotion_history)
+        avg_valence = summary['valence_sum'] / total
         print(f"\nAverage Valence: {avg_valence:+.2f} ", end="")
         if avg_valence > 0.2:
             print("(Predominantly positive)")
@@ -303,7 +347,7 @@ class MindCareApp:
         else:
             print("(Neutral)")
         
-        print(f"Total readings: {len(self.emotion_history)}")
+        print(f"Total readings: {total}")
         print("="*50 + "\n")
     
     def get_emotion_color(self, emotion: str) -> tuple:
@@ -322,6 +366,12 @@ class MindCareApp:
         """Cleanup resources."""
         if self.camera:
             self.camera.close()
+        if self.retention_job:
+            self.retention_job.stop()
+        if self.store:
+            self.store.close()
+        if self.metrics_server:
+            self.metrics_server.stop()
         print("Cleanup complete")
     
     def run(self):
@@ -348,8 +398,21 @@ class MindCareApp:
 
 def main():
     """Entry point."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='MindCare Emotion Monitor')
+    parser.add_argument('--profile', type=float, nargs='?', metavar='SECONDS',
+                       const=config.PROFILE_DURATION_SECONDS, default=None,
+                       help='Sample thread stacks for SECONDS (default %(const)s) into config.LOG_DIR')
+    args = parser.parse_args()
+    
+    profiler = start_profiler(args.profile, 'main')
     app = MindCareApp()
-    app.run()
+    try:
+        app.run()
+    finally:
+        if profiler:
+            profiler.stop()
 
 
 if __name__ == "__main__":
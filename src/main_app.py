@@ -2,15 +2,27 @@
 Main Application Entry Point for MindCare System.
 Integrates GUI, Camera, and Core Logic using PyQt5 and MVC pattern.
 """
+import queue
 import sys
+import threading
+import time
 import cv2
 import numpy as np
 from PyQt5.QtWidgets import QApplication, QMessageBox
 from PyQt5.QtCore import QThread, pyqtSignal, pyqtSlot, QTimer
 
 from gui.main_window import MainWindow
+from gui.timeline_widget import session_columns
+from gui.video_widget import prepare_display_image
 from core.fsm import FiniteStateMachine, AppState
 from core.security import SecurityManager
+from core.frame_mailbox import FrameMailbox
+from core.storage import EmotionStore
+from core.readings import ReadingClock, make_reading
+from core.instrumentation import StageTimer
+from core.metrics import REGISTRY, PipelineMetrics, start_metrics_server
+from core.profiler import start_profiler
+import config
 from demo_mode import DemoEmotionGenerator, TimeWindowProcessor
 from face_detector import FaceDetector
 
@@ -23,7 +35,9 @@ COLORS = {
 }
 
 class CameraThread(QThread):
-    new_frame = pyqtSignal(np.ndarray)
+    # Emitted when a display-ready image lands in an empty mailbox; the GUI
+    # takes the latest image from self.mailbox, so at most one is pending
+    frame_ready = pyqtSignal()
     # Signal to update dashboard with new emotion data (processed in background)
     emotion_update = pyqtSignal(dict) 
 
@@ -34,6 +48,20 @@ class CameraThread(QThread):
         self.cap = None
         self.detector = FaceDetector()
         self.emotion_generator = emotion_generator # Passed from main app
+        self.display_size = None # (width, height) of the video widget
+        self.mailbox = FrameMailbox() # Latest RGB image, scaled to the widget
+        # Written by this thread only; the metrics server just reads them
+        self.stage_timer = StageTimer(enabled=config.INSTRUMENTATION_ENABLED or config.METRICS_ENABLED)
+        self.metrics = PipelineMetrics('camera', self.stage_timer)
+        self.metrics.queue_depth('display_mailbox', lambda: int(self.mailbox.has_pending))
+        REGISTRY.counter_function('mindcare_display_frames_coalesced_total',
+                                  'Frames replaced before the GUI displayed them',
+                                  lambda: self.mailbox.frames_coalesced)
+        
+    @pyqtSlot(int, int)
+    def set_display_size(self, width, height):
+        """Receive the video widget size so frames can be scaled here."""
+        self.display_size = (width, height)
         
     def run(self):
         # Auto-detect FaceTime camera (720p priority)
@@ -66,42 +94,50 @@ class CameraThread(QThread):
         
         frame_counter = 0
         is_smiling = False # Track smile state across frames if needed, or per frame
+        timer = self.stage_timer
         
         while self.is_running and self.cap.isOpened():
-            ret, frame = self.cap.read()
+            with timer.span('capture'):
+                ret, frame = self.cap.read()
             if ret:
                 frame_counter += 1
                 is_smiling = False # Reset per frame
                 
                 # Face Detection & Visualization
                 try:
-                    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                    face = self.detector.detect_face(gray)
+                    with timer.span('gray'):
+                        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                    with timer.span('detect'):
+                        face = self.detector.detect_face(gray)
+                    self.metrics.frame(time.monotonic(), face is not None)
                     
                     if face:
                         x, y, w, h = face
                         
                         # Check for smile
                         face_roi_gray = gray[y:y+h, x:x+w]
-                        if self.detector.detect_smile(face_roi_gray):
-                            is_smiling = True
-                        
-                        color = (68, 255, 68) # Green
-                        if is_smiling:
-                            color = (0, 255, 255) # Yellow for smile
-                            cv2.putText(frame, "Smiling! :)", (x, y-40), 
-                                      cv2.FONT_HERSHEY_SIMPLEX, 0.8, color, 2)
+                        with timer.span('smile'):
+                            if self.detector.detect_smile(face_roi_gray):
+                                is_smiling = True
                         
-                        elif self.emotion_generator:
-                           curr_emo = self.emotion_generator.current_emotion
-                           color = COLORS.get(curr_emo, (200, 200, 200))
-                           
-                        cv2.rectangle(frame, (x, y), (x+w, y+h), color, 2)
-                        cv2.putText(frame, "Face Detected", (x, y-10), 
-                                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+                        with timer.span('draw'):
+                            color = (68, 255, 68) # Green
+                            if is_smiling:
+                                color = (0, 255, 255) # Yellow for smile
+                                cv2.putText(frame, "Smiling! :)", (x, y-40), 
+                                          cv2.FONT_HERSHEY_SIMPLEX, 0.8, color, 2)
+                            
+                            elif self.emotion_generator:
+                               curr_emo = self.emotion_generator.current_emotion
+                               color = COLORS.get(curr_emo, (200, 200, 200))
+                               
+                            cv2.rectangle(frame, (x, y), (x+w, y+h), color, 2)
+                            cv2.putText(frame, "Face Detected", (x, y-10), 
+                                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
                     else:
-                         cv2.putText(frame, "Searching for face...", (20, 40), 
-                                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (100, 100, 255), 2)
+                        with timer.span('draw'):
+                            cv2.putText(frame, "Searching for face...", (20, 40), 
+                                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (100, 100, 255), 2)
                         
 
                             
@@ -112,11 +148,17 @@ class CameraThread(QThread):
                 # DEMO MODE: Always generate emotion data to keep UI alive
                 # NOW REACTIVE: Pass is_smiling to generator
                 if self.emotion_generator and frame_counter % 5 == 0:
-                    probs = self.emotion_generator.get_emotion_probabilities(is_smiling=is_smiling)
+                    with timer.span('inference'):
+                        probs = self.emotion_generator.get_emotion_probabilities(is_smiling=is_smiling)
                     self.emotion_update.emit(probs)
 
-                self.new_frame.emit(frame)
+                # Convert and scale off the GUI thread; the widget only blits
+                with timer.span('display'):
+                    image = prepare_display_image(frame, self.display_size)
+                    if self.mailbox.post(image):
+                        self.frame_ready.emit()
             else:
+                self.metrics.dropped.inc()
                 self.msleep(100) # Wait a bit if frame read fails
         
         if self.cap:
@@ -126,6 +168,55 @@ class CameraThread(QThread):
         self.is_running = False
         self.wait()
 
+class StoreThread(QThread):
+    """
+    Owns the GUI's store access: readings are written and the
+    timeline's rollups are queried here, so the GUI thread only paints.
+    """
+    # (session_start, per-series columns) for TimelineWidget.set_columns
+    timeline_ready = pyqtSignal(float, object)
+
+    def __init__(self, store):
+        super().__init__()
+        self.store = store
+        self.requests = queue.Queue()
+        self._timeline_lock = threading.Lock()
+        self._timeline_request = None
+
+    def add_reading(self, reading):
+        self.requests.put(('reading', reading))
+
+    @pyqtSlot(float, float, int)
+    def request_timeline(self, session_start, now, columns):
+        """Queue a timeline query; requests not yet served are replaced."""
+        with self._timeline_lock:
+            pending = self._timeline_request is not None
+            self._timeline_request = (session_start, now, columns)
+        if not pending:
+            self.requests.put(('timeline', None))
+
+    def run(self):
+        while True:
+            kind, reading = self.requests.get()
+            try:
+                if kind == 'stop':
+                    break
+                if kind == 'reading':
+                    self.store.add_reading(reading)
+                else:
+                    with self._timeline_lock:
+                        request, self._timeline_request = self._timeline_request, None
+                    session_start, now, columns = request
+                    self.timeline_ready.emit(
+                        session_start, session_columns(self.store, session_start, now, columns))
+            except Exception as e:
+                print(f"Store Error: {e}")
+
+    def stop(self):
+        """Finish queued writes, then exit."""
+        self.requests.put(('stop', None))
+        self.wait()
+
 class MindCareApp:
     def __init__(self):
         self.app = QApplication(sys.argv)
@@ -139,11 +230,24 @@ class MindCareApp:
         self.emotion_generator = DemoEmotionGenerator()
         self.time_processor = TimeWindowProcessor(window_size=60)
         
+        # Per-second readings feed the rollups behind the timeline. They come
+        # from the simulated DemoEmotionGenerator, so they live in memory for
+        # the session only and never reach the real history (or its alerts).
+        self.store = EmotionStore(":memory:", encrypt=False)
+        self.reading_clock = ReadingClock()
+        self.store_thread = StoreThread(self.store)
+        self.window.timeline.refresh_requested.connect(self.store_thread.request_timeline)
+        self.store_thread.timeline_ready.connect(self.window.timeline.set_columns)
+        self.store_thread.start()
+        
         # Treads
         self.camera_thread = CameraThread(emotion_generator=self.emotion_generator)
+        self.camera_thread.metrics.queue_depth('time_window', lambda: len(self.time_processor.buffer))
+        self.metrics_server = start_metrics_server()
         
         # Connect Signals
-        self.camera_thread.new_frame.connect(self.window.video_widget.update_frame)
+        self.camera_thread.frame_ready.connect(self.display_latest_frame)
+        self.window.video_widget.display_size_changed.connect(self.camera_thread.set_display_size)
         self.camera_thread.emotion_update.connect(self.process_emotion_update) # New signal connection
         
         # Connect UI Controls
@@ -154,11 +258,18 @@ class MindCareApp:
         # Initial State
         self.window.show()
 
+    def display_latest_frame(self):
+        """Repaint with the newest frame; older undisplayed frames were coalesced."""
+        image = self.camera_thread.mailbox.take()
+        if image is not None:
+            self.window.video_widget.update_image(image)
+
     def start_monitoring(self):
         self.fsm.start_monitoring()
         self.window.status_bar.showMessage(f"State: {self.fsm.current_state.name} - Monitoring Started")
         if not self.camera_thread.isRunning():
             self.camera_thread.start()
+            self.window.timeline.start_session()
         self.window.btn_start.setEnabled(False)
         self.window.btn_pause.setEnabled(True)
 
@@ -175,8 +286,14 @@ class MindCareApp:
     def stop_session(self):
         self.fsm.stop()
         self.camera_thread.stop()
-        self.window.status_bar.showMessage("Session Stopped. Data Encrypted & Saved.")
-        QMessageBox.information(self.window, "Session Ends", "Session data has been securely saved.")
+        mailbox = self.camera_thread.mailbox
+        print(f"Display: {mailbox.frames_coalesced} of {mailbox.frames_posted} frames coalesced")
+        if self.camera_thread.stage_timer.enabled:
+            print("Camera thread stage latency (ms):")
+            print(self.camera_thread.stage_timer.report())
+        self.window.status_bar.showMessage("Session Stopped. Simulated data was not saved.")
+        QMessageBox.information(self.window, "Session Ends",
+                                "Demo session ended. Simulated readings are not saved to your history.")
         self.window.btn_start.setEnabled(True)
         self.window.btn_pause.setEnabled(False)
         self.window.btn_pause.setText("Pause")
@@ -188,9 +305,10 @@ class MindCareApp:
 
         self.time_processor.add_prediction(probs)
         
-        # Update UI
-        self.window.dashboard.update_emotions(probs)
-        self.window.dashboard.update_buffer(self.time_processor.get_fill_percentage())
+        # Queue UI values; the dashboard applies them on its refresh timer
+        dashboard = self.window.dashboard
+        dashboard.queue_update(emotions=probs,
+                               buffer=self.time_processor.get_fill_percentage())
         
         # Update stress meter
         aggregated = self.time_processor.get_aggregated_emotion()
@@ -200,17 +318,43 @@ class MindCareApp:
                                             'sad': -0.6, 'angry': -0.7, 'fearful': -0.5, 
                                             'disgusted': -0.6}.get(e, 0) for e in aggregated)
             stress = (1.0 - (valence + 1.0) / 2.0)
-            self.window.dashboard.update_stress(stress)
+            dashboard.queue_update(stress=stress)
+            self.record_reading(aggregated)
             
             # Check for Alert Condition
             if stress > 0.8:
                 self.fsm.trigger_alert()
                 self.window.status_bar.showMessage("⚠️ HIGH STRESS DETECTED")
 
+    def record_reading(self, aggregated):
+        """Record the aggregated emotion at most once per second (on the store thread)."""
+        now = time.time()
+        if self.reading_clock.due(now):
+            self.store_thread.add_reading(make_reading(aggregated, now))
+
     def run(self):
-        sys.exit(self.app.exec_())
+        exit_code = self.app.exec_()
+        if self.metrics_server:
+            self.metrics_server.stop()
+        self.store_thread.stop()
+        self.store.close()
+        sys.exit(exit_code)
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='MindCare')
+    parser.add_argument('--profile', type=float, nargs='?', metavar='SECONDS',
+                        const=config.PROFILE_DURATION_SECONDS, default=None,
+                        help='Sample thread stacks for SECONDS (default %(const)s) into config.LOG_DIR')
+    # Remaining arguments are left to Qt
+    args, _ = parser.parse_known_args()
+    
+    profiler = start_profiler(args.profile, 'main_app')
     # Check for camera index arg if needed, else auto
     app = MindCareApp()
-    app.run()
+    try:
+        app.run()
+    finally:
+        if profiler:
+            profiler.stop()
@@ -0,0 +1,273 @@
+"""
+Multi-Camera Monitoring for MindCare.
+Monitors several cameras (e.g. an open-plan study room) from one process.
+Every camera gets its own capture thread with its own face detector, time
+window and stress state; all of them share one emotion model through a
+batched inference worker (core/inference.py), so adding a camera costs
+capture and detection only, not another model instance.
+
+Readings can only be stored for a single camera: the stores have no
+source column, so readings of several people would be mixed into one
+timeline and one set of rollups.
+
+Usage:
+    python multi_camera.py [--cameras 0 1 2] [--store sqlite|segmented (one camera)]
+"""
+import queue
+import threading
+import time
+from typing import Dict, List, Optional
+
+import cv2
+
+import config
+from face_detector import FaceDetector, CameraManager
+from emotion_classifier import EmotionClassifier, TimeWindowProcessor
+from core.inference import BatchInferenceWorker
+from core.instrumentation import StageTimer
+from core.metrics import REGISTRY, PipelineMetrics, start_metrics_server
+from core.readings import ReadingClock, make_reading
+from core.storage import create_store
+from core.stress import StressTracker
+
+
+class CameraStream(threading.Thread):
+    """Capture, detection and per-person state of one camera."""
+
+    def __init__(self, camera_index: int, inference: BatchInferenceWorker,
+                 readings: queue.Queue):
+        """
+        Args:
+            camera_index: Camera device index
+            inference: Shared classifier worker
+            readings: Receives (camera_index, reading, stress_started) once per second
+        """
+        super().__init__(name=f"Camera{camera_index}", daemon=True)
+        self.camera_index = camera_index
+        self.camera = CameraManager(camera_index)
+        self.detector = FaceDetector(method='haar')
+        self.time_processor = TimeWindowProcessor()
+        self.stress = StressTracker()
+        self.inference = inference
+        self.readings = readings
+        self.stage_timer = StageTimer(
+            enabled=config.INSTRUMENTATION_ENABLED or config.METRICS_ENABLED
+        )
+        self.metrics = PipelineMetrics(f"camera{camera_index}", self.stage_timer)
+        self.metrics.queue_depth('time_window', lambda: len(self.time_processor.emotion_buffer))
+        self.latest = None
+        self.error = None
+        self._running = True
+
+    def open(self) -> bool:
+        return self.camera.open()
+
+    def run(self):
+        timer = self.stage_timer
+        clock = ReadingClock()
+        last_face_time = None
+
+        try:
+            while self._running:
+                with timer.span('capture'):
+                    frame = self.camera.read_frame()
+                if frame is None:
+                    self.metrics.dropped.inc()
+                    self.error = "Failed to read frame from camera"
+                    break
+                current_time = time.time()
+
+                with timer.span('gray'):
+                    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                with timer.span('detect'):
+                    bbox = self.detector.detect_face(gray)
+                self.metrics.frame(current_time, bbox is not None)
+
+                if bbox is not None:
+                    with timer.span('preprocess'):
+                        face_img = self.detector.extract_face_region(
+                            gray, bbox, config.MODEL_INPUT_SIZE
+                        )
+                    # Waits for the shared batch this face joined
+                    with timer.span('inference'):
+                        emotion_probs = self.inference.classify(face_img)
+                    with timer.span('aggregate'):
+                        self.time_processor.add_prediction(emotion_probs, current_time)
+                    last_face_time = current_time
+
+                # A reading per second, only while a face is (recently) visible
+                if (clock.due(current_time) and last_face_time is not None
+                        and current_time - last_face_time <= 1.0):
+                    with timer.span('aggregate'):
+                        aggregated = self.time_processor.get_aggregated_emotion()
+                    if aggregated:
+                        reading = make_reading(aggregated, current_time)
+                        self.latest = reading
+                        self.readings.put((self.camera_index, reading, self.stress.add(reading)))
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+        finally:
+            self.camera.close()
+
+    def stop(self, timeout: float = 2.0):
+        self._running = False
+        self.join(timeout)
+
+
+class MultiCameraMonitor:
+    """Runs one CameraStream per camera around a shared inference worker."""
+
+    def __init__(self, camera_indices: List[int] = config.MULTI_CAMERA_INDICES,
+                 store_mode: Optional[str] = None):
+        """
+        Args:
+            camera_indices: Camera device indices to monitor
+            store_mode: Storage backend for the readings, None to not store;
+                        only allowed with a single camera
+        """
+        self.camera_indices = list(camera_indices)
+        if store_mode and len(self.camera_indices) > 1:
+            raise ValueError("storing readings needs a single camera: "
+                             "the store cannot tell cameras apart")
+        self.store_mode = store_mode
+        self.store = None
+        self.inference = None
+        self.streams: Dict[int, CameraStream] = {}
+        self.readings = queue.Queue()
+        self.metrics_server = None
+        self.session_start = time.time()
+
+    def initialize(self) -> bool:
+        """
+        Load the model once and open every camera.
+
+        Returns:
+            True if at least one camera is available
+        """
+        print("Loading emotion classifier...")
+        classifier = EmotionClassifier()
+        self.inference = BatchInferenceWorker(classifier.classify_batch)
+        REGISTRY.counter_function('mindcare_inference_batches_total',
+                                  'Shared classifier calls', lambda: self.inference.batches)
+        REGISTRY.counter_function('mindcare_inference_requests_total',
+                                  'Faces classified by the shared worker',
+                                  lambda: self.inference.requests)
+
+        for index in self.camera_indices:
+            stream = CameraStream(index, self.inference, self.readings)
+            if stream.open():
+                print(f"✓ Camera {index} found and accessible")
+                self.streams[index] = stream
+            else:
+                print(f"✗ Camera {index} not found or not accessible")
+        if not self.streams:
+            return False
+
+        if self.store_mode:
+            self.store = create_store(self.store_mode)
+        self.metrics_server = start_metrics_server()
+        return True
+
+    def run(self):
+        """Monitor until every camera has stopped or Ctrl+C."""
+        if not self.initialize():
+            print("Please ensure a camera is connected and try again")
+            return
+
+        print("\n" + "="*50)
+        print(f"MONITORING {len(self.streams)} CAMERAS")
+        print("="*50)
+        print("Press Ctrl+C to quit\n")
+
+        self.session_start = time.time()
+        self.inference.start()
+        for stream in self.streams.values():
+            stream.start()
+
+        try:
+            while any(stream.is_alive() for stream in self.streams.values()):
+                try:
+                    index, reading, stress_started = self.readings.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                if self.store:
+                    self.store.add_reading(reading)
+                self.print_reading(index, reading)
+                if stress_started:
+                    self.print_stress_alert(index)
+        except KeyboardInterrupt:
+            print("\n\nInterrupted by user")
+        finally:
+            self.cleanup()
+
+    def print_reading(self, index: int, reading: Dict):
+        print(f"[{reading['timestamp'].strftime('%H:%M:%S')}] "
+              f"Camera {index}: {reading['emotion'].upper():10s} | "
+              f"Confidence: {reading['confidence']:.2f} | "
+              f"Valence: {reading['valence']:+.2f}")
+
+    def print_stress_alert(self, index: int):
+        stress = self.streams[index].stress
+        print("\n" + "!"*50)
+        print(f"⚠️  STRESS PATTERN DETECTED (camera {index})")
+        print(f"   Negative emotions: {stress.negative_ratio:.1%} over last "
+              f"{stress.count} readings")
+        print(f"   Suggestion: Consider taking a short break")
+        print("!"*50 + "\n")
+
+    def print_session_summary(self):
+        print("\n" + "="*50)
+        print("SESSION SUMMARY")
+        print("="*50)
+        elapsed = time.time() - self.session_start
+        for index, stream in self.streams.items():
+            metrics = stream.metrics
+            line = (f"Camera {index}: {metrics.frames.value} frames "
+                    f"({metrics.frames.value / elapsed:.1f} fps), "
+                    f"faces in {metrics.face_frames.value}, "
+                    f"negative {stream.stress.negative_ratio:.0%} of {stream.stress.count} readings")
+            if stream.error:
+                line += f" | stopped: {stream.error}"
+            print(line)
+        if self.inference.batches:
+            print(f"Shared inference: {self.inference.requests} faces in "
+                  f"{self.inference.batches} model calls "
+                  f"({self.inference.requests / self.inference.batches:.1f} per call)")
+        print("="*50 + "\n")
+
+    def cleanup(self):
+        for stream in self.streams.values():
+            stream.stop()
+        # Streams are stopped, so nothing is waiting on the worker any more
+        self.inference.stop()
+        self.print_session_summary()
+        for index, stream in self.streams.items():
+            if stream.stage_timer.enabled:
+                print(f"Camera {index} stage latency (ms):")
+                print(stream.stage_timer.report())
+        if self.store:
+            self.store.close()
+        if self.metrics_server:
+            self.metrics_server.stop()
+        print("Cleanup complete")
+
+
+def main():
+    """Entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='MindCare multi-camera monitoring')
+    parser.add_argument('--cameras', type=int, nargs='+', default=config.MULTI_CAMERA_INDICES,
+                       help='Camera device indices')
+    parser.add_argument('--store', choices=['sqlite', 'segmented'], default=None,
+                       help='Store the readings in this backend (single camera only)')
+    args = parser.parse_args()
+    if args.store and len(args.cameras) > 1:
+        parser.error("--store needs a single camera: the store has no camera column")
+
+    print(f"{config.APP_NAME} v{config.APP_VERSION}")
+    MultiCameraMonitor(args.cameras, args.store).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Overlay compositor for the OpenCV demo HUDs.
+Static layers (help panel, overlay panels with their text, bar tracks) are
+rasterized once into cached sprites and blended only over the rectangle
+they cover, instead of copying and re-blending the whole frame each time.
+"""
+
+import cv2
+import numpy as np
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple
+
+
+class Sprite:
+    """
+    Pre-rendered layer: a translucent background block plus foreground
+    pixels (text) with their own coverage.
+    """
+
+    def __init__(self, background: np.ndarray, opacity: float,
+                 foreground: Optional[np.ndarray] = None,
+                 mask: Optional[np.ndarray] = None):
+        """
+        Args:
+            background: Background image (bh, w, 3) uint8, blended at `opacity`
+            opacity: Background opacity 0..1 (1 = copied as is)
+            foreground: Text drawn over black (h, w, 3) uint8, h >= bh
+            mask: Foreground coverage (h, w) uint8, 255 = opaque
+        """
+        self.background = background
+        self.opacity = opacity
+        self.width = background.shape[1]
+        self.height = background.shape[0]
+        # Foreground kept as sparse pixel coordinates, colors and coverage;
+        # text only covers a small fraction of a panel
+        self.fg_ys = self.fg_xs = self.fg_colors = self.fg_inv_alpha = None
+        if foreground is not None:
+            self.fg_ys, self.fg_xs = np.nonzero(mask)
+            self.fg_inv_alpha = 1.0 - mask[self.fg_ys, self.fg_xs, None].astype(np.float32) / 255.0
+            # Text drawn over black is already premultiplied by its coverage
+            self.fg_colors = foreground[self.fg_ys, self.fg_xs].astype(np.float32) + 0.5
+            self.height = max(self.height, foreground.shape[0])
+
+
+@lru_cache(maxsize=32)
+def _polyline_x(count: int, x: int, width: int) -> np.ndarray:
+    xs = (x + np.arange(count) / count * width).astype(np.int32)
+    xs.flags.writeable = False
+    return xs
+
+
+def polyline_points(values: np.ndarray, x: int, width: int, center_y: int,
+                    y_scale: float) -> np.ndarray:
+    """
+    Pixel coordinates for drawing a sample series with cv2.polylines.
+
+    Args:
+        values: Samples, oldest first
+        x: Left edge of the plot
+        width: Horizontal span the samples are spread over
+        center_y: Row of the zero line
+        y_scale: Pixels per unit of sample value
+
+    Returns:
+        int32 array (n, 2) of (x, y) points
+    """
+    values = np.asarray(values)
+    points = np.empty((len(values), 2), dtype=np.int32)
+    points[:, 0] = _polyline_x(len(values), x, width)
+    points[:, 1] = center_y + values * y_scale
+    return points
+
+
+class OverlayCompositor:
+    """Builds and caches sprites and blends them into frames."""
+
+    def __init__(self, max_sprites: int = 64):
+        self.max_sprites = max_sprites
+        self._sprites = OrderedDict()
+
+    def _cached(self, key, build) -> Sprite:
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = build()
+            self._sprites[key] = sprite
+            if len(self._sprites) > self.max_sprites:
+                self._sprites.popitem(last=False)
+        else:
+            self._sprites.move_to_end(key)
+        return sprite
+
+    def panel(self, width: int, height: int, color: Tuple[int, int, int],
+              opacity: float, lines: Sequence[Tuple] = ()) -> Sprite:
+        """
+        Translucent panel with text drawn over it, cached by its contents.
+        Text running past the bottom edge is kept below the panel.
+
+        Args:
+            width, height: Panel size
+            color: Background color (BGR)
+            opacity: Background opacity 0..1
+            lines: (text, (x, y), font_scale, color, thickness) tuples,
+                   positions relative to the panel
+        """
+        key = ('panel', width, height, color, opacity, tuple(lines))
+
+        def build():
+            sprite_height = height
+            for text, (_, y), scale, _, thickness in lines:
+                (_, _), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX,
+                                                   scale, thickness)
+                sprite_height = max(sprite_height, y + baseline + thickness + 1)
+
+            background = np.empty((height, width, 3), dtype=np.uint8)
+            background[:] = color
+            foreground = np.zeros((sprite_height, width, 3), dtype=np.uint8)
+            mask = np.zeros((sprite_height, width), dtype=np.uint8)
+            for text, org, scale, text_color, thickness in lines:
+                cv2.putText(foreground, text, org, cv2.FONT_HERSHEY_SIMPLEX,
+                            scale, text_color, thickness)
+                cv2.putText(mask, text, org, cv2.FONT_HERSHEY_SIMPLEX,
+                            scale, 255, thickness)
+            return Sprite(background, opacity, foreground, mask)
+
+        return self._cached(key, build)
+
+    def bar_tracks(self, width: int, bar_height: int, spacing: int, count: int,
+                   color: Tuple[int, int, int] = (40, 40, 40)) -> Sprite:
+        """Opaque layer with `count` stacked bar backgrounds (gaps are black)."""
+        key = ('tracks', width, bar_height, spacing, count, color)
+
+        def build():
+            height = count * (bar_height + spacing) - spacing + 1
+            background = np.zeros((height, width + 1, 3), dtype=np.uint8)
+            for i in range(count):
+                y = i * (bar_height + spacing)
+                background[y:y + bar_height + 1, :] = color
+            return Sprite(background, 1.0)
+
+        return self._cached(key, build)
+
+    @staticmethod
+    def blend(frame: np.ndarray, sprite: Sprite, x: int, y: int):
+        """Composite a sprite onto frame in place at (x, y), clipped to the frame."""
+        fh, fw = frame.shape[:2]
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + sprite.width, fw), min(y + sprite.height, fh)
+        if x0 >= x1 or y0 >= y1:
+            return
+        sx, sy = x0 - x, y0 - y
+        roi = frame[y0:y1, x0:x1]
+
+        # Background rows
+        bg = sprite.background[sy:sy + (y1 - y0), sx:sx + (x1 - x0)]
+        if bg.size:
+            bg_roi = roi[:bg.shape[0]]
+            if sprite.opacity >= 1.0:
+                bg_roi[:] = bg
+            else:
+                cv2.addWeighted(bg_roi, 1.0 - sprite.opacity, bg, sprite.opacity,
+                                0, dst=bg_roi)
+
+        # Foreground pixels, blended by their antialiasing coverage
+        if sprite.fg_ys is not None:
+            ys, xs = sprite.fg_ys + y, sprite.fg_xs + x
+            colors, inv_alpha = sprite.fg_colors, sprite.fg_inv_alpha
+            if (x0, y0, x1, y1) != (x, y, x + sprite.width, y + sprite.height):
+                inside = (ys >= y0) & (ys < y1) & (xs >= x0) & (xs < x1)
+                ys, xs = ys[inside], xs[inside]
+                colors, inv_alpha = colors[inside], inv_alpha[inside]
+            if frame.flags.c_contiguous:
+                # Flat gather/scatter is much cheaper than 2-D fancy indexing
+                pixels = frame.reshape(-1, frame.shape[2])
+                index = ys * fw + xs
+                pixels[index] = colors + pixels.take(index, axis=0) * inv_alpha
+            else:
+                frame[ys, xs] = colors + frame[ys, xs] * inv_alpha
@@ -0,0 +1,67 @@
+"""
+Unit Tests for the Columnar Session Archive.
+"""
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from core.archive import SessionArchive, SessionArchiveWriter, list_sessions
+
+
+class TestSessionArchive(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_roundtrip_across_chunks(self):
+        with SessionArchiveWriter("s1", self.tmp_dir, chunk_size=16) as writer:
+            for i in range(50):
+                emotion = config.EMOTION_LABELS[i % len(config.EMOTION_LABELS)]
+                writer.append({
+                    'timestamp': datetime.fromtimestamp(1_000_000 + i),
+                    'emotion': emotion,
+                    'probabilities': {emotion: 0.75},
+                })
+
+        archive = SessionArchive(os.path.join(self.tmp_dir, "s1"))
+        self.assertEqual(len(archive), 50)
+        self.assertIsInstance(archive.timestamps, np.memmap)
+        self.assertEqual(archive.probabilities.shape, (50, len(config.EMOTION_LABELS)))
+        self.assertEqual(archive.timestamps[49], 1_000_049)
+        self.assertEqual(archive.label_names[archive.labels[3]], config.EMOTION_LABELS[3])
+        self.assertAlmostEqual(float(archive.probabilities[3, 3]), 0.75)
+
+    def test_select_returns_views(self):
+        n = 1000
+        with SessionArchiveWriter("bulk", self.tmp_dir) as writer:
+            writer.extend(np.arange(n, dtype=np.float64),
+                          np.zeros(n, dtype=np.uint8),
+                          np.full((n, len(config.EMOTION_LABELS)), 0.1))
+
+        archive = SessionArchive(os.path.join(self.tmp_dir, "bulk"))
+        timestamps, labels, probs = archive.select(100, 200)
+        self.assertEqual(len(timestamps), 100)
+        self.assertEqual(timestamps[0], 100)
+        self.assertFalse(timestamps.flags.owndata)
+        self.assertEqual(list_sessions(self.tmp_dir), ["bulk"])
+
+    def test_empty_session(self):
+        SessionArchiveWriter("empty", self.tmp_dir).close()
+        archive = SessionArchive(os.path.join(self.tmp_dir, "empty"))
+        self.assertEqual(len(archive), 0)
+        self.assertEqual(len(archive.select()[0]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
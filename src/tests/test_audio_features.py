@@ -0,0 +1,139 @@
+"""
+Unit Tests for Streaming Audio Feature Extraction.
+WAV fixtures are generated into a temporary directory.
+"""
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import time
+import wave
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.audio_features import FeatureExtractor, mel_filterbank
+from core.audio_sources import WavFileSource, pcm_to_float
+
+SAMPLE_RATE = 16000
+
+
+def write_wav(path, samples, channels=1, sample_rate=SAMPLE_RATE):
+    """Write float samples in [-1, 1] as 16-bit PCM ((n,) or (n, channels))."""
+    pcm = np.clip(np.round(np.asarray(samples) * 32767), -32768, 32767).astype('<i2')
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm.tobytes())
+
+
+def sine(freq, seconds, amplitude=0.5):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return amplitude * np.sin(2 * np.pi * freq * t)
+
+
+class TestFeatureExtractor(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def extract(self, path, block_size=1024):
+        extractor = FeatureExtractor(sample_rate=SAMPLE_RATE, frame_size=512,
+                                     hop_size=256, n_mels=26)
+        parts = []
+        with WavFileSource(path, block_size=block_size) as source:
+            for block in source:
+                parts.append(extractor.process(block))
+        return {name: np.concatenate([p[name] for p in parts]) for name in parts[0]}
+
+    def test_sine_features(self):
+        path = os.path.join(self.tmpdir, "sine.wav")
+        write_wav(path, sine(1000, 1.0))
+        features = self.extract(path)
+
+        # (16000 - 512) // 256 + 1 frames
+        self.assertEqual(len(features['rms']), 61)
+        np.testing.assert_allclose(features['rms'], 0.5 / np.sqrt(2), rtol=0.01)
+        np.testing.assert_allclose(features['zcr'], 2 * 1000 / SAMPLE_RATE, atol=0.005)
+        np.testing.assert_allclose(features['centroid'], 1000, rtol=0.05)
+
+        # The strongest mel band is the one whose filter peaks nearest 1 kHz
+        fb = mel_filterbank(SAMPLE_RATE, 512, 26)
+        peak_band = np.argmax(fb[:, 1000 * 512 // SAMPLE_RATE])
+        self.assertTrue(np.all(np.argmax(features['log_mel'], axis=1) == peak_band))
+
+    def test_silence_is_quiet(self):
+        path = os.path.join(self.tmpdir, "silence.wav")
+        write_wav(path, np.zeros(8000))
+        features = self.extract(path)
+        self.assertTrue(np.all(features['rms'] == 0))
+        self.assertTrue(np.all(features['centroid'] == 0))
+        self.assertTrue(np.all(np.isfinite(features['log_mel'])))
+
+    def test_block_size_does_not_change_features(self):
+        path = os.path.join(self.tmpdir, "noise.wav")
+        write_wav(path, np.random.default_rng(0).uniform(-0.5, 0.5, 20000))
+        reference = self.extract(path, block_size=1024)
+        for block_size in (100, 256, 777, 5000):
+            features = self.extract(path, block_size=block_size)
+            for name in reference:
+                np.testing.assert_allclose(features[name], reference[name], rtol=1e-4, atol=1e-5)
+
+    def test_frame_times(self):
+        extractor = FeatureExtractor(sample_rate=SAMPLE_RATE, frame_size=512, hop_size=256)
+        out = extractor.process(np.zeros(1024, dtype=np.float32))
+        self.assertEqual(len(out['rms']), 3)
+        np.testing.assert_allclose(extractor.frame_times(3), np.array([512, 768, 1024]) / SAMPLE_RATE)
+
+
+class TestAudioSources(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_stereo_mixdown(self):
+        path = os.path.join(self.tmpdir, "stereo.wav")
+        left, right = np.full(100, 0.5), np.full(100, -0.25)
+        write_wav(path, np.stack([left, right], axis=1), channels=2)
+        with WavFileSource(path, block_size=64) as source:
+            blocks = list(source)
+        self.assertEqual([len(b) for b in blocks], [64, 36])
+        np.testing.assert_allclose(np.concatenate(blocks), 0.125, atol=1e-4)
+
+    def test_loop(self):
+        path = os.path.join(self.tmpdir, "short.wav")
+        write_wav(path, np.zeros(10))
+        with WavFileSource(path, block_size=8, loop=True) as source:
+            sizes = [len(source.read()) for _ in range(4)]
+        self.assertEqual(sizes, [8, 2, 8, 2])
+
+    def test_realtime_paced_by_sample_rate(self):
+        path = os.path.join(self.tmpdir, "long.wav")
+        write_wav(path, np.zeros(SAMPLE_RATE))
+        with WavFileSource(path, realtime=True) as source:
+            start = time.monotonic()
+            first = source.read()
+            time.sleep(0.05)
+            block = source.read()
+            elapsed = time.monotonic() - start
+        self.assertEqual(len(first), 0)
+        self.assertGreater(len(block), 0)
+        self.assertLessEqual(len(block), elapsed * SAMPLE_RATE)
+
+    def test_pcm_widths(self):
+        np.testing.assert_allclose(pcm_to_float(bytes([0, 128, 255]), 1, 1),
+                                   [-1.0, 0.0, 127 / 128])
+        int24 = (2 ** 22).to_bytes(3, 'little', signed=True)
+        np.testing.assert_allclose(pcm_to_float(int24, 3, 1), [0.5])
+
+
+if __name__ == '__main__':
+    unittest.main()
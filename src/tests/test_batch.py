@@ -0,0 +1,105 @@
+"""
+Unit Tests for Batch Reprocessing Plans and Checkpoints.
+"""
+import unittest
+import sys
+import os
+import csv
+import tempfile
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from core.batch import CheckpointLog, merged_readings, plan_chunks, unstored_readings, write_csv
+from core.storage import EmotionStore
+
+
+def reading(timestamp, emotion='happy'):
+    probs = {e: 0.0 for e in config.EMOTION_LABELS}
+    probs[emotion] = 1.0
+    return {'timestamp': timestamp, 'emotion': emotion, 'confidence': 1.0,
+            'valence': 0.8, 'arousal': 0.5, 'probabilities': probs}
+
+
+class TestPlanChunks(unittest.TestCase):
+
+    def test_whole_second_chunks(self):
+        chunks = plan_chunks('a.mp4', 30.0, 1000, 100.0, chunk_seconds=10, warmup_frames=60)
+        self.assertEqual([c['first_frame'] for c in chunks], [0, 300, 600, 900])
+        self.assertEqual([c['max_frames'] for c in chunks], [300, 300, 300, None])
+        self.assertTrue(all(c['warmup_frames'] == 60 and c['start_time'] == 100.0 for c in chunks))
+        self.assertEqual(len({c['id'] for c in chunks}), 4)
+
+    def test_unknown_length(self):
+        chunks = plan_chunks('a.mp4', 30.0, 0, 0.0, chunk_seconds=10, warmup_frames=60)
+        self.assertEqual(len(chunks), 1)
+        self.assertIsNone(chunks[0]['max_frames'])
+
+    def test_short_video_single_chunk(self):
+        chunks = plan_chunks('a.mp4', 25.0, 100, 0.0, chunk_seconds=120, warmup_frames=50)
+        self.assertEqual([(c['first_frame'], c['max_frames']) for c in chunks], [(0, None)])
+
+
+class TestCheckpointLog(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'run.checkpoint.jsonl')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_resume_ignores_torn_line(self):
+        log = CheckpointLog(self.path)
+        self.assertEqual(log.done_ids(), set())
+        log.append({'id': 'a#0', 'path': 'a', 'readings': []})
+        log.append({'id': 'a#300', 'path': 'a', 'readings': []})
+        with open(self.path, 'a') as f:
+            f.write('{"id": "a#600", "rea')
+        self.assertEqual(CheckpointLog(self.path).done_ids(), {'a#0', 'a#300'})
+
+    def test_merge_and_csv(self):
+        results = [
+            {'id': 'b#0', 'path': 'b.mp4', 'readings': [reading(5.0)]},
+            {'id': 'a#300', 'path': 'a.mp4', 'readings': [reading(12.0, 'sad')]},
+            {'id': 'a#0', 'path': 'a.mp4', 'readings': [reading(1.0), reading(2.0)]},
+        ]
+        merged = merged_readings(results)
+        self.assertEqual([(r['video'], r['timestamp']) for r in merged],
+                         [('a.mp4', 1.0), ('a.mp4', 2.0), ('a.mp4', 12.0), ('b.mp4', 5.0)])
+
+        out = os.path.join(self.tmp.name, 'readings.csv')
+        write_csv(out, merged)
+        with open(out, newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[2]['emotion'], 'sad')
+        self.assertEqual(float(rows[2]['sad']), 1.0)
+
+
+class TestStoreImport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = EmotionStore(os.path.join(self.tmp.name, 'emotions.db'), encrypt=False)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_rerun_adds_only_missing_readings(self):
+        readings = [reading(1_700_000_000.0 + i + 0.123456) for i in range(5)]
+        readings[2] = reading(readings[2]['timestamp'], 'sad')
+        # An earlier import crashed after three readings
+        for r in readings[:3]:
+            self.store.add_reading(dict(r, timestamp=datetime.fromtimestamp(r['timestamp'])))
+
+        stored = self.store.get_readings(readings[0]['timestamp'], readings[-1]['timestamp'] + 1)
+        self.assertEqual(unstored_readings(readings, stored), readings[3:])
+        self.assertEqual(unstored_readings(readings[:3], stored), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
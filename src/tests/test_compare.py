@@ -0,0 +1,99 @@
+"""
+Unit Tests for the Benchmark Comparison Gate.
+"""
+import unittest
+import sys
+import os
+import io
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+
+import numpy as np
+
+# Add benchmarks directory to path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             'benchmarks'))
+
+from compare import bootstrap_median_ratio, main, repeat_medians
+from harness import RESULTS_VERSION, write_results
+
+
+def entry(repeat_levels, calls=200, seed=0):
+    """Benchmark entry whose repeats have the given typical per-call times."""
+    rng = np.random.default_rng(seed)
+    samples = [(level * rng.lognormal(0.0, 0.2, calls)).tolist() for level in repeat_levels]
+    return {'unit': 'seconds', 'samples': samples}
+
+
+def results(**benchmarks):
+    return {'version': RESULTS_VERSION, 'meta': {}, 'benchmarks': benchmarks}
+
+
+class TestBootstrap(unittest.TestCase):
+
+    def test_ratio_and_interval(self):
+        base = np.array([1.0, 1.02, 0.98, 1.01, 0.99])
+        ratio, low, high = bootstrap_median_ratio(base, base * 1.5)
+        self.assertAlmostEqual(ratio, 1.5)
+        self.assertLessEqual(low, 1.5)
+        self.assertGreaterEqual(high, 1.5)
+        self.assertGreater(low, 1.4)
+
+    def test_repeat_noise_widens_interval(self):
+        # Every call of a repeat shares that repeat's speed: thousands of
+        # calls must not make a 5-repeat comparison look precise
+        noisy = entry([1.0, 1.3, 0.8, 1.2, 0.9], calls=2000)
+        medians = repeat_medians(noisy)
+        self.assertEqual(len(medians), 5)
+        _, low, high = bootstrap_median_ratio(medians, medians[::-1] * 1.1)
+        self.assertLess(low, 1.0)
+        self.assertGreater(high, 1.2)
+
+
+class TestGate(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.baseline = results(pipeline=entry([1.0] * 5), decode=entry([1.0] * 5))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def run_gate(self, candidate, *extra):
+        paths = []
+        for name, data in (('base', self.baseline), ('cand', candidate)):
+            paths.append(os.path.join(self.tmpdir, f"{name}.json"))
+            write_results(paths[-1], data)
+        with redirect_stdout(io.StringIO()):
+            try:
+                main(paths + ['--gate', 'pipeline', *extra])
+            except SystemExit as e:
+                return e.code
+        return 0
+
+    def test_unchanged_passes(self):
+        candidate = results(pipeline=entry([1.0] * 5, seed=1), decode=entry([1.0] * 5, seed=1))
+        self.assertEqual(self.run_gate(candidate), 0)
+
+    def test_gated_regression_fails(self):
+        candidate = results(pipeline=entry([1.5] * 5, seed=1), decode=entry([1.0] * 5))
+        self.assertEqual(self.run_gate(candidate), 1)
+
+    def test_ungated_regression_passes(self):
+        candidate = results(pipeline=entry([1.0] * 5, seed=1), decode=entry([1.5] * 5))
+        self.assertEqual(self.run_gate(candidate), 0)
+
+    def test_gated_benchmark_not_measured_fails(self):
+        self.assertEqual(self.run_gate(results(decode=entry([1.0] * 5))), 1)
+        skipped = results(pipeline={'skipped': "ImportError: no model"},
+                          decode=entry([1.0] * 5))
+        self.assertEqual(self.run_gate(skipped), 1)
+
+    def test_usage_error(self):
+        self.baseline['version'] = RESULTS_VERSION + 1
+        self.assertEqual(self.run_gate(results()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+"""
+Unit Tests for Min/Max Decimation.
+"""
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.decimation import minmax_decimate
+
+
+class TestMinMaxDecimate(unittest.TestCase):
+    def test_output_size_is_column_count(self):
+        t = np.arange(100_000, dtype=float)
+        mins, maxs = minmax_decimate(t, np.sin(t), 0, 100_000, 400)
+        self.assertEqual(len(mins), 400)
+        self.assertTrue(np.all(mins <= maxs))
+
+    def test_preserves_extremes(self):
+        t = np.arange(1000, dtype=float)
+        v = np.zeros(1000)
+        v[123] = 5.0
+        v[877] = -3.0
+        mins, maxs = minmax_decimate(t, v, 0, 1000, 10)
+        self.assertEqual(maxs[1], 5.0)
+        self.assertEqual(mins[8], -3.0)
+        self.assertEqual(np.nanmax(maxs), 5.0)
+
+    def test_empty_columns_are_nan(self):
+        mins, maxs = minmax_decimate(np.array([0.0, 9.5]), np.array([1.0, 2.0]), 0, 10, 10)
+        self.assertEqual(mins[0], 1.0)
+        self.assertEqual(maxs[9], 2.0)
+        self.assertTrue(np.isnan(mins[1:9]).all())
+
+    def test_samples_outside_range_ignored(self):
+        mins, maxs = minmax_decimate(np.array([-5.0, 5.0, 50.0]),
+                                     np.array([9.0, 1.0, 9.0]), 0, 10, 2)
+        self.assertEqual(np.nanmax(maxs), 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
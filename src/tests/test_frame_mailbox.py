@@ -0,0 +1,53 @@
+"""
+Unit Tests for the Latest-Frame Mailbox.
+"""
+import unittest
+import sys
+import os
+import threading
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.frame_mailbox import FrameMailbox
+
+
+class TestFrameMailbox(unittest.TestCase):
+    def setUp(self):
+        self.mailbox = FrameMailbox()
+
+    def test_notify_only_when_empty(self):
+        self.assertTrue(self.mailbox.post("f1"))
+        self.assertFalse(self.mailbox.post("f2"))
+        self.assertEqual(self.mailbox.take(), "f2")
+        self.assertTrue(self.mailbox.post("f3"))
+
+    def test_coalesced_counter(self):
+        for i in range(5):
+            self.mailbox.post(i)
+        self.assertEqual(self.mailbox.frames_coalesced, 4)
+        self.assertEqual(self.mailbox.take(), 4)
+        self.assertIsNone(self.mailbox.take())
+        self.assertFalse(self.mailbox.has_pending)
+
+    def test_concurrent_producer(self):
+        notifications = []
+
+        def produce():
+            for i in range(1000):
+                if self.mailbox.post(i):
+                    notifications.append(i)
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        taken = 0
+        while producer.is_alive() or self.mailbox.has_pending:
+            if self.mailbox.take() is not None:
+                taken += 1
+        producer.join()
+        self.assertEqual(taken, len(notifications))
+        self.assertEqual(taken + self.mailbox.frames_coalesced, 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
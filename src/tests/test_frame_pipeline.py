@@ -0,0 +1,90 @@
+"""
+Unit Tests for the Frame-Parallel Pipeline.
+"""
+import unittest
+import sys
+import os
+import random
+import threading
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.frame_pipeline import FramePipeline
+
+
+def slow_finder():
+    """Frames are ints; odd frames have no face; detection times vary."""
+    rng = random.Random(threading.get_ident())
+
+    def find(frame):
+        time.sleep(rng.random() * 0.002)
+        return None if frame % 2 else frame
+    return find
+
+
+class TestFramePipeline(unittest.TestCase):
+
+    def test_results_in_frame_order(self):
+        calls = []
+
+        def classify_batch(faces):
+            calls.append(len(faces))
+            return [face * 10 for face in faces]
+
+        pipeline = FramePipeline(slow_finder, classify_batch, workers=4, batch_size=8)
+        results = list(pipeline.run(range(100)))
+        self.assertEqual(results, [None if i % 2 else i * 10 for i in range(100)])
+        # 100 frames in batches of 8 frames, 4 faces each (last batch: 2)
+        self.assertEqual(calls, [4] * 12 + [2])
+        self.assertEqual(pipeline.batches, 13)
+
+    def test_one_finder_per_thread(self):
+        created = []
+
+        def factory():
+            created.append(threading.get_ident())
+            return lambda frame: frame
+
+        pipeline = FramePipeline(factory, lambda faces: faces, workers=3, batch_size=4)
+        self.assertEqual(list(pipeline.run(range(50))), list(range(50)))
+        self.assertLessEqual(len(created), 3)
+        self.assertEqual(len(set(created)), len(created))
+
+    def test_reader_error_propagates(self):
+        def frames():
+            yield from range(5)
+            raise IOError("decode failed")
+
+        pipeline = FramePipeline(slow_finder, lambda faces: faces, workers=2, batch_size=2)
+        with self.assertRaises(IOError):
+            list(pipeline.run(frames()))
+
+    def test_early_close_stops_reader(self):
+        pipeline = FramePipeline(slow_finder, lambda faces: faces, workers=2, batch_size=4)
+        results = pipeline.run(iter(range(10 ** 6)))
+        self.assertEqual([next(results) for _ in range(3)], [0, None, 2])
+        results.close()
+        self.assertFalse(any(t.name == "FrameReader" for t in threading.enumerate()))
+
+    def test_early_close_cancels_queued_detections(self):
+        calls = []
+
+        def finder():
+            def find(frame):
+                calls.append(frame)
+                time.sleep(0.01)
+                return frame
+            return find
+
+        pipeline = FramePipeline(finder, lambda faces: faces, workers=1, batch_size=4)
+        results = pipeline.run(range(100))
+        self.assertEqual(next(results), 0)
+        results.close()
+        # The first batch plus at most the detection running at close time
+        self.assertLessEqual(len(calls), pipeline.batch_size + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
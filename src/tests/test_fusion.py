@@ -0,0 +1,114 @@
+"""
+Unit Tests for Audio-Visual Fusion.
+"""
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.fusion import FusionEngine, ModalityStream, label_distribution
+
+LABELS = ['happy', 'sad', 'neutral']
+
+
+class TestModalityStream(unittest.TestCase):
+
+    def setUp(self):
+        self.stream = ModalityStream(3, capacity=8)
+
+    def test_empty(self):
+        self.assertIsNone(self.stream.value_at(0.0, 1.0))
+
+    def test_interpolates_between_samples(self):
+        self.stream.push(1.0, [1.0, 0.0, 0.0])
+        self.stream.push(2.0, [0.0, 1.0, 0.0])
+        np.testing.assert_allclose(self.stream.value_at(1.25, 1.0), [0.75, 0.25, 0.0])
+
+    def test_holds_newest_until_stale(self):
+        self.stream.push(1.0, [0.0, 0.0, 1.0])
+        np.testing.assert_allclose(self.stream.value_at(1.9, 1.0), [0.0, 0.0, 1.0])
+        self.assertIsNone(self.stream.value_at(2.1, 1.0))
+
+    def test_before_first_sample(self):
+        self.stream.push(1.0, [0.0, 0.0, 1.0])
+        self.assertIsNone(self.stream.value_at(0.5, 1.0))
+
+    def test_wraps_capacity(self):
+        for i in range(20):
+            self.stream.push(float(i), [float(i), 0.0, 0.0])
+        np.testing.assert_allclose(self.stream.value_at(18.5, 1.0), [18.5, 0.0, 0.0])
+        self.assertEqual(self.stream.last_time, 19.0)
+
+
+class TestFusionEngine(unittest.TestCase):
+
+    def make(self, **kwargs):
+        params = dict(labels=LABELS, weights={'face': 0.75, 'audio': 0.25},
+                      rate_hz=10, max_hold=1.0, delay=0.0, capacity=16)
+        params.update(kwargs)
+        return FusionEngine(**params)
+
+    def test_weighted_combination(self):
+        engine = self.make()
+        engine.add('face', 0.0, {'happy': 1.0})
+        engine.add('audio', 0.0, {'sad': 1.0})
+        fused = engine.fuse_at(0.5)
+        self.assertAlmostEqual(fused['happy'], 0.75)
+        self.assertAlmostEqual(fused['sad'], 0.25)
+        self.assertEqual(engine.latest_modalities, ('face', 'audio'))
+
+    def test_missing_modality_renormalized(self):
+        engine = self.make()
+        engine.add('face', 0.0, {'happy': 0.5, 'neutral': 0.5})
+        fused = engine.fuse_at(0.1)
+        self.assertAlmostEqual(fused['happy'], 0.5)
+        self.assertAlmostEqual(sum(fused.values()), 1.0)
+        self.assertEqual(engine.latest_modalities, ('face',))
+
+    def test_stale_modality_dropped(self):
+        engine = self.make()
+        engine.add('audio', 0.0, {'sad': 1.0})
+        engine.add('face', 1.5, {'happy': 1.0})
+        fused = engine.fuse_at(1.6)
+        self.assertAlmostEqual(fused['happy'], 1.0)
+        self.assertIsNone(engine.fuse_at(5.0))
+
+    def test_step_rate_limited(self):
+        engine = self.make()
+        engine.add('face', 0.0, {'happy': 1.0})
+        first = engine.step(0.0)
+        engine.add('face', 0.05, {'sad': 1.0})
+        # Next tick is not due yet: the previous result is returned
+        self.assertIs(engine.step(0.05), first)
+        self.assertAlmostEqual(engine.step(0.1)['sad'], 1.0)
+
+    def test_step_clears_when_every_modality_is_stale(self):
+        engine = self.make()
+        engine.add('face', 0.0, {'happy': 1.0})
+        self.assertAlmostEqual(engine.step(0.5)['happy'], 1.0)
+        self.assertIsNone(engine.step(2.0))
+        self.assertIsNone(engine.latest_time)
+        self.assertEqual(engine.latest_modalities, ())
+
+    def test_delay_interpolates(self):
+        engine = self.make(delay=0.5)
+        engine.add('face', 0.0, {'happy': 1.0})
+        engine.add('face', 1.0, {'sad': 1.0})
+        fused = engine.step(1.0)
+        self.assertAlmostEqual(engine.latest_time, 0.5)
+        self.assertAlmostEqual(fused['happy'], 0.5)
+        self.assertAlmostEqual(fused['sad'], 0.5)
+
+    def test_label_distribution(self):
+        probs = label_distribution('sad', LABELS, confidence=0.6)
+        np.testing.assert_allclose(probs, [0.2, 0.6, 0.2], rtol=1e-6)
+        # Labels outside the set count as neutral
+        self.assertEqual(label_distribution('calm', LABELS).argmax(), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+"""
+Unit Tests for Shared Batched Inference and Stress Tracking.
+"""
+import unittest
+import sys
+import os
+import threading
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.inference import BatchInferenceWorker
+from core.stress import StressTracker
+
+
+class TestBatchInferenceWorker(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+
+        def classify_batch(faces):
+            self.calls.append(list(faces))
+            return [face * 2 for face in faces]
+
+        self.worker = BatchInferenceWorker(classify_batch, max_batch=4, max_wait=0.05)
+
+    def tearDown(self):
+        self.worker.stop()
+
+    def test_queued_requests_share_a_call(self):
+        # Queued before the worker starts: collected into full batches
+        futures = [self.worker.submit(i) for i in range(10)]
+        self.worker.start()
+        self.assertEqual([f.result(timeout=2) for f in futures], [i * 2 for i in range(10)])
+        self.assertEqual(self.calls, [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]])
+        self.assertEqual((self.worker.batches, self.worker.requests), (3, 10))
+
+    def test_concurrent_producers(self):
+        self.worker.start()
+        results = {}
+        barrier = threading.Barrier(3)
+
+        def camera(n):
+            barrier.wait()
+            results[n] = self.worker.classify(n)
+
+        threads = [threading.Thread(target=camera, args=(n,)) for n in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(2)
+        self.assertEqual(results, {0: 0, 1: 2, 2: 4})
+        self.assertLess(len(self.calls), 3)
+
+    def test_errors_reach_every_caller(self):
+        worker = BatchInferenceWorker(lambda faces: 1 / 0, max_wait=0.0)
+        worker.start()
+        try:
+            with self.assertRaises(ZeroDivisionError):
+                worker.classify('face')
+        finally:
+            worker.stop()
+        with self.assertRaises(RuntimeError):
+            worker.submit('face')
+
+    def test_short_result_fails_every_caller(self):
+        worker = BatchInferenceWorker(lambda faces: faces[:-1], max_batch=4, max_wait=0.05)
+        futures = [worker.submit(i) for i in range(3)]
+        worker.start()
+        try:
+            for future in futures:
+                with self.assertRaises(RuntimeError):
+                    future.result(timeout=2)
+        finally:
+            worker.stop()
+
+    def test_no_request_left_unanswered_by_stop(self):
+        self.worker.start()
+        futures, rejected = [], []
+        barrier = threading.Barrier(5)
+
+        def camera():
+            barrier.wait()
+            for i in range(200):
+                try:
+                    futures.append(self.worker.submit(i))
+                except RuntimeError:
+                    rejected.append(i)
+
+        threads = [threading.Thread(target=camera) for _ in range(4)]
+        for t in threads:
+            t.start()
+        barrier.wait()
+        self.worker.stop()
+        for t in threads:
+            t.join(2)
+        self.assertEqual(len(futures) + len(rejected), 800)
+        for future in futures:
+            # Served before the stop marker, never left pending
+            self.assertEqual(future.result(timeout=2) % 2, 0)
+
+    def test_requests_fail_when_worker_never_served_them(self):
+        future = self.worker.submit(1)
+        self.worker.stop()
+        with self.assertRaisesRegex(RuntimeError, "inference worker stopped"):
+            future.result(timeout=2)
+
+
+class TestStressTracker(unittest.TestCase):
+
+    def reading(self, t, emotion):
+        return {'timestamp': t, 'emotion': emotion}
+
+    def test_pattern_starts_once_and_expires(self):
+        tracker = StressTracker(history_seconds=60, threshold=0.6, min_readings=5)
+        started = [tracker.add(self.reading(t, 'sad')) for t in range(5)]
+        self.assertEqual(started, [False] * 4 + [True])
+        self.assertFalse(tracker.add(self.reading(5, 'angry')))
+        self.assertTrue(tracker.stressed)
+
+        # A minute of calm pushes the negative readings out of the window
+        for t in range(6, 70):
+            tracker.add(self.reading(t, 'happy'))
+        self.assertFalse(tracker.stressed)
+        self.assertEqual(tracker.negative_ratio, 0.0)
+        self.assertEqual(tracker.count, 61)
+
+
+if __name__ == '__main__':
+    unittest.main()
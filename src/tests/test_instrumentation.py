@@ -0,0 +1,81 @@
+"""
+Unit Tests for Pipeline Latency Instrumentation.
+"""
+import unittest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.instrumentation import LatencyHistogram, StageTimer, latency_bounds
+
+
+class TestLatencyHistogram(unittest.TestCase):
+
+    def test_bounds_are_increasing(self):
+        bounds = latency_bounds(1e-3, 1.0, per_octave=2)
+        self.assertEqual(bounds[0], 1e-3)
+        self.assertGreaterEqual(bounds[-1], 1.0)
+        self.assertTrue(all(b > a for a, b in zip(bounds, bounds[1:])))
+
+    def test_empty(self):
+        h = LatencyHistogram()
+        self.assertIsNone(h.quantile(0.5))
+        self.assertIsNone(h.mean())
+
+    def test_bucket_edges(self):
+        h = LatencyHistogram([0.001, 0.01, 0.1])
+        for value in (0.001, 0.005, 0.05, 5.0):
+            h.record(value)
+        self.assertEqual(h.counts, [1, 1, 1, 1])
+        self.assertEqual(h.max, 5.0)
+
+    def test_quantiles_within_bucket_resolution(self):
+        h = LatencyHistogram()
+        # 1..1000 ms uniformly
+        for i in range(1, 1001):
+            h.record(i / 1000.0)
+        for q, expected in ((0.5, 0.5), (0.95, 0.95), (0.99, 0.99)):
+            self.assertAlmostEqual(h.quantile(q), expected, delta=expected * 0.2)
+        self.assertLessEqual(h.quantile(1.0), h.max)
+        self.assertAlmostEqual(h.mean(), 0.5005)
+
+
+class TestStageTimer(unittest.TestCase):
+
+    def test_disabled_records_nothing(self):
+        timer = StageTimer(enabled=False)
+        with timer.span('detect'):
+            pass
+        timer.record('inference', 0.01)
+        self.assertEqual(timer.summary(), {})
+
+    def test_spans(self):
+        timer = StageTimer(enabled=True)
+        for _ in range(3):
+            with timer.span('detect'):
+                pass
+        timer.record('inference', 0.02)
+        summary = timer.summary()
+        self.assertEqual(set(summary), {'detect', 'inference'})
+        self.assertEqual(summary['detect']['count'], 3)
+        self.assertAlmostEqual(summary['inference']['max'], 0.02)
+        self.assertIn('inference', timer.report())
+
+    def test_unknown_stage_added(self):
+        timer = StageTimer(enabled=True, stages=())
+        with timer.span('custom'):
+            pass
+        self.assertEqual(timer.summary()['custom']['count'], 1)
+
+    def test_span_records_on_exception(self):
+        timer = StageTimer(enabled=True)
+        with self.assertRaises(ValueError):
+            with timer.span('draw'):
+                raise ValueError()
+        self.assertEqual(timer.histograms['draw'].count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+Unit Tests for Metrics Export.
+"""
+import unittest
+import sys
+import os
+import urllib.request
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.instrumentation import StageTimer
+from core.metrics import MetricsRegistry, MetricsServer, PipelineMetrics
+
+
+def sample_lines(text):
+    return [line for line in text.splitlines() if line and not line.startswith('#')]
+
+
+class TestMetricsRegistry(unittest.TestCase):
+
+    def test_counter_and_gauge(self):
+        registry = MetricsRegistry()
+        frames = registry.counter('frames_total', 'Frames', source='a')
+        fps = registry.gauge('fps', 'FPS')
+        frames.inc(3)
+        fps.set(29.5)
+        text = registry.render()
+        self.assertIn('# TYPE frames_total counter', text)
+        self.assertIn('frames_total{source="a"} 3', text)
+        self.assertIn('fps 29.5', text)
+
+    def test_function_metrics(self):
+        registry = MetricsRegistry()
+        items = [1, 2]
+        registry.gauge_function('depth', 'Depth', lambda: len(items), queue='q')
+        registry.gauge_function('broken', 'Broken', lambda: 1 / 0)
+        items.append(3)
+        lines = sample_lines(registry.render())
+        self.assertEqual(lines, ['depth{queue="q"} 3'])
+
+    def test_kind_conflict(self):
+        registry = MetricsRegistry()
+        registry.counter('x', 'X')
+        with self.assertRaises(ValueError):
+            registry.gauge('x', 'X')
+
+    def test_histograms_cumulative(self):
+        registry = MetricsRegistry()
+        timer = StageTimer(enabled=True)
+        for seconds in (0.001, 0.002, 0.5):
+            timer.record('detect', seconds)
+        registry.stage_histograms('latency_seconds', 'Latency', timer, source='a')
+        lines = sample_lines(registry.render())
+        buckets = [line for line in lines if line.startswith('latency_seconds_bucket')]
+        counts = [int(line.rsplit(' ', 1)[1]) for line in buckets]
+        self.assertEqual(counts, sorted(counts))
+        self.assertEqual(buckets[-1], 'latency_seconds_bucket{source="a",stage="detect",le="+Inf"} 3')
+        self.assertIn('latency_seconds_count{source="a",stage="detect"} 3', lines)
+        # Stages that never ran are not exported
+        self.assertFalse(any('stage="smile"' in line for line in lines))
+
+
+class TestPipelineMetrics(unittest.TestCase):
+
+    def test_frame_accounting(self):
+        registry = MetricsRegistry()
+        metrics = PipelineMetrics('test', StageTimer(enabled=True), registry)
+        for i in range(31):
+            metrics.frame(i / 30.0, face_present=i % 2 == 0)
+        self.assertEqual(metrics.frames.value, 31)
+        self.assertEqual(metrics.face_frames.value, 16)
+        self.assertAlmostEqual(metrics.fps.value, 30.0)
+        self.assertGreater(metrics.face_presence.value, 0.0)
+
+
+class TestMetricsServer(unittest.TestCase):
+
+    def test_scrape(self):
+        registry = MetricsRegistry()
+        registry.counter('frames_total', 'Frames').inc()
+        server = MetricsServer(registry, host='127.0.0.1', port=0)
+        server.start()
+        try:
+            url = f"http://127.0.0.1:{server.port}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                body = response.read().decode('utf-8')
+                self.assertTrue(response.headers['Content-Type'].startswith('text/plain'))
+            self.assertIn('frames_total 1', body)
+        finally:
+            server.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
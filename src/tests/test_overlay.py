@@ -0,0 +1,69 @@
+"""
+Unit Tests for the Overlay Compositor.
+"""
+import unittest
+import sys
+import os
+
+import cv2
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from overlay import OverlayCompositor
+
+
+def reference_panel(frame, x, y, w, h, opacity, lines):
+    """The full-frame copy + addWeighted drawing the compositor replaces."""
+    overlay = frame.copy()
+    cv2.rectangle(overlay, (x, y), (x + w - 1, y + h - 1), (30, 30, 30), -1)
+    cv2.addWeighted(overlay, opacity, frame, 1 - opacity, 0, frame)
+    for text, (tx, ty), scale, color, thickness in lines:
+        cv2.putText(frame, text, (x + tx, y + ty), cv2.FONT_HERSHEY_SIMPLEX,
+                    scale, color, thickness)
+
+
+class TestOverlayCompositor(unittest.TestCase):
+    def setUp(self):
+        self.compositor = OverlayCompositor()
+        rng = np.random.default_rng(0)
+        self.frame = rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)
+        self.lines = [("CONTROLS:", (10, 25), 0.45, (255, 255, 255), 1),
+                      ("q - Quit", (10, 47), 0.7, (68, 255, 255), 2)]
+
+    def test_matches_full_frame_blend(self):
+        expected = self.frame.copy()
+        reference_panel(expected, 360, 10, 271, 241, 0.7, self.lines)
+
+        panel = self.compositor.panel(271, 241, (30, 30, 30), 0.7, self.lines)
+        self.compositor.blend(self.frame, panel, 360, 10)
+
+        diff = np.abs(self.frame.astype(int) - expected.astype(int))
+        self.assertLessEqual(diff.max(), 1)
+
+    def test_sprites_are_cached(self):
+        first = self.compositor.panel(100, 50, (30, 30, 30), 0.7, self.lines)
+        second = self.compositor.panel(100, 50, (30, 30, 30), 0.7, list(self.lines))
+        self.assertIs(first, second)
+
+    def test_clipped_blend_leaves_outside_untouched(self):
+        original = self.frame.copy()
+        panel = self.compositor.panel(271, 241, (30, 30, 30), 0.7, self.lines)
+        self.compositor.blend(self.frame, panel, 500, 400)
+        self.assertTrue(np.array_equal(self.frame[:400], original[:400]))
+        self.assertTrue(np.array_equal(self.frame[:, :500], original[:, :500]))
+        self.assertFalse(np.array_equal(self.frame[400:, 500:], original[400:, 500:]))
+
+    def test_bar_tracks_match_rectangles(self):
+        frame = np.zeros((300, 300, 3), dtype=np.uint8)
+        expected = frame.copy()
+        for i in range(7):
+            cv2.rectangle(expected, (10, 20 + i * 30), (210, 20 + i * 30 + 25),
+                          (40, 40, 40), -1)
+        self.compositor.blend(frame, self.compositor.bar_tracks(200, 25, 5, 7), 10, 20)
+        self.assertTrue(np.array_equal(frame, expected))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Unit Tests for the Sampling Profiler.
+"""
+import unittest
+import sys
+import os
+import tempfile
+import threading
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.profiler import SamplingProfiler
+
+
+def busy_worker(stop_event):
+    while not stop_event.is_set():
+        sum(i * i for i in range(1000))
+
+
+class TestSamplingProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.stop_event = threading.Event()
+        self.worker = threading.Thread(target=busy_worker, args=(self.stop_event,),
+                                       name="Worker", daemon=True)
+        self.worker.start()
+
+    def tearDown(self):
+        self.stop_event.set()
+        self.worker.join()
+        self.tmp.cleanup()
+
+    def test_samples_worker_and_writes_output(self):
+        profiler = SamplingProfiler(duration=10.0, interval=0.002, name="test",
+                                    output_dir=self.tmp.name)
+        profiler.start()
+        time.sleep(0.2)
+        profiler.stop()
+
+        self.assertGreater(profiler.samples, 10)
+        collapsed_path, summary_path = profiler.paths
+        lines = collapsed_path.read_text().splitlines()
+        worker_lines = [line for line in lines if line.startswith("Worker;")]
+        self.assertTrue(worker_lines)
+        self.assertTrue(any("busy_worker" in line for line in worker_lines))
+        # Each line ends with a sample count
+        for line in lines:
+            self.assertTrue(line.rsplit(" ", 1)[1].isdigit())
+        self.assertFalse(any("SamplingProfiler" in line.split(";")[0] for line in lines))
+
+        summary = summary_path.read_text()
+        self.assertIn("busy_worker", summary)
+        self.assertIn("self %", summary)
+
+    def test_stops_after_duration(self):
+        profiler = SamplingProfiler(duration=0.05, interval=0.01, output_dir=self.tmp.name)
+        profiler.start()
+        profiler.join(timeout=5)
+        self.assertFalse(profiler.is_alive())
+        self.assertIsNotNone(profiler.paths)
+
+
+if __name__ == '__main__':
+    unittest.main()
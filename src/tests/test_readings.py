@@ -0,0 +1,116 @@
+"""
+Unit Tests for Emotion Readings.
+"""
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from core.batch import plan_chunks
+from core.readings import ReadingClock, TimeWindow, make_reading, recording_readings, warmup_seconds
+
+
+class TestMakeReading(unittest.TestCase):
+
+    def test_fields(self):
+        aggregated = {e: 0.0 for e in config.EMOTION_LABELS}
+        aggregated.update(happy=0.75, sad=0.25)
+        reading = make_reading(aggregated, 1_700_000_000.0)
+        self.assertEqual(reading['timestamp'], datetime.fromtimestamp(1_700_000_000.0))
+        self.assertEqual(reading['emotion'], 'happy')
+        self.assertEqual(reading['confidence'], 0.75)
+        expected_valence = 0.75 * config.EMOTION_VALENCE['happy'] + 0.25 * config.EMOTION_VALENCE['sad']
+        self.assertAlmostEqual(reading['valence'], expected_valence)
+        self.assertEqual(reading['probabilities'], aggregated)
+        self.assertIsNot(reading['probabilities'], aggregated)
+
+
+class TestReadingClock(unittest.TestCase):
+
+    def test_once_per_second(self):
+        clock = ReadingClock()
+        times = [i / 30 for i in range(30 * 3 + 1)]
+        due = [t for t in times if clock.due(t)]
+        self.assertEqual(len(due), 3)
+        self.assertAlmostEqual(due[0], 1.0)
+
+    def test_gap_skips_missed_seconds(self):
+        clock = ReadingClock()
+        self.assertTrue(clock.due(5.5))
+        self.assertFalse(clock.due(5.9))
+        self.assertTrue(clock.due(6.0))
+
+    def test_wall_clock(self):
+        clock = ReadingClock()
+        self.assertTrue(clock.due(1_700_000_000.2))
+        self.assertFalse(clock.due(1_700_000_000.9))
+        self.assertTrue(clock.due(1_700_000_001.0))
+
+
+def probs(emotion):
+    values = {e: 0.0 for e in config.EMOTION_LABELS}
+    values[emotion] = 1.0
+    return values
+
+
+class TestTimeWindow(unittest.TestCase):
+
+    def test_mean_over_stream_time(self):
+        window = TimeWindow(seconds=2)
+        window.add(0.0, probs('sad'))
+        window.add(1.5, probs('happy'))
+        self.assertAlmostEqual(window.aggregate(1.5)['sad'], 0.5)
+        # The sad prediction is now older than two seconds
+        self.assertEqual(window.aggregate(2.5)['happy'], 1.0)
+        self.assertIsNone(window.aggregate(10.0))
+
+
+class TestRecordingReadings(unittest.TestCase):
+
+    def setUp(self):
+        # 40 s at 30 fps: changing emotions, faces dropping in and out
+        self.fps = 30.0
+        self.results = []
+        for index in range(1200):
+            t = index / self.fps
+            if (t % 7.0) > 5.5 or 16.2 < t < 19.0:
+                self.results.append(None)
+            else:
+                self.results.append(probs(config.EMOTION_LABELS[int(t / 3) % len(config.EMOTION_LABELS)]))
+
+    def readings(self, first_frame=0, max_frames=None, warmup_frames=0, stats=None):
+        seek_frame = max(0, first_frame - warmup_frames)
+        limit = None if max_frames is None else first_frame - seek_frame + max_frames
+        frames = self.results[seek_frame:None if limit is None else seek_frame + limit]
+        return list(recording_readings(frames, self.fps, 1_700_000_000.0, first_frame,
+                                       seek_frame, limit, stats))
+
+    def test_sequential_pass(self):
+        stats = {}
+        readings = self.readings(stats=stats)
+        self.assertEqual(stats['frames'], 1200)
+        self.assertEqual(stats['readings'], len(readings))
+        seconds = [r['timestamp'].timestamp() - 1_700_000_000.0 for r in readings]
+        # One per second, plus the trailing partial second
+        self.assertTrue(all(b - a >= 0.99 for a, b in zip(seconds[:-1], seconds[1:-1])))
+        self.assertAlmostEqual(seconds[-1], 1199 / self.fps, places=3)
+        # No face for more than a second: no readings
+        self.assertFalse(any(17.3 < s < 19.0 for s in seconds))
+
+    def test_chunks_match_sequential_pass(self):
+        sequential = self.readings()
+        warmup = round(self.fps * warmup_seconds())
+        for chunk_seconds in (3, 5, 11):
+            chunks = plan_chunks('a.mp4', self.fps, len(self.results), 0.0, chunk_seconds, warmup)
+            chunked = []
+            for chunk in chunks:
+                chunked.extend(self.readings(chunk['first_frame'], chunk['max_frames'], warmup))
+            self.assertEqual(chunked, sequential)
+
+
+if __name__ == '__main__':
+    unittest.main()
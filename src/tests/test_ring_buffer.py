@@ -0,0 +1,51 @@
+"""
+Unit Tests for the Sample Ring Buffer.
+"""
+import unittest
+import sys
+import os
+from collections import deque
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.ring_buffer import RingBuffer
+
+
+class TestRingBuffer(unittest.TestCase):
+    def test_matches_deque(self):
+        rng = np.random.default_rng(0)
+        for capacity in (1, 5, 64):
+            ring = RingBuffer(capacity)
+            reference = deque([0.0] * capacity, maxlen=capacity)
+            for _ in range(200):
+                samples = rng.random(rng.integers(0, 2 * capacity + 2)).astype(np.float32)
+                ring.extend(samples)
+                reference.extend(samples)
+                np.testing.assert_array_equal(ring.view(), np.array(reference, dtype=np.float32))
+
+    def test_view_is_zero_copy_and_read_only(self):
+        ring = RingBuffer(4)
+        ring.extend([1, 2, 3, 4, 5, 6])
+        view = ring.view()
+        self.assertTrue(np.shares_memory(view, ring._data))
+        self.assertFalse(view.flags.writeable)
+        np.testing.assert_array_equal(view, [3, 4, 5, 6])
+
+    def test_latest_and_counters(self):
+        ring = RingBuffer(4)
+        ring.append(7)
+        ring.extend([8, 9])
+        np.testing.assert_array_equal(ring.latest(2), [8, 9])
+        self.assertEqual(ring[-1], 9)
+        self.assertEqual(ring.total_written, 3)
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            RingBuffer(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
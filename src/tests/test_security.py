@@ -4,11 +4,19 @@ Unit Tests for Security Manager.
 import unittest
 import sys
 import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.security import SecurityManager
+import config
+from core.security import SecurityManager, KeyRotationJob, clear_key_cache
+from core.storage import EmotionStore
+from core.segments import SegmentedStore
+from cryptography.fernet import InvalidToken
 
 class TestSecurity(unittest.TestCase):
     def setUp(self):
@@ -39,5 +47,136 @@ class TestSecurity(unittest.TestCase):
         sec2 = SecurityManager(key_path=self.test_key)
         self.assertEqual(key1, sec2.key)
 
+class TestKeyHierarchy(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.key_path = os.path.join(self.tmp_dir, "master.key")
+
+    def tearDown(self):
+        clear_key_cache()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_purpose_keys_are_distinct_and_stable(self):
+        readings = SecurityManager(self.key_path, purpose='readings')
+        exports = SecurityManager(self.key_path, purpose='exports')
+        self.assertNotEqual(readings.key, exports.key)
+        self.assertNotEqual(readings.key, SecurityManager(self.key_path).key)
+
+        clear_key_cache()
+        self.assertEqual(readings.key, SecurityManager(self.key_path, purpose='readings').key)
+
+    def test_purpose_keys_do_not_decrypt_each_other(self):
+        token = SecurityManager(self.key_path, purpose='readings').encrypt("x")
+        with self.assertRaises(InvalidToken):
+            SecurityManager(self.key_path, purpose='settings').decrypt(token)
+
+    def test_for_purpose_is_shared(self):
+        a = SecurityManager.for_purpose('readings', key_path=self.key_path)
+        b = SecurityManager.for_purpose('readings', key_path=self.key_path)
+        self.assertIs(a, b)
+        with self.assertRaises(ValueError):
+            SecurityManager.for_purpose('unknown', key_path=self.key_path)
+
+    def test_rotation_reencrypts_stores(self):
+        security = SecurityManager(self.key_path, purpose='readings')
+        store = EmotionStore(os.path.join(self.tmp_dir, "e.db"), security=security)
+        segments = SegmentedStore(os.path.join(self.tmp_dir, "seg"), security=security)
+        reading = {'timestamp': datetime.now(), 'emotion': 'happy', 'confidence': 1.0,
+                   'valence': 0.8, 'arousal': 0.5, 'probabilities': {}}
+        for _ in range(5):
+            store.add_reading(reading)
+            segments.add_reading(reading)
+        old_token = security.encrypt("before rotation")
+
+        security.rotate_key()
+        self.assertTrue(security.rotation_pending)
+        self.assertEqual(security.decrypt(old_token), "before rotation")
+
+        job = KeyRotationJob({'readings': [store, segments], 'exports': [], 'settings': []},
+                             key_path=self.key_path, batch_size=2, batch_pause=0)
+        job.start()
+        job.join()
+        self.assertTrue(job.finished and job.retired)
+        self.assertFalse(security.rotation_pending)
+        self.assertFalse(os.path.exists(self.key_path + ".old"))
+
+        with self.assertRaises(InvalidToken):
+            security.decrypt(old_token)
+        self.assertEqual(len(store.get_readings()), 5)
+        self.assertEqual(len(segments.get_readings()), 5)
+        # Encrypted rollups were re-encrypted too
+        now = time.time()
+        self.assertEqual(store.summarize(now - 3600, now + 3600)['count'], 5)
+        self.assertEqual(segments.summarize(now - 3600, now + 3600)['count'], 5)
+        store.close()
+        segments.close()
+
+    def test_previous_key_kept_until_every_purpose_migrated(self):
+        readings = SecurityManager.for_purpose('readings', key_path=self.key_path)
+        exports = SecurityManager.for_purpose('exports', key_path=self.key_path)
+        exported = exports.encrypt("export")
+        readings.rotate_key()
+        self.assertEqual(readings.pending_purposes, ['exports', 'readings', 'settings'])
+
+        job = KeyRotationJob({'readings': []}, key_path=self.key_path)
+        job.start()
+        job.join()
+        self.assertTrue(job.finished)
+        self.assertFalse(job.retired)
+        self.assertEqual(exports.decrypt(exported), "export")
+
+        # A restarted process still knows what is pending
+        clear_key_cache()
+        exports = SecurityManager.for_purpose('exports', key_path=self.key_path)
+        self.assertEqual(exports.pending_purposes, ['exports', 'settings'])
+        exported = exports.reencrypt(exported)
+        self.assertFalse(exports.retire_previous_key())
+        self.assertTrue(SecurityManager.for_purpose(
+            'settings', key_path=self.key_path).retire_previous_key())
+        self.assertFalse(exports.rotation_pending)
+        self.assertEqual(exports.decrypt(exported), "export")
+
+
+
+class TestDefaultKeyPath(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.saved = (config.KEY_PATH, os.getcwd())
+        config.KEY_PATH = os.path.join(self.tmp_dir, "data", "secret.key")
+        os.makedirs(os.path.dirname(config.KEY_PATH))
+        for name in ("first", "second"):
+            os.makedirs(os.path.join(self.tmp_dir, name))
+        clear_key_cache()
+
+    def tearDown(self):
+        config.KEY_PATH, cwd = self.saved
+        os.chdir(cwd)
+        clear_key_cache()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_existing_store_opens_from_another_working_directory(self):
+        db_path = os.path.join(self.tmp_dir, "data", "emotions.db")
+        now = time.time()
+        reading = {'timestamp': datetime.fromtimestamp(now), 'emotion': 'sad',
+                   'confidence': 0.9, 'valence': -0.6, 'arousal': 0.1,
+                   'probabilities': {'sad': 0.9}}
+
+        os.chdir(os.path.join(self.tmp_dir, "first"))
+        store = EmotionStore(db_path, encrypt=True)
+        store.add_reading(reading)
+        store.close()
+        clear_key_cache()
+
+        os.chdir(os.path.join(self.tmp_dir, "second"))
+        store = EmotionStore(db_path, encrypt=True)
+        try:
+            store.add_reading(dict(reading, timestamp=datetime.fromtimestamp(now + 1)))
+            self.assertEqual([r['emotion'] for r in store.get_readings()], ['sad', 'sad'])
+            self.assertEqual(store.summarize(now - 60, now + 60)['count'], 2)
+        finally:
+            store.close()
+        self.assertEqual(os.listdir(os.path.join(self.tmp_dir, "second")), [])
+
+
 if __name__ == '__main__':
     unittest.main()
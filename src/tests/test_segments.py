@@ -0,0 +1,158 @@
+"""
+Unit Tests for Time-Partitioned Segment Storage.
+"""
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+from cryptography.fernet import Fernet
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.security import SecurityManager
+from core.segments import SegmentedStore, MANIFEST_NAME
+from core.storage import day_start
+
+
+def make_reading(timestamp, emotion='neutral', valence=0.0):
+    return {
+        'timestamp': datetime.fromtimestamp(timestamp),
+        'emotion': emotion,
+        'confidence': 0.8,
+        'valence': valence,
+        'arousal': 0.0,
+        'probabilities': {emotion: 0.8}
+    }
+
+
+class TestSegmentedStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.security = SecurityManager(key_path=os.path.join(self.tmp_dir, "test.key"))
+        self.segment_dir = os.path.join(self.tmp_dir, "segments")
+        self.store = SegmentedStore(self.segment_dir, security=self.security)
+        # Noon today, so +/- a few hours stays inside one local day
+        self.today = day_start(time.time()) + 12 * 3600
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_one_segment_per_day(self):
+        for days_ago in range(3):
+            self.store.add_reading(make_reading(self.today - days_ago * 86400))
+        segment_files = [f for f in os.listdir(self.segment_dir) if f.endswith(".seg")]
+        self.assertEqual(len(segment_files), 3)
+        self.assertEqual(self.store.count(), 3)
+
+    def test_range_query_opens_only_overlapping_segments(self):
+        for days_ago in range(7):
+            self.store.add_reading(make_reading(self.today - days_ago * 86400))
+        last_15_min = self.store.segments_in_range(self.today - 900, self.today + 1)
+        self.assertEqual(len(last_15_min), 1)
+
+        readings = self.store.get_readings(self.today - 900, self.today + 1)
+        self.assertEqual(len(readings), 1)
+
+    def test_lines_are_encrypted(self):
+        self.store.add_reading(make_reading(self.today, 'fearful'))
+        name = self.store.segments_in_range()[0]
+        with open(os.path.join(self.segment_dir, f"{name}.seg"), "rb") as f:
+            self.assertNotIn(b'fearful', f.read())
+
+    def test_rollups_maintained_on_write(self):
+        for i in range(3):
+            self.store.add_reading(make_reading(self.today + i, 'happy', valence=0.8))
+        summary = self.store.summarize(self.today - 60, self.today + 60)
+        self.assertEqual(summary['count'], 3)
+        self.assertEqual(summary['happy_count'], 3)
+        # Partial edge minutes come from the segment lines
+        self.assertEqual(self.store.summarize(self.today + 1, self.today + 60)['count'], 2)
+
+    def test_manifest_survives_reopen(self):
+        self.store.add_reading(make_reading(self.today))
+        self.store.close()
+        self.assertTrue(os.path.exists(os.path.join(self.segment_dir, MANIFEST_NAME)))
+
+        reopened = SegmentedStore(self.segment_dir, security=self.security)
+        self.assertEqual(len(reopened.get_readings()), 1)
+        reopened.close()
+
+    def test_counts_recovered_after_crash(self):
+        for i in range(3):
+            self.store.add_reading(make_reading(self.today + i))
+        # Crash: the segment was written but the manifest never saved its count
+        self.store._active_file.close()
+        self.store._active_file = None
+        self.store.conn.close()
+        self.store = SegmentedStore(self.segment_dir, security=self.security)
+        self.assertEqual(self.store.count(), 3)
+
+        self.store.add_reading(make_reading(self.today - 40 * 86400))
+        self.store._active_file.close()
+        self.store._active_file = None
+        os.remove(os.path.join(self.segment_dir, MANIFEST_NAME))
+        self.store.conn.close()
+        self.store = SegmentedStore(self.segment_dir, security=self.security)
+        self.assertEqual(self.store.count(), 4)
+        self.assertEqual(self.store.purge_expired(retention_days=30, now=self.today), 1)
+
+    def test_purge_deletes_expired_segment_files(self):
+        self.store.add_reading(make_reading(self.today - 40 * 86400, 'sad', valence=-0.6))
+        self.store.add_reading(make_reading(self.today))
+
+        deleted = self.store.purge_expired(retention_days=30, rollup=True, now=self.today)
+        self.assertEqual(deleted, 1)
+        self.assertEqual(len(self.store.segments_in_range()), 1)
+
+        rollups = self.store.get_daily_rollups()
+        self.assertEqual(len(rollups), 1)
+        self.assertEqual(rollups[0]['sad_count'], 1)
+        with open(os.path.join(self.segment_dir, MANIFEST_NAME)) as f:
+            self.assertNotIn('-0.6', f.read())
+
+    def test_backfill_into_purged_day_keeps_its_rollup(self):
+        old = self.today - 40 * 86400
+        self.store.add_reading(make_reading(old, 'sad', valence=-0.6))
+        self.store.purge_expired(retention_days=30, rollup=True, now=self.today)
+
+        # An old recording imported later
+        self.store.add_reading(make_reading(old + 60, 'happy', valence=0.8))
+        self.assertEqual(self.store.get_daily_rollups()[0]['sad_count'], 1)
+
+        self.store.purge_expired(retention_days=30, rollup=True, now=self.today)
+        rollups = self.store.get_daily_rollups()
+        self.assertEqual(len(rollups), 1)
+        self.assertEqual((rollups[0]['count'], rollups[0]['sad_count'],
+                          rollups[0]['happy_count']), (2, 1, 1))
+
+    def test_reencrypt_in_steps_alongside_writes(self):
+        for i in range(25):
+            self.store.add_reading(make_reading(self.today + i))
+        self.security.rotate_key()
+
+        steps = 0
+        while not self.store.reencrypt_step(batch_size=10):
+            # The recorder keeps appending to the segment being copied
+            self.store.add_reading(make_reading(self.today + 100 + steps))
+            steps += 1
+        self.assertGreater(steps, 3)
+        self.assertEqual(self.store.count(), 25 + steps)
+
+        with open(self.security.key_path, "rb") as f:
+            current = Fernet(f.read())
+        readings = []
+        for name in self.store.segments_in_range():
+            with open(os.path.join(self.segment_dir, f"{name}.seg"), "rb") as f:
+                readings += [current.decrypt(line.rstrip(b"\n")) for line in f if line.strip()]
+        self.assertEqual(len(readings), 25 + steps)
+        self.assertEqual(len(self.store.get_readings()), 25 + steps)
+
+
+if __name__ == '__main__':
+    unittest.main()
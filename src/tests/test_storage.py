@@ -0,0 +1,199 @@
+"""
+Unit Tests for Emotion Storage and Data Retention.
+"""
+import unittest
+import sys
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from core.security import SecurityManager
+from core.storage import EmotionStore, day_start
+
+
+def make_reading(timestamp, emotion='happy', valence=0.5, arousal=0.2):
+    return {
+        'timestamp': datetime.fromtimestamp(timestamp),
+        'emotion': emotion,
+        'confidence': 0.9,
+        'valence': valence,
+        'arousal': arousal,
+        'probabilities': {emotion: 0.9}
+    }
+
+
+class TestEmotionStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        security = SecurityManager(key_path=os.path.join(self.tmp_dir, "test.key"))
+        self.store = EmotionStore(os.path.join(self.tmp_dir, "emotions.db"),
+                                  encrypt=True, security=security)
+        self.now = time.time()
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_roundtrip(self):
+        self.store.add_reading(make_reading(self.now, 'sad', valence=-0.6))
+        readings = self.store.get_readings()
+        self.assertEqual(len(readings), 1)
+        self.assertEqual(readings[0]['emotion'], 'sad')
+        self.assertAlmostEqual(readings[0]['valence'], -0.6)
+
+    def test_payload_is_encrypted(self):
+        self.store.add_reading(make_reading(self.now, 'angry'))
+        payload = self.store.conn.execute("SELECT payload FROM readings").fetchone()[0]
+        self.assertNotIn(b'angry', bytes(payload))
+
+    def test_range_query(self):
+        for offset in range(10):
+            self.store.add_reading(make_reading(self.now - offset * 60))
+        recent = self.store.get_readings(start=self.now - 5 * 60 + 1)
+        self.assertEqual(len(recent), 5)
+
+    def test_purge_expired_in_batches(self):
+        old = self.now - 40 * 86400
+        for i in range(25):
+            self.store.add_reading(make_reading(old + i))
+        self.store.add_reading(make_reading(self.now))
+
+        deleted = self.store.purge_expired(retention_days=30, batch_size=10,
+                                           rollup=False, now=self.now)
+        self.assertEqual(deleted, 25)
+        self.assertEqual(self.store.count(), 1)
+        self.assertEqual(self.store.get_daily_rollups(), [])
+
+    def test_purge_rolls_up_expired_readings(self):
+        old = day_start(self.now - 40 * 86400) + 3600
+        self.store.add_reading(make_reading(old, 'happy', valence=0.8))
+        self.store.add_reading(make_reading(old + 1, 'sad', valence=-0.6))
+
+        self.store.purge_expired(retention_days=30, batch_size=1,
+                                 rollup=True, now=self.now)
+        rollups = self.store.get_daily_rollups()
+        self.assertEqual(len(rollups), 1)
+        self.assertEqual(rollups[0]['count'], 2)
+        self.assertEqual(rollups[0]['happy_count'], 1)
+        self.assertEqual(rollups[0]['sad_count'], 1)
+        self.assertAlmostEqual(rollups[0]['valence_sum'], 0.2)
+        payload = self.store.conn.execute("SELECT payload FROM daily_rollup").fetchone()[0]
+        self.assertFalse(bytes(payload).startswith(b'[2,'))
+        # The live (encrypted) rollups are purged along with the readings
+        level, buckets = self.store.query_rollups(old - 3600, old + 3600, 60)
+        self.assertEqual(level, 'minute')
+        self.assertEqual(buckets, [])
+
+    def test_clear_daily_rollup_table_is_encrypted_on_open(self):
+        path = os.path.join(self.tmp_dir, "old.db")
+        conn = sqlite3.connect(path)
+        emotion_columns = ", ".join(f"{e}_count INTEGER NOT NULL DEFAULT 0"
+                                    for e in config.EMOTION_LABELS)
+        conn.execute("CREATE TABLE daily_rollup (bucket_start REAL PRIMARY KEY, "
+                     "count INTEGER NOT NULL DEFAULT 0, valence_sum REAL NOT NULL DEFAULT 0, "
+                     f"arousal_sum REAL NOT NULL DEFAULT 0, {emotion_columns})")
+        conn.execute("INSERT INTO daily_rollup (bucket_start, count, valence_sum, sad_count) "
+                     "VALUES (86400, 3, -1.5, 3)")
+        conn.commit()
+        conn.close()
+
+        store = EmotionStore(path, encrypt=True, security=self.store.security)
+        try:
+            rollups = store.get_daily_rollups()
+            self.assertEqual(len(rollups), 1)
+            self.assertEqual((rollups[0]['bucket_start'], rollups[0]['count'],
+                              rollups[0]['sad_count']), (86400, 3, 3))
+            self.assertAlmostEqual(rollups[0]['valence_sum'], -1.5)
+            columns = [row[1] for row in store.conn.execute("PRAGMA table_info(daily_rollup)")]
+            self.assertEqual(columns, ['bucket_start', 'payload'])
+        finally:
+            store.close()
+
+    def test_rollups_are_encrypted(self):
+        self.store.add_reading(make_reading(self.now, 'angry', valence=-0.7))
+        for level in ('minute', 'hour', 'day'):
+            row = self.store.conn.execute(f"SELECT * FROM rollup_{level}").fetchone()
+            self.assertEqual(len(row), 2)
+            self.assertNotIn(b'-0.7', bytes(row[1]))
+        summary = self.store.summarize(self.now - 60, self.now + 60)
+        self.assertEqual(summary['angry_count'], 1)
+        self.assertAlmostEqual(summary['valence_sum'], -0.7)
+
+
+class TestRollups(unittest.TestCase):
+    def setUp(self):
+        self.store = EmotionStore(":memory:", encrypt=False)
+        # 10:00 local time today, so every reading below falls in one day
+        self.base = day_start(time.time()) + 10 * 3600
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_rollups_updated_on_write(self):
+        for i in range(120):
+            emotion = 'sad' if i % 4 == 0 else 'happy'
+            self.store.add_reading(make_reading(self.base + i, emotion))
+
+        level, minutes = self.store.query_rollups(self.base, self.base + 120, 60)
+        self.assertEqual(level, 'minute')
+        self.assertEqual([b['count'] for b in minutes], [60, 60])
+        self.assertEqual(minutes[0]['sad_count'], 15)
+
+        level, hours = self.store.query_rollups(self.base, self.base + 3600, 3600)
+        self.assertEqual(level, 'hour')
+        self.assertEqual(hours[0]['count'], 120)
+
+    def test_query_picks_coarsest_aligned_level(self):
+        self.store.add_reading(make_reading(self.base))
+        day = day_start(self.base)
+        next_day = day_start(day + 36 * 3600)
+        self.assertEqual(self.store.query_rollups(day, next_day, 86400)[0], 'day')
+        # Range not aligned to hours falls back to minutes
+        self.assertEqual(
+            self.store.query_rollups(self.base + 60, self.base + 7200, 3600)[0], 'minute'
+        )
+
+    def test_query_clips_partial_minutes_and_serves_sub_minute_from_raw(self):
+        for i in range(120):
+            self.store.add_reading(make_reading(self.base + i))
+        level, minutes = self.store.query_rollups(self.base + 30, self.base + 90, 60)
+        self.assertEqual(level, 'minute')
+        self.assertEqual([(b['bucket_start'], b['count']) for b in minutes],
+                         [(self.base + 30, 30), (self.base + 60, 30)])
+
+        level, raw = self.store.query_rollups(self.base + 30, self.base + 40, 1)
+        self.assertEqual(level, 'raw')
+        self.assertEqual([b['bucket_start'] for b in raw],
+                         [self.base + i for i in range(30, 40)])
+        self.assertEqual(raw[0]['happy_count'], 1)
+
+    def test_summarize_matches_raw_readings(self):
+        for i in range(0, 3 * 3600, 30):
+            self.store.add_reading(make_reading(self.base + i, valence=0.5))
+        start, end = self.base + 600, self.base + 3 * 3600 - 600
+        summary = self.store.summarize(start, end)
+        raw = self.store.get_readings(start, end)
+        self.assertEqual(summary['count'], len(raw))
+        self.assertAlmostEqual(summary['valence_sum'], 0.5 * len(raw))
+
+    def test_summarize_excludes_readings_before_start_in_same_minute(self):
+        for i in range(0, 50, 5):
+            self.store.add_reading(make_reading(self.base + i, 'sad', valence=-0.5))
+        session_start = self.base + 50
+        for i in range(50, 130, 5):
+            self.store.add_reading(make_reading(self.base + i, 'happy'))
+        summary = self.store.summarize(session_start, self.base + 125)
+        self.assertEqual(summary['count'], 15)
+        self.assertEqual(summary['sad_count'], 0)
+        self.assertEqual(self.store.summarize(self.base + 12, self.base + 22)['count'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
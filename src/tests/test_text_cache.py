@@ -0,0 +1,77 @@
+"""
+Unit Tests for the Cached Text Renderer.
+"""
+import unittest
+import sys
+import os
+
+import cv2
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from text_cache import TextRenderer, percent_label
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+
+class TestTextRenderer(unittest.TestCase):
+    def setUp(self):
+        self.renderer = TextRenderer(max_entries=2)
+        rng = np.random.default_rng(0)
+        self.frame = rng.integers(0, 256, (120, 200, 3), dtype=np.uint8)
+
+    def assert_matches_puttext(self, text, org, scale, color, thickness):
+        expected = self.frame.copy()
+        cv2.putText(expected, text, org, FONT, scale, color, thickness)
+        actual = self.frame.copy()
+        self.renderer.put_text(actual, text, org, FONT, scale, color, thickness)
+        diff = np.abs(actual.astype(int) - expected.astype(int))
+        self.assertLessEqual(diff.max(), 1)
+
+    def test_matches_puttext(self):
+        self.assert_matches_puttext("Happy 0.53", (10, 40), 0.5, (255, 255, 255), 1)
+        self.assert_matches_puttext("SAD", (20, 90), 0.7, (68, 255, 255), 2)
+
+    def test_clipped_at_frame_edges(self):
+        self.assert_matches_puttext("Stress: 80%", (150, 10), 0.5, (0, 0, 255), 1)
+        self.assert_matches_puttext("Off", (-10, 118), 1.0, (0, 255, 0), 2)
+        self.assert_matches_puttext("Gone", (500, 500), 0.5, (0, 255, 0), 1)
+
+    def test_cache_hits_and_lru_eviction(self):
+        args = (FONT, 0.5, (255, 255, 255), 1)
+        self.renderer.put_text(self.frame, "a", (5, 20), *args)
+        self.renderer.put_text(self.frame, "a", (50, 60), *args)
+        self.assertEqual((self.renderer.hits, self.renderer.misses), (1, 1))
+
+        self.renderer.put_text(self.frame, "b", (5, 20), *args)
+        self.renderer.put_text(self.frame, "c", (5, 20), *args)
+        self.renderer.put_text(self.frame, "a", (5, 20), *args)
+        self.assertEqual(self.renderer.misses, 4)
+
+    def test_unhashable_color(self):
+        self.renderer.put_text(self.frame, "x", (5, 20), FONT, 0.5, [255, 0, 0], 1)
+        self.renderer.put_text(self.frame, "x", (5, 20), FONT, 0.5, (255, 0, 0), 1)
+        self.assertEqual(self.renderer.hits, 1)
+
+    def test_text_size_matches_opencv(self):
+        self.assertEqual(self.renderer.get_text_size("Energy", FONT, 0.4, 1),
+                         cv2.getTextSize("Energy", FONT, 0.4, 1))
+
+
+
+class TestPercentLabel(unittest.TestCase):
+    def test_rounds_to_steps(self):
+        self.assertEqual(percent_label(0.731), "75%")
+        self.assertEqual(percent_label(0.02), "0%")
+        self.assertEqual(percent_label(1.0), "100%")
+        self.assertEqual(percent_label(0.731, step=1), "73%")
+
+    def test_continuous_values_map_to_few_strings(self):
+        values = np.random.default_rng(0).random(1000)
+        self.assertEqual(len({percent_label(v) for v in values}), 21)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Unit Tests for Voice Activity Detection.
+"""
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio_module import AudioAnalyzer
+from core.audio_features import FeatureExtractor
+from core.vad import VoiceActivityDetector
+
+SAMPLE_RATE = 16000
+HOP = 256
+
+
+def voiced(seconds):
+    """Harmonic tone with 4 Hz syllable-like bursts."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    phase = 2 * np.pi * 140 * t
+    tone = sum(np.sin(k * phase) / k for k in range(1, 10))
+    return 0.25 * tone * np.sqrt(np.clip(np.sin(2 * np.pi * 4 * t), 0, None))
+
+
+def run_vad(samples, vad=None):
+    extractor = FeatureExtractor(sample_rate=SAMPLE_RATE, frame_size=512, hop_size=HOP)
+    vad = vad or VoiceActivityDetector()
+    decisions = [vad.process(extractor.process(samples[i:i + 1024]))
+                 for i in range(0, len(samples), 1024)]
+    return np.concatenate(decisions)
+
+
+class TestVoiceActivityDetector(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+
+    def noise(self, seconds, level=0.003):
+        return self.rng.normal(0, level, int(seconds * SAMPLE_RATE))
+
+    def test_quiet_room_has_no_speech(self):
+        decisions = run_vad(self.noise(3))
+        self.assertFalse(decisions.any())
+
+    def test_detects_speech_segments(self):
+        samples = np.concatenate([self.noise(1.5), voiced(2) + self.noise(2), self.noise(2)])
+        truth = np.zeros(len(samples), dtype=bool)
+        truth[int(1.5 * SAMPLE_RATE):int(3.5 * SAMPLE_RATE)] = True
+
+        decisions = run_vad(samples)
+        frame_truth = truth[np.arange(len(decisions)) * HOP + HOP]
+        self.assertGreater(np.mean(decisions == frame_truth), 0.9)
+        self.assertFalse(decisions[-60:].any())
+
+    def test_hangover_bridges_pauses(self):
+        burst = voiced(0.5)
+        samples = np.concatenate([self.noise(1), burst + self.noise(0.5), self.noise(0.1),
+                                  burst + self.noise(0.5), self.noise(1)])
+
+        # Bursts end in a silent half-cycle, so the gap is ~225 ms (14 frames)
+        active = np.flatnonzero(run_vad(samples, VoiceActivityDetector(hangover_frames=20)))
+        self.assertTrue(np.all(np.diff(active) == 1))
+
+        active = np.flatnonzero(run_vad(samples, VoiceActivityDetector(hangover_frames=0)))
+        self.assertFalse(np.all(np.diff(active) == 1))
+
+    def test_stationary_noise_is_absorbed(self):
+        samples = np.concatenate([self.noise(1), self.noise(6, level=0.05)])
+        decisions = run_vad(samples)
+        self.assertFalse(decisions[-100:].any())
+
+
+class BlockSource:
+    """In-memory PCM source handing out the given blocks."""
+
+    def __init__(self, blocks):
+        self.sample_rate = SAMPLE_RATE
+        self.block_size = max(len(b) for b in blocks)
+        self.blocks = list(blocks)
+
+    def read(self):
+        return self.blocks.pop(0) if self.blocks else None
+
+
+class TestSpeechGating(unittest.TestCase):
+    def test_speech_within_block_is_estimated(self):
+        rng = np.random.default_rng(0)
+        noise = lambda seconds: rng.normal(0, 0.003, int(seconds * SAMPLE_RATE))
+        # Speech in the middle of a block that ends in silence
+        block = np.concatenate([noise(1), voiced(0.5) + noise(0.5), noise(1)])
+        analyzer = AudioAnalyzer(source=BlockSource([block, noise(0.1)]))
+        analyzer.last_update = 0.0
+
+        analyzer.update()
+        self.assertFalse(analyzer.is_speaking)
+        self.assertEqual((analyzer.estimations_run, analyzer.estimations_skipped), (1, 0))
+
+        analyzer.last_update = 0.0
+        analyzer.update()
+        self.assertEqual((analyzer.estimations_run, analyzer.estimations_skipped), (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
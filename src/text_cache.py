@@ -0,0 +1,110 @@
+"""
+Cached text rendering for the OpenCV HUDs.
+Strings are rasterized once with cv2.putText and kept in an LRU cache as
+premultiplied sprites; drawing a cached string is a multiply-add over its
+bounding box instead of re-tracing the Hershey glyphs every frame.
+Values that change every frame (probabilities, stress) are shown with
+percent_label so the same few strings repeat and actually hit the cache.
+"""
+
+import cv2
+import numpy as np
+from collections import OrderedDict
+from typing import Tuple
+
+_INV_255 = 1.0 / 255
+
+
+def percent_label(value: float, step: int = 5) -> str:
+    """Format a 0..1 value as a percentage rounded to `step` points, e.g. "75%"."""
+    return f"{int(round(value * 100 / step)) * step}%"
+
+
+class TextSprite:
+    """One rasterized string."""
+
+    def __init__(self, text: str, font_face: int, font_scale: float,
+                 color: Tuple[int, int, int], thickness: int):
+        (width, height), baseline = cv2.getTextSize(text, font_face, font_scale, thickness)
+        # Antialiasing and stroke thickness reach a little past the text box
+        pad = thickness + 2
+        shape = (height + baseline + 2 * pad, width + 2 * pad)
+        coverage = np.zeros(shape, dtype=np.uint8)
+        cv2.putText(coverage, text, (pad, height + pad), font_face, font_scale, 255, thickness)
+        # Drawn over black, so already premultiplied by coverage
+        image = np.zeros((*shape, 3), dtype=np.uint8)
+        cv2.putText(image, text, (pad, height + pad), font_face, font_scale, color, thickness)
+
+        # Keep only the pixels the text actually touches
+        bx, by, bw, bh = cv2.boundingRect(coverage)
+        if bw == 0:
+            bx = by = 0
+            bw = bh = 1
+        self.offset_x = bx - pad
+        self.offset_y = by - (height + pad)
+        self.image = image[by:by + bh, bx:bx + bw].copy()
+        self.inv_alpha = cv2.merge([255 - coverage[by:by + bh, bx:bx + bw]] * 3)
+        self.height, self.width = bh, bw
+        self.size = ((width, height), baseline)
+
+
+class TextRenderer:
+    """Drop-in replacement for cv2.putText backed by an LRU sprite cache."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._sprites = OrderedDict()
+
+    def _sprite(self, text, font_face, font_scale, color, thickness) -> TextSprite:
+        key = (text, font_face, font_scale, color, thickness)
+        try:
+            sprite = self._sprites[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable color (e.g. a list)
+            return self._sprite(text, font_face, font_scale, tuple(color), thickness)
+        else:
+            self._sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        sprite = TextSprite(text, font_face, font_scale, color, thickness)
+        self._sprites[key] = sprite
+        if len(self._sprites) > self.max_entries:
+            self._sprites.popitem(last=False)
+        return sprite
+
+    def put_text(self, frame: np.ndarray, text: str, org: Tuple[int, int],
+                 font_face: int, font_scale: float, color: Tuple[int, int, int],
+                 thickness: int = 1) -> np.ndarray:
+        """Draw text like cv2.putText (org is the bottom-left baseline point)."""
+        sprite = self._sprite(text, font_face, font_scale, color, thickness)
+        x, y = org[0] + sprite.offset_x, org[1] + sprite.offset_y
+        inv_alpha, image = sprite.inv_alpha, sprite.image
+        fh, fw = frame.shape[:2]
+        if x < 0 or y < 0 or x + sprite.width > fw or y + sprite.height > fh:
+            # Clip the sprite to the frame
+            x0, y0 = max(x, 0), max(y, 0)
+            x1, y1 = min(x + sprite.width, fw), min(y + sprite.height, fh)
+            if x0 >= x1 or y0 >= y1:
+                return frame
+            inv_alpha = inv_alpha[y0 - y:y1 - y, x0 - x:x1 - x]
+            image = image[y0 - y:y1 - y, x0 - x:x1 - x]
+            x, y = x0, y0
+
+        roi = frame[y:y + image.shape[0], x:x + image.shape[1]]
+        cv2.multiply(roi, inv_alpha, dst=roi, scale=_INV_255)
+        cv2.add(roi, image, dst=roi)
+        return frame
+
+    def get_text_size(self, text: str, font_face: int, font_scale: float,
+                      thickness: int) -> Tuple[Tuple[int, int], int]:
+        """Cached cv2.getTextSize (the size does not depend on color)."""
+        return self._sprite(text, font_face, font_scale, (255, 255, 255), thickness).size
+
+    def clear(self):
+        self._sprites.clear()
@@ -0,0 +1,214 @@
+"""
+Offline Video Processing for MindCare.
+Runs recorded sessions through face detection, emotion classification and
+time-window aggregation as fast as the CPU allows (no display, no real-time
+pacing) and writes per-second emotion readings, timed on the video's own
+clock, to the emotion store. With --parallel one file uses every core:
+decoding, face detection and batched classification overlap (see
+core/frame_pipeline.py) and results are reassembled in frame order.
+
+Usage:
+    python video_processor.py session.mp4 [more.mp4 ...]
+        [--start 2024-05-01T09:00:00] [--store sqlite|segmented]
+        [--max-frames N] [--dry-run] [--parallel [--workers N] [--batch-size N]]
+"""
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+import cv2
+import numpy as np
+
+import config
+from face_detector import FaceDetector
+from emotion_classifier import EmotionClassifier
+from core.frame_pipeline import FramePipeline
+from core.readings import recording_readings
+from core.storage import create_store
+
+
+def video_fps(cap: cv2.VideoCapture) -> float:
+    """Frame rate reported by the container, or the camera default if unknown."""
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    return fps if fps and fps > 0 else float(config.CAMERA_FPS)
+
+
+def recording_start(path, duration: float) -> float:
+    """Best guess at when a recording started: file mtime minus its duration."""
+    return os.path.getmtime(path) - duration
+
+
+def read_frames(cap: cv2.VideoCapture, max_frames: Optional[int] = None) -> Iterator[np.ndarray]:
+    """Decoded frames in order, up to max_frames."""
+    index = 0
+    while max_frames is None or index < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            return
+        index += 1
+        yield frame
+
+
+def find_face(detector: FaceDetector, frame: np.ndarray) -> Optional[np.ndarray]:
+    """Model-sized grayscale crop of the frame's face, or None."""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    bbox = detector.detect_face(gray)
+    if bbox is None:
+        return None
+    return detector.extract_face_region(gray, bbox, config.MODEL_INPUT_SIZE)
+
+
+class VideoProcessor:
+    """Turns a recorded video into per-second emotion readings."""
+
+    def __init__(self, detector: FaceDetector = None, classifier: EmotionClassifier = None):
+        """
+        Args:
+            detector: Face detector (a Haar cascade detector by default)
+            classifier: Emotion classifier (loaded once, reused for every file)
+        """
+        self.detector = detector or FaceDetector(method='haar')
+        self.classifier = classifier or EmotionClassifier()
+        self.last_stats = None
+
+    def frame_results(self, cap: cv2.VideoCapture,
+                      max_frames: Optional[int] = None) -> Iterator[Optional[Dict[str, float]]]:
+        """
+        Decode, detect and classify frame by frame.
+
+        Yields:
+            Emotion probabilities of each frame in order, None if it has no face
+        """
+        for frame in read_frames(cap, max_frames):
+            face = find_face(self.detector, frame)
+            yield None if face is None else self.classifier.classify_emotion(face)
+
+    def process(self, path, start_time: Optional[float] = None,
+                max_frames: Optional[int] = None, first_frame: int = 0,
+                warmup_frames: int = 0) -> Iterator[Dict]:
+        """
+        Process one recording, or a chunk of it.
+
+        Args:
+            path: Video file
+            start_time: Epoch time of frame 0 (default: guessed from the file)
+            max_frames: Stop after this many frames from first_frame
+            first_frame: First frame to produce readings for
+            warmup_frames: Frames before first_frame decoded and aggregated
+                           (but not reported); with core.readings.warmup_seconds()
+                           of them the readings match a pass from frame 0
+
+        Yields:
+            One reading per second of video in which a face was seen;
+            statistics are left in self.last_stats
+        """
+        cap = cv2.VideoCapture(str(path))
+        if not cap.isOpened():
+            raise IOError(f"Cannot open video: {path}")
+
+        fps = video_fps(cap)
+        if start_time is None:
+            start_time = recording_start(path, cap.get(cv2.CAP_PROP_FRAME_COUNT) / fps)
+        seek_frame = max(0, first_frame - warmup_frames)
+        if seek_frame:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, seek_frame)
+        frame_limit = None if max_frames is None else first_frame - seek_frame + max_frames
+
+        stats = {'path': str(path), 'fps': fps, 'frames': 0, 'face_frames': 0, 'readings': 0}
+        started = time.perf_counter()
+        try:
+            yield from recording_readings(self.frame_results(cap, frame_limit), fps, start_time,
+                                          first_frame, seek_frame, frame_limit, stats)
+        finally:
+            cap.release()
+            stats['video_seconds'] = stats['frames'] / fps
+            stats['elapsed'] = time.perf_counter() - started
+            self.last_stats = stats
+
+
+class ParallelVideoProcessor(VideoProcessor):
+    """VideoProcessor that spreads one file over all cores."""
+
+    def __init__(self, classifier: EmotionClassifier = None,
+                 workers: int = config.OFFLINE_WORKERS,
+                 batch_size: int = config.OFFLINE_BATCH_SIZE):
+        """
+        Args:
+            classifier: Emotion classifier, shared by all batches
+            workers: Face detection threads (0 = one per CPU core)
+            batch_size: Frames whose faces are classified in one model call
+        """
+        # No shared detector: each detection thread makes its own (_make_finder)
+        self.detector = None
+        self.classifier = classifier or EmotionClassifier()
+        self.last_stats = None
+        self.pipeline = FramePipeline(self._make_finder, self.classifier.classify_batch,
+                                      workers, batch_size)
+
+    @staticmethod
+    def _make_finder():
+        # Cascade classifiers are not thread-safe: one per detection thread
+        detector = FaceDetector(method='haar')
+        return lambda frame: find_face(detector, frame)
+
+    def frame_results(self, cap: cv2.VideoCapture,
+                      max_frames: Optional[int] = None) -> Iterator[Optional[Dict[str, float]]]:
+        """
+        Decode, detect and classify in overlapping stages.
+
+        Yields:
+            Emotion probabilities of each frame in order, None if it has no face
+        """
+        return self.pipeline.run(read_frames(cap, max_frames))
+
+
+def format_stats(stats: Dict) -> str:
+    speed = stats['video_seconds'] / stats['elapsed'] if stats['elapsed'] else 0.0
+    return (f"{os.path.basename(stats['path'])}: {stats['frames']} frames "
+            f"({stats['video_seconds']:.1f} s of video, faces in {stats['face_frames']}) "
+            f"in {stats['elapsed']:.1f} s = {speed:.1f}x real time, {stats['readings']} readings")
+
+
+def main():
+    """Entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='MindCare offline video processing')
+    parser.add_argument('videos', nargs='+', help='Recorded session videos')
+    parser.add_argument('--start', default=None,
+                       help='ISO time of the first frame (single video; default: file mtime - duration)')
+    parser.add_argument('--store', choices=['sqlite', 'segmented'], default=None,
+                       help='Storage backend (default: config.STORAGE_MODE)')
+    parser.add_argument('--max-frames', type=int, default=None, help='Frames per video')
+    parser.add_argument('--dry-run', action='store_true', help='Process without storing readings')
+    parser.add_argument('--parallel', action='store_true',
+                       help='Overlap decoding, detection and batched classification')
+    parser.add_argument('--workers', type=int, default=config.OFFLINE_WORKERS,
+                       help='Detection threads with --parallel (0 = one per core)')
+    parser.add_argument('--batch-size', type=int, default=config.OFFLINE_BATCH_SIZE,
+                       help='Frames per classifier call with --parallel')
+    args = parser.parse_args()
+
+    if args.start and len(args.videos) > 1:
+        parser.error("--start needs a single video")
+    start_time = datetime.fromisoformat(args.start).timestamp() if args.start else None
+
+    if args.parallel:
+        processor = ParallelVideoProcessor(workers=args.workers, batch_size=args.batch_size)
+    else:
+        processor = VideoProcessor()
+    store = None if args.dry_run else create_store(args.store)
+    try:
+        for path in args.videos:
+            for reading in processor.process(path, start_time, args.max_frames):
+                if store:
+                    store.add_reading(reading)
+            print(format_stats(processor.last_stats))
+    finally:
+        if store:
+            store.close()
+
+
+if __name__ == "__main__":
+    main()